@@ -0,0 +1,87 @@
+"""Full-text search index for recipes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+SQLite: external-content FTS5 table over title/description/ingredients/tags,
+kept in sync by triggers and rebuilt from existing rows.
+PostgreSQL: GIN index over a to_tsvector() expression of the same columns.
+"""
+from alembic import op
+
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+PG_SEARCH_DOCUMENT = (
+    "to_tsvector('english', "
+    "coalesce(recipes.title, '') || ' ' || "
+    "coalesce(recipes.description, '') || ' ' || "
+    "coalesce(CAST(recipes.ingredients AS TEXT), '') || ' ' || "
+    "coalesce(CAST(recipes.tags AS TEXT), ''))"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_recipes_search ON recipes USING GIN ({PG_SEARCH_DOCUMENT})")
+        return
+    if dialect != "sqlite":
+        return
+
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+            title, description, ingredients, tags,
+            content='recipes', content_rowid='id', tokenize='unicode61'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_ai AFTER INSERT ON recipes BEGIN
+            INSERT INTO recipes_fts(rowid, title, description, ingredients, tags)
+            VALUES (new.id, new.title, new.description, new.ingredients, new.tags);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_ad AFTER DELETE ON recipes BEGIN
+            INSERT INTO recipes_fts(recipes_fts, rowid, title, description, ingredients, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.ingredients, old.tags);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_au
+        AFTER UPDATE OF title, description, ingredients, tags ON recipes BEGIN
+            INSERT INTO recipes_fts(recipes_fts, rowid, title, description, ingredients, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.ingredients, old.tags);
+            INSERT INTO recipes_fts(rowid, title, description, ingredients, tags)
+            VALUES (new.id, new.title, new.description, new.ingredients, new.tags);
+        END
+        """
+    )
+    # Index rows that existed before the triggers
+    op.execute("INSERT INTO recipes_fts(recipes_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_recipes_search")
+        return
+    if dialect != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS recipes_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS recipes_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS recipes_fts_ai")
+    op.execute("DROP TABLE IF EXISTS recipes_fts")
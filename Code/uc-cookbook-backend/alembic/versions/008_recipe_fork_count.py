@@ -0,0 +1,45 @@
+"""Add denormalized fork_count to recipes
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    cols = {c["name"] for c in insp.get_columns("recipes")}
+    if "fork_count" not in cols:
+        # Plain ADD COLUMN (no batch rebuild) so the FTS triggers on recipes survive
+        op.add_column(
+            "recipes",
+            sa.Column("fork_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # Backfill from existing origin attribution
+    op.execute(
+        """
+        UPDATE recipes SET fork_count = (
+            SELECT COUNT(*) FROM recipes AS forks
+            WHERE forks.origin_recipe_id = recipes.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    cols = {c["name"] for c in insp.get_columns("recipes")}
+    if "fork_count" in cols:
+        op.drop_column("recipes", "fork_count")
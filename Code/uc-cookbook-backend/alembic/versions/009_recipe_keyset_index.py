@@ -0,0 +1,33 @@
+"""Add the newest-first feed index for keyset pagination of recipes
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+Feed pages filter is_published/visibility and walk (created_at, id) newest
+first, so the equality columns lead and the keyset columns follow.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("recipes")}
+    if "ix_recipes_feed" not in idxs:
+        op.create_index("ix_recipes_feed", "recipes", ["is_published", "visibility", "created_at", "id"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("recipes")}
+    if "ix_recipes_feed" in idxs:
+        op.drop_index("ix_recipes_feed", table_name="recipes")
@@ -0,0 +1,48 @@
+"""Normalized recipe_tags table for indexed tag filtering
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "recipe_tags" not in insp.get_table_names():
+        op.create_table(
+            "recipe_tags",
+            sa.Column("recipe_id", sa.Integer(), nullable=False),
+            sa.Column("tag", sa.Text(), nullable=False),
+            sa.ForeignKeyConstraint(["recipe_id"], ["recipes.id"]),
+            sa.PrimaryKeyConstraint("recipe_id", "tag"),
+        )
+        op.create_index("ix_recipe_tags_tag_recipe_id", "recipe_tags", ["tag", "recipe_id"])
+
+    # Copy existing JSON tags into the new table
+    recipes = sa.table("recipes", sa.column("id", sa.Integer()), sa.column("tags", sa.JSON()))
+    recipe_tags = sa.table("recipe_tags", sa.column("recipe_id", sa.Integer()), sa.column("tag", sa.Text()))
+    conn.execute(sa.delete(recipe_tags))
+    rows = []
+    for recipe_id, tags in conn.execute(sa.select(recipes.c.id, recipes.c.tags)):
+        for tag in dict.fromkeys(tags or []):
+            rows.append({"recipe_id": recipe_id, "tag": tag})
+    if rows:
+        op.bulk_insert(recipe_tags, rows)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "recipe_tags" in insp.get_table_names():
+        op.drop_index("ix_recipe_tags_tag_recipe_id", table_name="recipe_tags")
+        op.drop_table("recipe_tags")
@@ -0,0 +1,43 @@
+"""Composite indexes for filtered and most_forked recipe feeds
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18
+
+Every anonymous listing filters on is_published/visibility and orders by
+created_at (or fork_count). Like ix_recipes_feed (009), leading with the
+equality columns lets the planner read the feed in index order and stop
+at LIMIT.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+
+FEED_INDEXES = {
+    "ix_recipes_feed_difficulty": ["is_published", "visibility", "difficulty", "created_at", "id"],
+    "ix_recipes_feed_fork_count": ["is_published", "visibility", "fork_count", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("recipes")}
+    for name, columns in FEED_INDEXES.items():
+        if name not in idxs:
+            op.create_index(name, "recipes", columns)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("recipes")}
+    for name in FEED_INDEXES:
+        if name in idxs:
+            op.drop_index(name, table_name="recipes")
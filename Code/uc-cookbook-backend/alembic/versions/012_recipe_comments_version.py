@@ -0,0 +1,35 @@
+"""Add comments_version counter to recipes for comment list ETags
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    cols = {c["name"] for c in insp.get_columns("recipes")}
+    if "comments_version" not in cols:
+        # Plain ADD COLUMN (no batch rebuild) so the FTS triggers on recipes survive
+        op.add_column(
+            "recipes",
+            sa.Column("comments_version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    cols = {c["name"] for c in insp.get_columns("recipes")}
+    if "comments_version" in cols:
+        op.drop_column("recipes", "comments_version")
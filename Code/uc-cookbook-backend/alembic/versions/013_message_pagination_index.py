@@ -0,0 +1,38 @@
+"""Composite index for paginated and incremental message fetching
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18
+
+Message pages filter on conversation_id and walk (created_at, id) in either
+direction from a cursor, so the index serves both history pages and polls
+for new messages without sorting the conversation.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("messages")}
+    if "ix_messages_conversation_created_id" not in idxs:
+        op.create_index(
+            "ix_messages_conversation_created_id",
+            "messages",
+            ["conversation_id", "created_at", "id"],
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("messages")}
+    if "ix_messages_conversation_created_id" in idxs:
+        op.drop_index("ix_messages_conversation_created_id", table_name="messages")
@@ -0,0 +1,80 @@
+"""Conversation read receipts and conversation list indexes
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18
+
+conversation_reads stores each participant's last read message so the
+conversation list can report unread counts. Existing conversations are
+backfilled as read up to their latest message, so the rollout doesn't
+light up every old thread as unread.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+CONVERSATION_INDEXES = {
+    "ix_conversations_user_one_updated": ["user_one_id", "updated_at", "id"],
+    "ix_conversations_user_two_updated": ["user_two_id", "updated_at", "id"],
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "conversation_reads" not in insp.get_table_names():
+        op.create_table(
+            "conversation_reads",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("conversation_id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("last_read_message_id", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["conversation_id"], ["conversations.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("conversation_id", "user_id", name="uq_conversation_read_user"),
+        )
+        op.create_index(op.f("ix_conversation_reads_id"), "conversation_reads", ["id"], unique=False)
+        for user_column in ("user_one_id", "user_two_id"):
+            op.execute(
+                "INSERT INTO conversation_reads (conversation_id, user_id, last_read_message_id, updated_at) "
+                f"SELECT c.id, c.{user_column}, COALESCE(MAX(m.id), 0), CURRENT_TIMESTAMP "
+                "FROM conversations c LEFT JOIN messages m ON m.conversation_id = c.id "
+                f"GROUP BY c.id, c.{user_column}"
+            )
+
+    # Keyset pagination orders by updated_at; rows from before it was always set
+    op.execute("UPDATE conversations SET updated_at = created_at WHERE updated_at IS NULL")
+
+    idxs = {i["name"] for i in insp.get_indexes("conversations")}
+    for name, columns in CONVERSATION_INDEXES.items():
+        if name not in idxs:
+            op.create_index(name, "conversations", columns)
+
+    idxs = {i["name"] for i in insp.get_indexes("messages")}
+    if "ix_messages_conversation_unread" not in idxs:
+        op.create_index("ix_messages_conversation_unread", "messages", ["conversation_id", "id", "sender_id"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("messages")}
+    if "ix_messages_conversation_unread" in idxs:
+        op.drop_index("ix_messages_conversation_unread", table_name="messages")
+
+    idxs = {i["name"] for i in insp.get_indexes("conversations")}
+    for name in CONVERSATION_INDEXES:
+        if name in idxs:
+            op.drop_index(name, table_name="conversations")
+
+    if "conversation_reads" in insp.get_table_names():
+        op.drop_index(op.f("ix_conversation_reads_id"), table_name="conversation_reads")
+        op.drop_table("conversation_reads")
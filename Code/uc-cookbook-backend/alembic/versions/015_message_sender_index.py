@@ -0,0 +1,35 @@
+"""Index messages by sender
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18
+
+The per-participant conversation indexes (014) and the
+(conversation_id, created_at, id) message index (013) already cover the
+conversation list and message pages; sender_id was the remaining
+unindexed foreign key used by User.sent_messages and its delete cascade.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "015"
+down_revision = "014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("messages")}
+    if "ix_messages_sender_id" not in idxs:
+        op.create_index("ix_messages_sender_id", "messages", ["sender_id"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("messages")}
+    if "ix_messages_sender_id" in idxs:
+        op.drop_index("ix_messages_sender_id", table_name="messages")
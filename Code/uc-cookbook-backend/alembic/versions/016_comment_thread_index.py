@@ -0,0 +1,37 @@
+"""Index recipe comments for paginated threads
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18
+
+Top-level comment pages filter recipe_id with parent_id IS NULL, reply
+pages filter recipe_id and parent_id; both walk (created_at, id).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "016"
+down_revision = "015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("recipe_comments")}
+    if "ix_recipe_comments_thread" not in idxs:
+        op.create_index(
+            "ix_recipe_comments_thread",
+            "recipe_comments",
+            ["recipe_id", "parent_id", "created_at", "id"],
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("recipe_comments")}
+    if "ix_recipe_comments_thread" in idxs:
+        op.drop_index("ix_recipe_comments_thread", table_name="recipe_comments")
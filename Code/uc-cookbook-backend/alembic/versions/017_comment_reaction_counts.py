@@ -0,0 +1,42 @@
+"""Per-(comment, emoji) reaction counters
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-18
+
+Comment lists read these counters instead of grouping every reaction row.
+The table is backfilled from comment_reactions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "017"
+down_revision = "016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "comment_reaction_counts" not in insp.get_table_names():
+        op.create_table(
+            "comment_reaction_counts",
+            sa.Column("comment_id", sa.Integer(), nullable=False),
+            sa.Column("emoji", sa.String(length=16), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+            sa.ForeignKeyConstraint(["comment_id"], ["recipe_comments.id"]),
+            sa.PrimaryKeyConstraint("comment_id", "emoji"),
+        )
+        op.execute(
+            "INSERT INTO comment_reaction_counts (comment_id, emoji, count) "
+            "SELECT comment_id, emoji, COUNT(*) FROM comment_reactions GROUP BY comment_id, emoji"
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "comment_reaction_counts" in insp.get_table_names():
+        op.drop_table("comment_reaction_counts")
@@ -0,0 +1,36 @@
+"""Index cookbook saves for paginated listing
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-18
+
+Cookbook pages filter user_id and walk (created_at, id) newest first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "018"
+down_revision = "017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("cookbook_saves")}
+    if "ix_cookbook_saves_user_created" not in idxs:
+        op.create_index(
+            "ix_cookbook_saves_user_created",
+            "cookbook_saves",
+            ["user_id", "created_at", "id"],
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    idxs = {i["name"] for i in insp.get_indexes("cookbook_saves")}
+    if "ix_cookbook_saves_user_created" in idxs:
+        op.drop_index("ix_cookbook_saves_user_created", table_name="cookbook_saves")
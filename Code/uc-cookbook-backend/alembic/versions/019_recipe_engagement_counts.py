@@ -0,0 +1,76 @@
+"""Add denormalized save_count and comment_count to recipes
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-18
+
+Backfilled from cookbook_saves and recipe_comments, and indexed like
+fork_count so most_saved / most_discussed / popular feed pages read in
+index order. popular orders by save_count + comment_count + fork_count,
+which needs an expression index (created with IF NOT EXISTS because
+SQLite doesn't reflect expression indexes; the expression is
+parenthesized as PostgreSQL requires).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "019"
+down_revision = "018"
+branch_labels = None
+depends_on = None
+
+
+COUNTERS = {
+    "save_count": "cookbook_saves",
+    "comment_count": "recipe_comments",
+}
+
+FEED_INDEXES = {
+    "ix_recipes_feed_save_count": ["is_published", "visibility", "save_count", "created_at", "id"],
+    "ix_recipes_feed_comment_count": ["is_published", "visibility", "comment_count", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    cols = {c["name"] for c in insp.get_columns("recipes")}
+    for column, source in COUNTERS.items():
+        if column not in cols:
+            # Plain ADD COLUMN (no batch rebuild) so the FTS triggers on recipes survive
+            op.add_column(
+                "recipes",
+                sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+            )
+        op.execute(
+            f"""
+            UPDATE recipes SET {column} = (
+                SELECT COUNT(*) FROM {source}
+                WHERE {source}.recipe_id = recipes.id
+            )
+            """
+        )
+
+    idxs = {i["name"] for i in insp.get_indexes("recipes")}
+    for name, columns in FEED_INDEXES.items():
+        if name not in idxs:
+            op.create_index(name, "recipes", columns)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_recipes_feed_popularity ON recipes "
+        "(is_published, visibility, (save_count + comment_count + fork_count), created_at, id)"
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    op.execute("DROP INDEX IF EXISTS ix_recipes_feed_popularity")
+    idxs = {i["name"] for i in insp.get_indexes("recipes")}
+    for name in FEED_INDEXES:
+        if name in idxs:
+            op.drop_index(name, table_name="recipes")
+    cols = {c["name"] for c in insp.get_columns("recipes")}
+    for column in COUNTERS:
+        if column in cols:
+            op.drop_column("recipes", column)
@@ -1,8 +1,11 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status, Cookie, Header
+from fastapi import Depends, HTTPException, Query, WebSocketException, status, Cookie, Header
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.replicas import WRITE_MARKER_COOKIE, replica_router
+from app.db.session import DbSession, get_db, run_db
 from app.db.models import User
+from app.core.identity import CurrentUser, identity_cache
 from app.core.security import decode_access_token
 
 
@@ -18,58 +21,125 @@ def _get_token_from_cookie_or_header(
     return None
 
 
-async def get_current_user(
-    token: Optional[str] = Depends(_get_token_from_cookie_or_header),
-    db: Session = Depends(get_db)
-) -> User:
+def _load_user_snapshot(db: Session, user_id: int) -> Optional[CurrentUser]:
+    user = db.query(User).filter(User.id == user_id).first()
+    return CurrentUser.from_user(user) if user is not None else None
+
+
+def token_user_id(token: Optional[str]) -> Optional[int]:
     """
-    Dependency to get the current authenticated user from JWT cookie or Authorization header.
+    User id carried by a JWT, verified via the identity cache
     
     Args:
-        token: JWT from httpOnly cookie or Authorization: Bearer header
-        db: Database session
+        token: Raw JWT, if any
         
     Returns:
-        Current user object
-        
-    Raises:
-        HTTPException: If token is invalid or user not found
+        User id from the "sub" claim, or None if the token is missing/invalid
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
     if not token:
-        raise credentials_exception
+        return None
     
-    # Decode token
-    payload = decode_access_token(token)
+    payload = identity_cache.get_claims(token)
     if payload is None:
-        raise credentials_exception
+        payload = decode_access_token(token)
+        if payload is None:
+            return None
+        identity_cache.set_claims(token, payload)
     
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
     # JWT "sub" can be int or string depending on library
     try:
-        user_id = int(user_id)
+        return int(payload.get("sub"))
     except (TypeError, ValueError):
-        raise credentials_exception
+        return None
+
+
+async def _resolve_current_user(token: Optional[str], db: DbSession) -> Optional[CurrentUser]:
+    """
+    Resolve a JWT to the user it identifies, via the identity cache.
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
+    A warm cache answers without verifying the signature again or touching
+    the database.
+    
+    Args:
+        token: Raw JWT, if any
+        db: Database session (only used on a cache miss)
+        
+    Returns:
+        CurrentUser snapshot, or None if the token is missing/invalid or the
+        user no longer exists
+    """
+    user_id = token_user_id(token)
+    if user_id is None:
+        return None
+    
+    current_user = identity_cache.get_user(user_id)
+    if current_user is None:
+        current_user = await run_db(db, _load_user_snapshot, user_id)
+        if current_user is None:
+            return None
+        identity_cache.set_user(current_user)
+    return current_user
+
+
+async def get_read_db(
+    token: Optional[str] = Depends(_get_token_from_cookie_or_header),
+    write_marker: Optional[str] = Cookie(None, alias=WRITE_MARKER_COOKIE),
+):
+    """
+    Dependency for read-only routes: a replica session when replicas are
+    configured, otherwise the primary.
     
+    Users who wrote within READ_YOUR_WRITES_SECONDS read from the primary so
+    they see their own changes. Without replicas this is the primary session.
+    
+    Args:
+        token: JWT from httpOnly cookie or Authorization: Bearer header
+        write_marker: Signed marker set by ReadYourWritesMiddleware on writes
+        
+    Yields:
+        Session (or AsyncSession with DATABASE_ASYNC) for reads only
+    """
+    db = replica_router.read_session(token_user_id(token), write_marker)
+    try:
+        yield db
+    finally:
+        if isinstance(db, AsyncSession):
+            await db.close()
+        else:
+            db.close()
+
+
+async def get_current_user(
+    token: Optional[str] = Depends(_get_token_from_cookie_or_header),
+    db: DbSession = Depends(get_db)
+) -> CurrentUser:
+    """
+    Dependency to get the current authenticated user from JWT cookie or Authorization header.
+    
+    Args:
+        token: JWT from httpOnly cookie or Authorization: Bearer header
+        db: Database session
+        
+    Returns:
+        Snapshot of the current user (id, email, username, created_at)
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    user = await _resolve_current_user(token, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
 async def get_current_user_optional(
     token: Optional[str] = Depends(_get_token_from_cookie_or_header),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: DbSession = Depends(get_db)
+) -> Optional[CurrentUser]:
     """
     Dependency to optionally get the current user (doesn't fail if not authenticated).
     Useful for endpoints that work differently for authenticated vs anonymous users.
@@ -79,22 +149,42 @@ async def get_current_user_optional(
         db: Database session
         
     Returns:
-        Current user object or None if not authenticated
+        Current user snapshot or None if not authenticated
     """
-    if not token:
-        return None
-    
-    payload = decode_access_token(token)
-    if payload is None:
-        return None
-    
-    user_id = payload.get("sub")
-    if user_id is None:
-        return None
-    try:
-        user_id = int(user_id)
-    except (TypeError, ValueError):
-        return None
+    return await _resolve_current_user(token, db)
+
+
+def _get_websocket_token(
+    token: Optional[str] = Query(None),
+    access_token: Optional[str] = Cookie(None),
+    authorization: Optional[str] = Header(None),
+) -> Optional[str]:
+    """Get JWT from cookie, Authorization header or ?token= (browsers can't set WebSocket headers)."""
+    return _get_token_from_cookie_or_header(access_token, authorization) or token
+
+
+async def get_websocket_user(
+    token: Optional[str] = Depends(_get_websocket_token),
+    db: DbSession = Depends(get_db)
+) -> CurrentUser:
+    """
+    WebSocket counterpart of get_current_user: same JWT and identity-cache
+    resolution, but refuses the handshake instead of returning 401.
     
-    user = db.query(User).filter(User.id == user_id).first()
+    Args:
+        token: JWT from cookie, Authorization header or ``token`` query parameter
+        db: Database session
+        
+    Returns:
+        Snapshot of the current user
+        
+    Raises:
+        WebSocketException: Policy violation (1008) if the token is invalid
+    """
+    user = await _resolve_current_user(token, db)
+    if user is None:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason="Could not validate credentials",
+        )
     return user
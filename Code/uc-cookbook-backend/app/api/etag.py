@@ -0,0 +1,33 @@
+"""
+ETag helpers for conditional GETs.
+
+ETags are weak validators built from cheap version inputs (updated_at,
+counters, max ids) so a matching If-None-Match can be answered with 304
+before the response body is assembled.
+"""
+
+import hashlib
+from typing import Any
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the values that determine a payload"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match covers ``etag`` (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current validator"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,45 @@
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.api.deps import _get_token_from_cookie_or_header, token_user_id
+from app.db.replicas import WRITE_MARKER_COOKIE, replica_router
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    Mark successful writes so the writer's next reads skip the replicas
+
+    Pure ASGI (no body buffering): when a non-error response to a write
+    starts, by which point the service layer has committed, a signed
+    WRITE_MARKER_COOKIE naming the writer and the write time is added to it.
+    The marker travels with the client rather than living in this process,
+    so the next read is pinned whichever worker serves it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        user_id = token_user_id(_get_token_from_cookie_or_header(
+            request.cookies.get("access_token"),
+            request.headers.get("authorization"),
+        ))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400 and user_id is not None:
+                marker = replica_router.write_marker(user_id)
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{WRITE_MARKER_COOKIE}={marker}; HttpOnly; Max-Age={replica_router.marker_max_age}; "
+                    "Path=/; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
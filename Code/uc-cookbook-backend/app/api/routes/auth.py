@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import DbSession, get_db
 from app.db.models import User
 from app.schemas.auth import UserCreate, UserLogin, AuthResponse, UserResponse
 from app.schemas.common import SuccessResponse
@@ -14,7 +13,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 async def register(
     user_data: UserCreate,
     response: Response,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """
     Register a new user
@@ -28,7 +27,7 @@ async def register(
         AuthResponse with user data and token in cookie
     """
     # Create user
-    user = AuthService.register_user(db, user_data)
+    user = await AuthService.register_user(db, user_data)
     
     # Create token
     token = AuthService.create_user_token(user)
@@ -57,7 +56,7 @@ async def register(
 async def login(
     credentials: UserLogin,
     response: Response,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """
     Login user with email and password
@@ -74,7 +73,7 @@ async def login(
         HTTPException: If credentials are invalid
     """
     # Authenticate user
-    user = AuthService.authenticate_user(db, credentials.email, credentials.password)
+    user = await AuthService.authenticate_user(db, credentials.email, credentials.password)
     
     if not user:
         raise HTTPException(
@@ -1,51 +1,152 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user, get_current_user_optional
-from app.db.models import User
-from app.db.session import get_db
-from app.schemas.comment import AddCommentRequest, RecipeCommentResponse, SetReactionRequest
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from app.api.deps import get_current_user, get_current_user_optional, get_read_db
+from app.api.etag import etag_matches, make_etag, not_modified
+from app.api.sse import event_stream, event_stream_response
+from app.core.identity import CurrentUser
+from app.core.realtime import comments_channel
+from app.db.session import DbSession, get_db
+from app.schemas.comment import (
+    AddCommentRequest,
+    BatchReactionRequest,
+    BatchReactionResponse,
+    CommentPageResponse,
+    ReactionUpdate,
+    RecipeCommentResponse,
+    SetReactionRequest,
+)
 from app.schemas.common import SuccessResponse
 from app.services.authorization_service import can_view_recipe
-from app.services.comment_service import CommentService
-from app.services.recipe_service import RecipeService
+from app.services.comment_service import AsyncCommentService
+from app.services.recipe_service import AsyncRecipeService
 
 
 router = APIRouter(prefix="/recipes", tags=["Comments"])
 
 
-@router.get("/{recipe_id}/comments", response_model=List[RecipeCommentResponse])
-async def list_comments(
-    recipe_id: int,
-    current_user: User | None = Depends(get_current_user_optional),
-    db: Session = Depends(get_db),
-):
-    recipe = RecipeService.get_recipe_by_id(db, recipe_id)
+async def _visible_recipe(db: DbSession, recipe_id: int, current_user: CurrentUser | None):
+    recipe = await AsyncRecipeService.get_recipe_by_id(db, recipe_id)
     if not recipe:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
 
     if not can_view_recipe(recipe, current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this recipe")
+    return recipe
+
+
+@router.get("/{recipe_id}/comments", response_model=List[RecipeCommentResponse])
+async def list_comments(
+    recipe_id: int,
+    request: Request,
+    response: Response,
+    current_user: CurrentUser | None = Depends(get_current_user_optional),
+    db: DbSession = Depends(get_read_db),
+):
+    recipe = await _visible_recipe(db, recipe_id, current_user)
+
+    uid = current_user.id if current_user else None
+    # reacted_by_me differs per caller, so the viewer is part of the validator
+    etag = make_etag("comments", recipe.id, recipe.comments_version, uid)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    return await AsyncCommentService.list_comments(db, recipe_id, uid)
+
+
+@router.get("/{recipe_id}/comments/threads", response_model=CommentPageResponse)
+async def list_comment_threads(
+    recipe_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=50, description="Number of top-level comments to return"),
+    replies: int = Query(3, ge=0, le=10, description="Replies previewed per comment"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+    current_user: CurrentUser | None = Depends(get_current_user_optional),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Top-level comments, oldest first, each with its reply count and first
+    replies. Load further replies from /comments/{comment_id}/replies.
+    """
+    recipe = await _visible_recipe(db, recipe_id, current_user)
 
     uid = current_user.id if current_user else None
-    return CommentService.list_comments(db, recipe_id, uid)
+    etag = make_etag("comment-threads", recipe.id, recipe.comments_version, uid, limit, replies, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    threads, next_cursor = await AsyncCommentService.list_threads(
+        db, recipe_id, uid, limit=limit, reply_limit=replies, cursor=cursor
+    )
+    return CommentPageResponse(comments=threads, next_cursor=next_cursor)
+
+
+@router.get("/{recipe_id}/comments/{comment_id}/replies", response_model=CommentPageResponse)
+async def list_comment_replies(
+    recipe_id: int,
+    comment_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=50, description="Number of replies to return"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+    current_user: CurrentUser | None = Depends(get_current_user_optional),
+    db: DbSession = Depends(get_read_db),
+):
+    recipe = await _visible_recipe(db, recipe_id, current_user)
+
+    uid = current_user.id if current_user else None
+    etag = make_etag("comment-replies", recipe.id, recipe.comments_version, uid, comment_id, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    replies, next_cursor = await AsyncCommentService.list_replies(
+        db, recipe_id, comment_id, uid, limit=limit, cursor=cursor
+    )
+    return CommentPageResponse(comments=replies, next_cursor=next_cursor)
+
+
+@router.get("/{recipe_id}/comments/stream")
+async def stream_comments(
+    recipe_id: int,
+    request: Request,
+    current_user: CurrentUser | None = Depends(get_current_user_optional),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Server-Sent Events stream of comment changes on a recipe.
+
+    Emits ``comment_added`` (RecipeCommentResponse), ``comment_deleted``
+    (comment_id, deleted_ids) and ``reaction_changed`` (comment_id, user_id,
+    emoji, reactions) as they commit. Event ids are the recipe's comment
+    version: on reconnect, missed events are replayed from Last-Event-ID, or a
+    ``reset`` event asks the client to refetch GET /recipes/{id}/comments.
+    Broadcast reaction summaries have ``reacted_by_me`` false; clients derive
+    their own state from ``user_id``/``emoji``.
+    """
+    recipe = await _visible_recipe(db, recipe_id, current_user)
+
+    stream = event_stream(
+        request,
+        comments_channel(recipe.id),
+        current_id=recipe.comments_version,
+        reset_data={"recipe_id": recipe.id},
+    )
+    return event_stream_response(stream)
 
 
 @router.post("/{recipe_id}/comments", response_model=RecipeCommentResponse, status_code=status.HTTP_201_CREATED)
 async def add_comment(
     recipe_id: int,
     payload: AddCommentRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
 ):
-    recipe = RecipeService.get_recipe_by_id(db, recipe_id)
-    if not recipe:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
-
-    if not can_view_recipe(recipe, current_user):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this recipe")
+    recipe = await _visible_recipe(db, recipe_id, current_user)
 
-    return CommentService.add_comment(db, recipe, current_user, payload)
+    return await AsyncCommentService.add_comment(db, recipe, current_user, payload)
 
 
 @router.post(
@@ -56,32 +157,65 @@ async def set_comment_reaction(
     recipe_id: int,
     comment_id: int,
     payload: SetReactionRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
 ):
-    recipe = RecipeService.get_recipe_by_id(db, recipe_id)
-    if not recipe:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
+    recipe = await _visible_recipe(db, recipe_id, current_user)
 
-    if not can_view_recipe(recipe, current_user):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this recipe")
+    return await AsyncCommentService.set_reaction(db, recipe, comment_id, current_user, payload.emoji)
+
+
+@router.put("/{recipe_id}/comments/{comment_id}/reactions", response_model=ReactionUpdate)
+async def put_comment_reaction(
+    recipe_id: int,
+    comment_id: int,
+    payload: SetReactionRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    """Set the current user's reaction (idempotent, unlike the toggling POST)"""
+    recipe = await _visible_recipe(db, recipe_id, current_user)
+    return await AsyncCommentService.put_reaction(db, recipe, comment_id, current_user, payload.emoji)
+
+
+@router.delete("/{recipe_id}/comments/{comment_id}/reactions", response_model=ReactionUpdate)
+async def clear_comment_reaction(
+    recipe_id: int,
+    comment_id: int,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    """Remove the current user's reaction, if any"""
+    recipe = await _visible_recipe(db, recipe_id, current_user)
+    return await AsyncCommentService.put_reaction(db, recipe, comment_id, current_user, None)
 
-    return CommentService.set_reaction(db, recipe, comment_id, current_user, payload.emoji)
+
+@router.post("/{recipe_id}/comments/reactions/batch", response_model=BatchReactionResponse)
+async def batch_comment_reactions(
+    recipe_id: int,
+    payload: BatchReactionRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Apply many reaction changes in one transaction
+
+    Each change sets (``emoji``) or clears (``emoji: null``) the user's
+    reaction on one comment. Only comments that actually changed are
+    returned, each with just the emoji counts that moved.
+    """
+    recipe = await _visible_recipe(db, recipe_id, current_user)
+    return await AsyncCommentService.apply_reactions(db, recipe, current_user, payload.changes)
 
 
 @router.delete("/{recipe_id}/comments/{comment_id}", response_model=SuccessResponse)
 async def delete_comment(
     recipe_id: int,
     comment_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
 ):
-    recipe = RecipeService.get_recipe_by_id(db, recipe_id)
-    if not recipe:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
-
-    if not can_view_recipe(recipe, current_user):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this recipe")
+    recipe = await _visible_recipe(db, recipe_id, current_user)
 
-    CommentService.delete_comment(db, recipe, comment_id, current_user)
+    await AsyncCommentService.delete_comment(db, recipe, comment_id, current_user)
     return SuccessResponse(message="Comment deleted")
@@ -1,11 +1,16 @@
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user
-from app.db.models import User
-from app.db.session import get_db
-from app.schemas.messaging import ConversationResponse, StartConversationRequest
-from app.services.messaging_service import MessagingService
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from app.api.deps import get_current_user, get_read_db
+from app.core.identity import CurrentUser
+from app.db.session import DbSession, get_db
+from app.schemas.messaging import (
+    ConversationReadResponse,
+    ConversationResponse,
+    MarkReadRequest,
+    StartConversationRequest,
+)
+from app.services.authorization_service import is_participant
+from app.services.messaging_service import AsyncMessagingService
 
 
 router = APIRouter(prefix="/conversations", tags=["Conversations"])
@@ -14,21 +19,47 @@ router = APIRouter(prefix="/conversations", tags=["Conversations"])
 @router.post("", response_model=ConversationResponse)
 async def start_conversation(
     payload: StartConversationRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
 ):
-    conversation = MessagingService.start_conversation(db, current_user, payload.recipient_user_id)
-
-    if payload.initial_message:
-        MessagingService.send_message(db, conversation, current_user, payload.initial_message)
-
-    return ConversationResponse.model_validate(conversation)
+    return await AsyncMessagingService.start_conversation(
+        db, current_user, payload.recipient_user_id, payload.initial_message
+    )
 
 
 @router.get("", response_model=List[ConversationResponse])
 async def get_conversations(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(50, ge=1, le=100, description="Number of conversations to return"),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from a previous page"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_read_db),
 ):
-    conversations = MessagingService.list_conversations(db, current_user)
-    return [ConversationResponse.model_validate(conversation) for conversation in conversations]
+    """
+    Conversations, most recently active first, each with its latest message
+    preview and the caller's unread count.
+
+    When more conversations exist, the X-Next-Cursor response header holds
+    the cursor for the next page.
+    """
+    conversations, next_cursor = await AsyncMessagingService.list_conversations(
+        db, current_user, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return conversations
+
+
+@router.post("/{conversation_id}/read", response_model=ConversationReadResponse)
+async def mark_conversation_read(
+    conversation_id: int,
+    payload: Optional[MarkReadRequest] = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    conversation = await AsyncMessagingService.get_conversation(db, conversation_id)
+    if not is_participant(conversation, current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this conversation")
+
+    message_id = payload.message_id if payload else None
+    return await AsyncMessagingService.mark_read(db, conversation, current_user, message_id)
@@ -1,40 +1,90 @@
-from typing import List
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.db.models import User
-from app.api.deps import get_current_user
-from app.schemas.cookbook import CookbookSaveResponse
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from app.db.session import DbSession, get_db
+from app.core.identity import CurrentUser
+from app.api.deps import get_current_user, get_read_db
+from app.api.etag import etag_matches, make_etag, not_modified
+from app.schemas.cookbook import CookbookBatchRequest, CookbookBatchResponse, CookbookSaveResponse
 from app.schemas.common import SuccessResponse
-from app.services.cookbook_service import CookbookService
+from app.services.cookbook_service import AsyncCookbookService
 
 router = APIRouter(prefix="/cookbook", tags=["Cookbook"])
 
 
 @router.get("", response_model=List[CookbookSaveResponse])
 async def get_cookbook(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    tag: Optional[List[str]] = Query(None, description="Only recipes with any of these tags (repeatable)"),
+    difficulty: Optional[str] = Query(None, description="Filter by difficulty (easy/medium/hard)"),
+    limit: int = Query(50, ge=1, le=100, description="Number of saves to return"),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from a previous page"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_read_db)
 ):
     """
-    Get all recipes saved to user's cookbook (authentication required)
+    Get a page of recipes saved to user's cookbook, most recent first (authentication required)
+    
+    When more saves exist, the X-Next-Cursor response header holds the
+    cursor for the next page. Supports conditional GETs via ETag /
+    If-None-Match; the validator is computed from an aggregate query, so a
+    304 never loads the saves.
     
     Args:
+        tag: Tag filter
+        difficulty: Difficulty filter
+        limit: Max saves per page
+        cursor: Cursor from a previous page
         current_user: Authenticated user (from JWT cookie)
         db: Database session
         
     Returns:
         List of saved recipes with full recipe data
     """
-    saves = CookbookService.get_saved_recipes(db, current_user)
-    return [CookbookSaveResponse.from_orm(save) for save in saves]
+    tags = sorted(set(tag)) if tag else None
+    etag = make_etag(
+        "cookbook", current_user.id, tags, difficulty, limit, cursor,
+        *await AsyncCookbookService.get_cookbook_version(db, current_user)
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    saves, next_cursor = await AsyncCookbookService.get_saved_recipes(
+        db, current_user, limit=limit, cursor=cursor, tags=tags, difficulty=difficulty
+    )
+    response.headers["ETag"] = etag
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return saves
+
+
+# Registered before "/{recipe_id}" so "batch" isn't taken for a recipe id
+@router.post("/batch", response_model=CookbookBatchResponse)
+async def batch_update_cookbook(
+    payload: CookbookBatchRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Save and remove many recipes in one transaction (authentication required)
+    
+    Args:
+        payload: Recipe ids to save and to remove
+        current_user: Authenticated user (from JWT cookie)
+        db: Database session
+        
+    Returns:
+        Recipe ids saved, removed, and unavailable (missing or not visible);
+        ids already in the requested state are ignored
+    """
+    return await AsyncCookbookService.apply_batch(db, payload, current_user)
 
 
 @router.post("/{recipe_id}", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
 async def save_recipe(
     recipe_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db)
 ):
     """
     Save a recipe to user's cookbook (authentication required)
@@ -50,15 +100,15 @@ async def save_recipe(
     Raises:
         HTTPException: If recipe not found or already saved
     """
-    CookbookService.save_recipe(db, recipe_id, current_user)
+    await AsyncCookbookService.save_recipe(db, recipe_id, current_user)
     return SuccessResponse(message="Recipe saved to cookbook")
 
 
 @router.delete("/{recipe_id}", response_model=SuccessResponse)
 async def remove_recipe(
     recipe_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db)
 ):
     """
     Remove a recipe from user's cookbook (authentication required)
@@ -74,5 +124,5 @@ async def remove_recipe(
     Raises:
         HTTPException: If recipe not found in cookbook
     """
-    CookbookService.remove_saved_recipe(db, recipe_id, current_user)
+    await AsyncCookbookService.remove_saved_recipe(db, recipe_id, current_user)
     return SuccessResponse(message="Recipe removed from cookbook")
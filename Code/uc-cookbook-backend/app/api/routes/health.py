@@ -1,4 +1,6 @@
 from fastapi import APIRouter
+from app.core.realtime import message_hub
+from app.core.security import password_hash_pool
 
 router = APIRouter()
 
@@ -12,3 +14,25 @@ async def health_check():
         Status message indicating API is running
     """
     return {"status": "ok"}
+
+
+@router.get("/health/password-hashing")
+async def password_hashing_stats():
+    """
+    bcrypt worker pool statistics
+    
+    Returns:
+        Queue depth, active workers, rejections and wait/run times
+    """
+    return {"password_hash_pool": password_hash_pool.stats()}
+
+
+@router.get("/health/realtime")
+async def realtime_stats():
+    """
+    Real-time message hub statistics
+    
+    Returns:
+        Open subscriptions, publish/delivery counters and broker name
+    """
+    return {"message_hub": message_hub.stats()}
@@ -1,12 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user
-from app.db.models import User
-from app.db.session import get_db
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, WebSocketException, status
+from app.api.deps import get_current_user, get_read_db, get_websocket_user
+from app.core.identity import CurrentUser
+from app.core.realtime import Subscription, conversation_channel, message_hub
+from app.db.session import DbSession, get_db
 from app.schemas.messaging import MessageResponse, SendMessageRequest
 from app.services.authorization_service import is_participant
-from app.services.messaging_service import MessagingService
+from app.services.messaging_service import AsyncMessagingService
 
 
 router = APIRouter(prefix="/conversations", tags=["Messages"])
@@ -15,27 +16,90 @@ router = APIRouter(prefix="/conversations", tags=["Messages"])
 @router.get("/{conversation_id}/messages", response_model=List[MessageResponse])
 async def get_messages(
     conversation_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    before: Optional[int] = Query(None, ge=1, description="Only messages older than this message id"),
+    after: Optional[int] = Query(None, ge=1, description="Only messages newer than this message id (polling)"),
+    limit: int = Query(50, ge=1, le=200, description="Number of messages to return"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_read_db),
 ):
-    conversation = MessagingService.get_conversation(db, conversation_id)
+    """
+    Messages in a conversation, oldest first.
+
+    Without cursors this is the latest page. Pass the first message's id as
+    ``before`` to load older history, or the last seen id as ``after`` to poll
+    for new messages only.
+    """
+    conversation = await AsyncMessagingService.get_conversation(db, conversation_id)
     if not is_participant(conversation, current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this conversation")
 
-    messages = MessagingService.list_messages(db, conversation_id)
-    return [MessageResponse.model_validate(message) for message in messages]
+    return await AsyncMessagingService.list_messages(db, conversation_id, before=before, after=after, limit=limit)
 
 
 @router.post("/{conversation_id}/messages", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
 async def send_message(
     conversation_id: int,
     payload: SendMessageRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
 ):
-    conversation = MessagingService.get_conversation(db, conversation_id)
+    conversation = await AsyncMessagingService.get_conversation(db, conversation_id)
     if not is_participant(conversation, current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this conversation")
 
-    message = MessagingService.send_message(db, conversation, current_user, payload.content)
-    return MessageResponse.model_validate(message)
+    return await AsyncMessagingService.send_message(db, conversation, current_user, payload.content)
+
+
+async def _forward(websocket: WebSocket, subscription: Subscription) -> None:
+    """Send hub events to the client until it disconnects or falls behind"""
+    try:
+        while True:
+            payload = await subscription.get()
+            if subscription.lagged:
+                # Queue overflowed: drop the socket, the client refetches with ?after=
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Subscriber fell behind")
+                return
+            await websocket.send_text(payload)
+    except WebSocketDisconnect:
+        pass
+
+
+async def _drain(websocket: WebSocket) -> None:
+    """Consume client frames until the client disconnects"""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/{conversation_id}/ws")
+async def stream_messages(
+    websocket: WebSocket,
+    conversation_id: int,
+    current_user: CurrentUser = Depends(get_websocket_user),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Push each new message in a conversation to its participants.
+
+    Authenticates like the HTTP routes (cookie or Bearer header), plus a
+    ``token`` query parameter for browser clients. Every frame is a
+    MessageResponse JSON document. On (re)connect, fetch anything missed
+    with GET /conversations/{id}/messages?after=<last seen id>.
+    """
+    if not await AsyncMessagingService.can_subscribe(db, conversation_id, current_user):
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason="Not authorized to access this conversation",
+        )
+
+    await websocket.accept()
+    async with message_hub.subscribe(conversation_channel(conversation_id)) as subscription:
+        forwarder = asyncio.create_task(_forward(websocket, subscription))
+        receiver = asyncio.create_task(_drain(websocket))
+        done, pending = await asyncio.wait({forwarder, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
@@ -1,11 +1,14 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.db.models import User
-from app.api.deps import get_current_user, get_current_user_optional
-from app.schemas.recipe import CreateRecipeRequest, UpdateRecipeRequest, RecipeResponse, RecipesResponse
-from app.services.recipe_service import RecipeService
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from app.db.session import DbSession, get_db
+from app.core.identity import CurrentUser
+from app.api.deps import get_current_user, get_current_user_optional, get_read_db
+from app.api.etag import etag_matches, make_etag, not_modified
+from app.core.cache import CachedResponse, response_cache
+from app.db.replicas import PINNED, READ_AS_OF, READ_ROUTE
+from app.schemas.recipe import CreateRecipeRequest, UpdateRecipeRequest, RecipeResponse, RecipesResponse, RecipeSortEnum, TagMatchEnum
+from app.services.recipe_service import COUNTER_SORTS, AsyncRecipeService
 from app.services.authorization_service import can_view_recipe
 
 router = APIRouter(prefix="/recipes", tags=["Recipes"])
@@ -13,58 +16,128 @@ router = APIRouter(prefix="/recipes", tags=["Recipes"])
 
 @router.get("", response_model=RecipesResponse)
 async def get_recipes(
-    search: Optional[str] = Query(None, description="Search in title and description"),
-    tag: Optional[str] = Query(None, description="Filter by tag"),
+    search: Optional[str] = Query(None, description="Full-text search in title, description, ingredients and tags"),
+    tag: Optional[List[str]] = Query(None, description="Filter by tag (repeat for multiple tags)"),
+    tag_mode: TagMatchEnum = Query(TagMatchEnum.any, description="Match any or all of the given tags"),
     difficulty: Optional[str] = Query(None, description="Filter by difficulty (easy/medium/hard)"),
     limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
-    db: Session = Depends(get_db)
+    sort: Optional[RecipeSortEnum] = Query(None, description="Ordering: newest (default), relevance when searching, most_forked, most_saved, most_discussed or popular"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous newest-first page"),
+    include_total: bool = Query(True, description="Include the total match count"),
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional),
+    db: DbSession = Depends(get_read_db)
 ):
     """
     Get paginated list of recipes with optional filtering
     
     Query Parameters:
-        - search: Search term for title/description
-        - tag: Filter by specific tag
+        - search: Full-text search term (title/description/ingredients/tags)
+        - tag: Filter by tag; repeat the parameter to filter by several tags
+        - tag_mode: any (default) or all of the given tags must match
         - difficulty: Filter by difficulty level
         - limit: Max results (1-100, default 20)
         - offset: Skip N results (for pagination)
+        - sort: newest (default), relevance (BM25 rank, requires search),
+          most_forked, most_saved, most_discussed or popular (forks + saves + comments)
+        - cursor: Keyset cursor for newest-first pages (offset is ignored)
+        - include_total: Set false to skip counting the filtered set
         
     Returns:
-        Paginated list of recipes with total count
+        Paginated list of recipes with total count and next_cursor; for an
+        authenticated caller each recipe also carries is_saved
     """
-    recipes, total = RecipeService.get_recipes(
-        db=db,
-        search=search,
-        tag=tag,
-        difficulty=difficulty,
-        limit=limit,
-        offset=offset
-    )
+    # The feed is identical for every caller, so whole pages are cached;
+    # live counters and the caller's saved state are laid over the shared
+    # page afterwards
+    cache_key = response_cache.list_key({
+        "search": " ".join(search.lower().split()) if search else None,
+        "tag": sorted(set(tag)) if tag else None,
+        "tag_mode": tag_mode.value,
+        "difficulty": difficulty,
+        "limit": limit,
+        "offset": offset,
+        "sort": sort.value if sort else None,
+        "cursor": cursor,
+        "include_total": include_total,
+    }, counter_sorted=sort in COUNTER_SORTS)
+    cached = _cache_get(db, cache_key)
+    if cached is None:
+        cached = await _build_feed_page(
+            db, cache_key,
+            search=search,
+            tags=tag,
+            tag_mode=tag_mode,
+            difficulty=difficulty,
+            limit=limit,
+            offset=offset,
+            sort=sort,
+            cursor=cursor,
+            include_total=include_total,
+        )
+        # A page just read already has live counters
+        if current_user is None:
+            return cached.as_response()
+    return await _with_live_state(db, cached, current_user)
+
+
+async def _build_feed_page(db: DbSession, cache_key: str, **filters) -> CachedResponse:
+    recipes, total, next_cursor = await AsyncRecipeService.get_recipes(db, **filters)
     
-    # Build responses and include fork_count for each recipe
-    recipe_responses = []
-    from app.db.models import Recipe as RecipeModel
-    for r in recipes:
-        res = RecipeResponse.model_validate(r)
-        # compute fork count (number of recipes that reference this as origin)
-        fork_count = db.query(RecipeModel).filter(RecipeModel.origin_recipe_id == r.id).count()
-        res.fork_count = fork_count
-        recipe_responses.append(res)
-
-    return RecipesResponse(
-        recipes=recipe_responses,
+    payload = RecipesResponse(
+        recipes=recipes,
         total=total,
-        limit=limit,
-        offset=offset,
+        limit=filters["limit"],
+        offset=filters["offset"],
+        next_cursor=next_cursor,
     )
+    cached = CachedResponse(body=payload.model_dump_json().encode("utf-8"))
+    _cache_set(db, cache_key, cached)
+    return cached
+
+
+def _cache_get(db: DbSession, cache_key: str) -> Optional[CachedResponse]:
+    # A recent writer is pinned to the primary to see their own change; a
+    # shared entry may predate it, so they skip the cache altogether
+    if db.info.get(READ_ROUTE) == PINNED:
+        return None
+    return response_cache.get(cache_key)
+
+
+def _cache_set(db: DbSession, cache_key: str, cached: CachedResponse) -> None:
+    # Only store what is known to include every invalidated write: not a
+    # pinned read, nor one (e.g. from a lagging replica) that may predate
+    # the latest invalidation and would otherwise outlive it in the cache
+    if db.info.get(READ_ROUTE) == PINNED or response_cache.changed_since(db.info.get(READ_AS_OF)):
+        return
+    response_cache.set(cache_key, cached)
+
+
+async def _with_live_state(db: DbSession, cached: CachedResponse, current_user: Optional[CurrentUser]) -> Response:
+    """
+    Lay live counters (and the caller's is_saved) over a shared feed page, in one IN query
+
+    save_count and comment_count change far more often than the feed itself,
+    so invalidate_counters leaves newest-first and filtered pages cached and
+    their counters are read here instead.
+    """
+    page = json.loads(cached.body)
+    state = await AsyncRecipeService.get_feed_state(
+        db,
+        [recipe["id"] for recipe in page["recipes"]],
+        current_user.id if current_user is not None else None,
+    )
+    for recipe in page["recipes"]:
+        recipe.update(state.get(recipe["id"], {}))
+    body = json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return CachedResponse(body=body, headers=cached.headers).as_response()
 
 
 @router.post("", response_model=RecipeResponse, status_code=status.HTTP_201_CREATED)
 async def create_recipe(
     recipe_data: CreateRecipeRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db)
 ):
     """
     Create a new recipe (authentication required)
@@ -77,22 +150,23 @@ async def create_recipe(
     Returns:
         Created recipe
     """
-    recipe = RecipeService.create_recipe(db, recipe_data, current_user)
-    resp = RecipeResponse.model_validate(recipe)
-    from app.db.models import Recipe as RecipeModel
-    resp.fork_count = db.query(RecipeModel).filter(RecipeModel.origin_recipe_id == recipe.id).count()
-    return resp
+    return await AsyncRecipeService.create_recipe(db, recipe_data, current_user)
 
 
 @router.get("/{recipe_id}", response_model=RecipeResponse)
 async def get_recipe(
     recipe_id: int,
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional),
+    db: DbSession = Depends(get_read_db)
 ):
     """
     Get recipe by ID
     
+    Supports conditional GETs: responses carry an ETag and a matching
+    If-None-Match is answered with 304 Not Modified.
+    
     Args:
         recipe_id: Recipe ID
         db: Database session
@@ -103,7 +177,17 @@ async def get_recipe(
     Raises:
         HTTPException: If recipe not found
     """
-    recipe = RecipeService.get_recipe_by_id(db, recipe_id)
+    # Anonymous payloads are the same for everyone; serve them from cache
+    cache_key = response_cache.detail_key(recipe_id)
+    if current_user is None:
+        cached = _cache_get(db, cache_key)
+        if cached is not None:
+            etag = cached.headers.get("ETag")
+            if etag and etag_matches(request, etag):
+                return not_modified(etag)
+            return cached.as_response()
+    
+    recipe = await AsyncRecipeService.get_recipe_by_id(db, recipe_id)
     
     if not recipe:
         raise HTTPException(
@@ -117,20 +201,32 @@ async def get_recipe(
             detail="Not authorized to view this recipe"
         )
     
-    resp = RecipeResponse.model_validate(recipe)
-    from app.db.models import Recipe as RecipeModel
-    resp.fork_count = db.query(RecipeModel).filter(RecipeModel.origin_recipe_id == recipe.id).count()
-    return resp
+    etag = make_etag(
+        "recipe", recipe.id, recipe.updated_at, recipe.fork_count, recipe.save_count, recipe.comment_count
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    payload = await AsyncRecipeService.to_response(db, recipe)
+    if current_user is None:
+        cached = CachedResponse(
+            body=payload.model_dump_json().encode("utf-8"),
+            headers={"ETag": etag},
+        )
+        _cache_set(db, cache_key, cached)
+        return cached.as_response()
+    response.headers["ETag"] = etag
+    return payload
 
 
 @router.put("/{recipe_id}", response_model=RecipeResponse)
 async def update_recipe(
     recipe_id: int,
     recipe_data: UpdateRecipeRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
 ):
-    recipe = RecipeService.get_recipe_by_id(db, recipe_id)
+    recipe = await AsyncRecipeService.get_recipe_by_id(db, recipe_id)
 
     if not recipe:
         raise HTTPException(
@@ -138,20 +234,19 @@ async def update_recipe(
             detail="Recipe not found"
         )
 
-    recipe = RecipeService.update_recipe(db, recipe, recipe_data, current_user)
-    return RecipeResponse.model_validate(recipe)
+    return await AsyncRecipeService.update_recipe(db, recipe, recipe_data, current_user)
 
 
 @router.delete("/{recipe_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_recipe(
     recipe_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
 ):
-    recipe = RecipeService.get_recipe_by_id(db, recipe_id)
+    recipe = await AsyncRecipeService.get_recipe_by_id(db, recipe_id)
     if not recipe:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recipe not found",
         )
-    RecipeService.delete_recipe(db, recipe, current_user)
+    await AsyncRecipeService.delete_recipe(db, recipe, current_user)
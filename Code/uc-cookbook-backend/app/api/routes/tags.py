@@ -0,0 +1,26 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from app.api.deps import get_read_db
+from app.db.session import DbSession
+from app.schemas.recipe import TagCountResponse
+from app.services.recipe_service import AsyncRecipeService
+
+router = APIRouter(prefix="/tags", tags=["Tags"])
+
+
+@router.get("", response_model=List[TagCountResponse])
+async def get_tags(
+    limit: int = Query(50, ge=1, le=200, description="Number of tags to return"),
+    db: DbSession = Depends(get_read_db)
+):
+    """
+    Get tags used by public recipes with per-tag recipe counts
+    
+    Query Parameters:
+        - limit: Max tags (1-200, default 50)
+        
+    Returns:
+        Tags ordered by number of recipes, most used first
+    """
+    rows = await AsyncRecipeService.get_tag_counts(db, limit=limit)
+    return [TagCountResponse(tag=tag, count=count) for tag, count in rows]
@@ -0,0 +1,112 @@
+"""
+Server-Sent Events helpers.
+
+Channels streamed over SSE carry JSON envelopes ``{"id", "event", "data"}``
+whose ids increase by exactly one per change (e.g. Recipe.comments_version),
+which is what makes Last-Event-ID resume checkable: the hub's replay buffer
+either covers every id the client missed, or the client is told to reset and
+refetch the full resource.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.realtime import message_hub
+
+
+def format_event(event_id: int, event: str, data: Any) -> str:
+    """Encode one SSE frame; ``data`` is serialized as a single JSON line"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def last_event_id(request: Request) -> Optional[int]:
+    """Last-Event-ID header (sent by EventSource on reconnect) or ?last_event_id="""
+    raw = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    try:
+        return int(raw) if raw is not None else None
+    except ValueError:
+        return None
+
+
+def _missed_events(channel: str, since: int, current_id: int) -> Optional[list]:
+    """Replayable events after ``since``, or None if the buffer has a gap"""
+    missed = sorted(
+        (event for event in map(json.loads, message_hub.recent(channel)) if event["id"] > since),
+        key=lambda event: event["id"],
+    )
+    covered = [event["id"] for event in missed if event["id"] <= current_id]
+    if covered != list(range(since + 1, current_id + 1)):
+        return None
+    return missed
+
+
+async def event_stream(
+    request: Request,
+    channel: str,
+    current_id: int,
+    reset_data: Dict[str, Any],
+) -> AsyncIterator[str]:
+    """
+    Stream ``channel`` as SSE frames, resuming from the client's Last-Event-ID
+
+    Args:
+        request: Incoming request (Last-Event-ID, disconnect detection)
+        channel: Hub channel carrying JSON event envelopes
+        current_id: Latest event id committed when the stream was opened
+        reset_data: Payload of the ``reset`` event sent when the missed
+            events can't be replayed; the client refetches the resource
+
+    Yields:
+        SSE frames, keepalive comments every SSE_KEEPALIVE_SECONDS; the stream
+        ends after SSE_MAX_STREAM_SECONDS and the client reconnects
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.SSE_MAX_STREAM_SECONDS
+    since = last_event_id(request)
+
+    async with message_hub.subscribe(channel) as subscription:
+        # Subscribed before reading the buffer: anything delivered meanwhile is
+        # in both, so already-sent ids are skipped when they come off the queue
+        sent: Set[int] = set()
+        floor = -1
+        if since is not None:
+            missed = _missed_events(channel, since, current_id) if since <= current_id else None
+            if missed is None:
+                floor = current_id
+                yield format_event(current_id, "reset", reset_data)
+            else:
+                for event in missed:
+                    sent.add(event["id"])
+                    yield format_event(event["id"], event["event"], event["data"])
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                payload = await asyncio.wait_for(
+                    subscription.get(), min(settings.SSE_KEEPALIVE_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            if subscription.lagged:
+                # Fell behind: end the stream, the client resumes via Last-Event-ID
+                return
+            event = json.loads(payload)
+            if event["id"] <= floor or event["id"] in sent:
+                continue
+            yield format_event(event["id"], event["event"], event["data"])
+
+
+def event_stream_response(stream: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
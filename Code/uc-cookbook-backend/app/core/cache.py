@@ -0,0 +1,292 @@
+"""
+Response cache for public, user-independent API payloads.
+
+Entries are pre-serialized response bodies so a hit skips the database,
+model validation and JSON encoding. Backends only deal in bytes:
+
+- MemoryCacheBackend: per-process LRU with TTL (default)
+- RedisCacheBackend: any redis-py compatible client, shared across workers
+- NullCacheBackend: caching disabled
+
+List pages are keyed under a feed generation token; any write that can
+change a list page swaps the token, which orphans every cached page at
+once (they age out via TTL/LRU) without having to enumerate keys. Pages
+ordered by a save/comment counter also carry a counter generation, swapped
+on every counter change, so those orderings never go stale while the much
+hotter newest-first pages stay cached (the feed route reads their counters
+live rather than trusting the cached values).
+
+Invalidations also record when they happened, so a read that may predate
+one (a lagging replica, or a read racing the write) can be served without
+being stored.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from fastapi import Response
+from app.core.config import settings
+
+
+class CacheBackend:
+    """Minimal key/value interface the response cache needs"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend that stores nothing (RESPONSE_CACHE_BACKEND=none)"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with per-entry expiry
+
+    Values are stored as-is, so in-process callers (see app.core.identity)
+    may keep objects rather than bytes.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[Optional[float], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> Optional[int]:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend over a redis-py compatible client (get/set/delete/scan_iter)"""
+
+    def __init__(self, client: Any, prefix: str = "uc-cookbook:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl or None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+@dataclass
+class CachedResponse:
+    """Serialized response body plus the headers to replay with it"""
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def encode(self) -> bytes:
+        return json.dumps(self.headers).encode("utf-8") + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedResponse":
+        headers, _, body = raw.partition(b"\n")
+        return cls(body=body, headers=json.loads(headers))
+
+    def as_response(self) -> Response:
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+
+class ResponseCache:
+    """Keyed response cache with recipe-level invalidation and hit/miss counters"""
+
+    FEED_GENERATION_KEY = "recipes:feed:generation"
+    COUNTER_GENERATION_KEY = "recipes:feed:counter_generation"
+    INVALIDATED_AT_KEY = "recipes:invalidated_at"
+
+    def __init__(self, backend: CacheBackend, ttl: int = 30):
+        self.backend = backend
+        self.ttl = ttl
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _generation(self, key: str) -> str:
+        generation = self.backend.get(key)
+        if generation is None:
+            # Missing (evicted or first use): start a fresh namespace
+            generation = uuid.uuid4().hex.encode("ascii")
+            self.backend.set(key, generation)
+        return generation.decode("ascii")
+
+    def list_key(self, params: Dict[str, Any], counter_sorted: bool = False) -> str:
+        """
+        Key for a recipe list page under the current feed generation
+
+        Args:
+            params: Normalized query parameters of the page
+            counter_sorted: The page is ordered by a counter that
+                invalidate_counters may change (also keyed by its generation)
+        """
+        normalized = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        generation = self._generation(self.FEED_GENERATION_KEY)
+        if counter_sorted:
+            generation += "." + self._generation(self.COUNTER_GENERATION_KEY)
+        return f"recipes:list:{generation}:{normalized}"
+
+    @staticmethod
+    def detail_key(recipe_id: int) -> str:
+        """Key for a single recipe payload"""
+        return f"recipes:detail:{recipe_id}"
+
+    def _mark_invalidated(self) -> None:
+        self.backend.set(self.INVALIDATED_AT_KEY, repr(time.time()).encode("ascii"))
+        self._count("invalidations")
+
+    def changed_since(self, timestamp: Optional[float]) -> bool:
+        """
+        Whether an invalidation happened at or after ``timestamp``
+
+        A payload read from data current as of ``timestamp`` may miss such a
+        write and must not be stored. None means the read is current.
+        """
+        if timestamp is None:
+            return False
+        invalidated_at = self.backend.get(self.INVALIDATED_AT_KEY)
+        return invalidated_at is not None and float(invalidated_at) >= timestamp
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self.backend.get(key)
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return CachedResponse.decode(raw)
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        self.backend.set(key, response.encode(), self.ttl)
+        self._count("stores")
+
+    def invalidate_recipe(self, recipe_id: Optional[int] = None) -> None:
+        """
+        Drop cached payloads that include a recipe
+
+        Args:
+            recipe_id: Recipe whose detail entry to drop; every list page is
+                invalidated regardless, since any recipe may appear on one
+        """
+        if recipe_id is not None:
+            self.backend.delete(self.detail_key(recipe_id))
+        self.backend.set(self.FEED_GENERATION_KEY, uuid.uuid4().hex.encode("ascii"))
+        self._mark_invalidated()
+
+    def invalidate_counters(self, *recipe_ids: int) -> None:
+        """
+        Drop cached payloads whose save/comment counters changed
+
+        Detail entries and counter-sorted list pages are dropped. Other list
+        pages stay cached, since swapping the feed generation on every save
+        or comment would keep the feed cache cold on a busy site; the feed
+        route overlays their counters from the database on every response.
+        """
+        for recipe_id in recipe_ids:
+            self.backend.delete(self.detail_key(recipe_id))
+        self.backend.set(self.COUNTER_GENERATION_KEY, uuid.uuid4().hex.encode("ascii"))
+        self._mark_invalidated()
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["backend"] = type(self.backend).__name__
+        stats["entries"] = self.backend.size()
+        return stats
+
+
+def build_response_cache() -> ResponseCache:
+    """Create the response cache configured by RESPONSE_CACHE_* settings"""
+    backend_name = settings.RESPONSE_CACHE_BACKEND.lower()
+    if backend_name == "none":
+        backend: CacheBackend = NullCacheBackend()
+    elif backend_name == "redis":
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package") from exc
+        if not settings.REDIS_URL:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires REDIS_URL")
+        backend = RedisCacheBackend(redis.Redis.from_url(settings.REDIS_URL))
+    elif backend_name == "memory":
+        backend = MemoryCacheBackend(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+    else:
+        raise RuntimeError(f"Unknown RESPONSE_CACHE_BACKEND: {settings.RESPONSE_CACHE_BACKEND}")
+    return ResponseCache(backend, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = build_response_cache()
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -10,6 +10,27 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./uc_cookbook.db"
+    # Serve requests over an asyncio driver (aiosqlite / asyncpg) instead of
+    # running the sync driver in the threadpool
+    DATABASE_ASYNC: bool = False
+    # Comma-separated read replica URLs for GET traffic (empty = primary only)
+    DATABASE_REPLICA_URLS: str = ""
+    # Keep a user's reads on the primary this long after they write
+    READ_YOUR_WRITES_SECONDS: int = 5
+    
+    # Connection pool (server databases)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite per-connection tuning (empty SQLITE_JOURNAL_MODE keeps the default)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB, i.e. ~64 MB
     
     # JWT Settings
     SECRET_KEY: str
@@ -22,6 +43,35 @@ class Settings(BaseSettings):
     # API
     API_V1_PREFIX: str = "/api/v1"
     
+    # Response cache for anonymous recipe reads ("memory", "redis" or "none")
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    REDIS_URL: Optional[str] = None
+    
+    # Per-process cache of verified tokens and user snapshots (0 disables)
+    IDENTITY_CACHE_TTL_SECONDS: int = 60
+    IDENTITY_CACHE_MAX_ENTRIES: int = 4096
+    
+    # bcrypt worker pool (0 workers = hash inline on the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 256
+    
+    # Real-time message fan-out ("local" = this process only, "redis" = all workers via REDIS_URL)
+    MESSAGE_BROKER_BACKEND: str = "local"
+    MESSAGE_STREAM_QUEUE_SIZE: int = 100
+    # Recent events kept per channel (and channels kept) for Last-Event-ID resume
+    REALTIME_REPLAY_SIZE: int = 100
+    REALTIME_REPLAY_CHANNELS: int = 1024
+    # Server-Sent Events: keepalive comment interval and maximum stream lifetime
+    SSE_KEEPALIVE_SECONDS: float = 15
+    SSE_MAX_STREAM_SECONDS: float = 300
+    
+    @property
+    def database_replica_urls(self) -> List[str]:
+        """Convert comma-separated replica URLs to list"""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Convert comma-separated CORS origins to list"""
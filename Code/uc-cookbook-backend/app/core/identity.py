@@ -0,0 +1,120 @@
+"""
+Identity cache for authenticated requests.
+
+get_current_user would otherwise verify the JWT signature and SELECT the user
+row on every request. Two bounded, per-process TTL caches remove that work
+from hot endpoints (message polling, cookbook):
+
+- verified token -> claims, never kept past the token's own ``exp``
+- user id -> CurrentUser, a detached snapshot of the columns routes read
+
+User snapshots are dropped whenever the ORM updates or deletes the row (see
+the listeners in app.db.models), so the TTL only bounds staleness from
+writes made outside this process.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.core.cache import CacheBackend, MemoryCacheBackend, NullCacheBackend
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Lightweight, session-independent view of the authenticated user"""
+    id: int
+    email: str
+    username: str
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: Any) -> "CurrentUser":
+        return cls(id=user.id, email=user.email, username=user.username, created_at=user.created_at)
+
+
+class IdentityCache:
+    """Token-claims and user-snapshot caches with hit/miss counters"""
+
+    def __init__(self, claims: CacheBackend, users: CacheBackend, ttl: int = 60):
+        self.claims = claims
+        self.users = users
+        self.ttl = ttl
+        self._counters = {
+            "token_hits": 0,
+            "token_misses": 0,
+            "user_hits": 0,
+            "user_misses": 0,
+            "invalidations": 0,
+        }
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        claims = self.claims.get(token)
+        if claims is not None and claims.get("exp") is not None and claims["exp"] <= time.time():
+            # Cached before expiry but the token has lapsed since
+            self.claims.delete(token)
+            claims = None
+        self._count("token_hits" if claims is not None else "token_misses")
+        return claims
+
+    def set_claims(self, token: str, claims: Dict[str, Any]) -> None:
+        ttl = self.ttl
+        exp = claims.get("exp")
+        if exp is not None:
+            remaining = int(exp - time.time())
+            if remaining <= 0:
+                return
+            ttl = min(ttl, remaining)
+        self.claims.set(token, claims, ttl)
+
+    def get_user(self, user_id: int) -> Optional[CurrentUser]:
+        user = self.users.get(str(user_id))
+        self._count("user_hits" if user is not None else "user_misses")
+        return user
+
+    def set_user(self, user: CurrentUser) -> None:
+        self.users.set(str(user.id), user, self.ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop a user's snapshot after the row changed or was deleted"""
+        self.users.delete(str(user_id))
+        self._count("invalidations")
+
+    def clear(self) -> None:
+        self.claims.clear()
+        self.users.clear()
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        for kind in ("token", "user"):
+            lookups = stats[f"{kind}_hits"] + stats[f"{kind}_misses"]
+            stats[f"{kind}_hit_ratio"] = round(stats[f"{kind}_hits"] / lookups, 4) if lookups else 0.0
+        stats["tokens"] = self.claims.size()
+        stats["users"] = self.users.size()
+        return stats
+
+
+def build_identity_cache() -> IdentityCache:
+    """Create the identity cache configured by IDENTITY_CACHE_* settings"""
+    if settings.IDENTITY_CACHE_TTL_SECONDS <= 0:
+        return IdentityCache(NullCacheBackend(), NullCacheBackend(), ttl=0)
+    max_entries = settings.IDENTITY_CACHE_MAX_ENTRIES
+    return IdentityCache(
+        MemoryCacheBackend(max_entries=max_entries),
+        MemoryCacheBackend(max_entries=max_entries),
+        ttl=settings.IDENTITY_CACHE_TTL_SECONDS,
+    )
+
+
+identity_cache = build_identity_cache()
@@ -0,0 +1,313 @@
+"""
+Pub/sub fan-out for real-time delivery (message WebSockets, comment SSE).
+
+Streaming handlers subscribe to a channel on the process-local MessageHub
+and the service layer publishes to it once a write has committed. The hub
+hands publishes to a Broker, which delivers them back to every hub sharing
+it:
+
+- LocalBroker: delivers straight back to this process's hub (default; one
+  worker, tests)
+- RedisBroker: Redis PUBLISH/PSUBSCRIBE over a redis.asyncio client, so
+  every uvicorn worker sees every event
+
+Each subscriber has a bounded queue. A subscriber that falls QUEUE_SIZE
+events behind is flagged as lagged instead of buffering without limit; the
+handler then closes it and the client catches up over HTTP.
+
+The hub also keeps the last REPLAY_SIZE payloads of recently active
+channels so a reconnecting stream can resume from its Last-Event-ID.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str], None]
+
+
+def conversation_channel(conversation_id: int) -> str:
+    return f"conversation:{conversation_id}"
+
+
+def comments_channel(recipe_id: int) -> str:
+    return f"recipe-comments:{recipe_id}"
+
+
+class Broker:
+    """Transport between hubs: publish events, deliver them to subscribed hubs"""
+
+    async def start(self, deliver: Deliver) -> None:
+        """Begin delivering published events as ``deliver(channel, payload)``"""
+        raise NotImplementedError
+
+    async def publish(self, channel: str, payload: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalBroker(Broker):
+    """In-process broker: a publish is delivered to this process only"""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, channel: str, payload: str) -> None:
+        if self._deliver is not None:
+            self._deliver(channel, payload)
+
+
+class RedisBroker(Broker):
+    """
+    Broker over a redis.asyncio compatible client (publish/pubsub)
+
+    If the pub/sub connection fails the listener logs it and resubscribes,
+    backing off exponentially from ``reconnect_delay`` up to
+    ``max_reconnect_delay`` seconds. Events published meanwhile are not
+    delivered; streams catch up from their Last-Event-ID or over HTTP.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = "uc-cookbook:events:",
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        await self._subscribe()
+        self._listener = asyncio.create_task(self._listen(deliver))
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self.client.pubsub()
+        await self._pubsub.psubscribe(self.prefix + "*")
+
+    async def _drop_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+    async def _listen(self, deliver: Deliver) -> None:
+        delay = self.reconnect_delay
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                    logger.info("Redis pub/sub resubscribed to %s*", self.prefix)
+                    delay = self.reconnect_delay
+                await self._receive(deliver)
+                raise ConnectionError("pub/sub stream ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Redis pub/sub listener failed; reconnecting in %.1fs", delay)
+                await self._drop_pubsub()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _receive(self, deliver: Deliver) -> None:
+        async for event in self._pubsub.listen():
+            if event["type"] != "pmessage":
+                continue
+            channel, payload = event["channel"], event["data"]
+            if isinstance(channel, bytes):
+                channel = channel.decode("utf-8")
+            if isinstance(payload, bytes):
+                payload = payload.decode("utf-8")
+            deliver(channel[len(self.prefix):], payload)
+
+    async def publish(self, channel: str, payload: str) -> None:
+        await self.client.publish(self.prefix + channel, payload)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self._drop_pubsub()
+
+
+class Subscription:
+    """One subscriber's bounded queue, bound to the event loop it reads on"""
+
+    def __init__(self, channel: str, queue_size: int):
+        self.channel = channel
+        self.lagged = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, payload: str) -> None:
+        """Queue ``payload``; safe to call from any thread or event loop"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(payload)
+        else:
+            self._loop.call_soon_threadsafe(self._put, payload)
+
+    def _put(self, payload: str) -> None:
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+
+class MessageHub:
+    """Process-local registry of subscribers, fed by a Broker"""
+
+    def __init__(
+        self,
+        broker: Broker,
+        queue_size: int = 100,
+        replay_size: int = 100,
+        replay_channels: int = 1024,
+    ):
+        self.broker = broker
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        self.replay_channels = replay_channels
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._history: "OrderedDict[str, Deque[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._started = False
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._stats = {"published": 0, "delivered": 0, "publish_errors": 0}
+
+    async def _ensure_started(self) -> None:
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if not self._started:
+                await self.broker.start(self._deliver)
+                self._started = True
+
+    def _deliver(self, channel: str, payload: str) -> None:
+        with self._lock:
+            self._remember(channel, payload)
+            subscribers = list(self._subscribers.get(channel, ()))
+            self._stats["delivered"] += len(subscribers)
+        for subscription in subscribers:
+            subscription.push(payload)
+
+    def _remember(self, channel: str, payload: str) -> None:
+        if self.replay_size <= 0:
+            return
+        history = self._history.get(channel)
+        if history is None:
+            history = self._history[channel] = deque(maxlen=self.replay_size)
+            if len(self._history) > self.replay_channels:
+                self._history.popitem(last=False)
+        else:
+            self._history.move_to_end(channel)
+        history.append(payload)
+
+    def recent(self, channel: str) -> List[str]:
+        """Payloads last delivered on ``channel``, oldest first (at most REPLAY_SIZE)"""
+        with self._lock:
+            return list(self._history.get(channel, ()))
+
+    async def publish(self, channel: str, payload: str) -> None:
+        """
+        Publish ``payload`` to every subscriber of ``channel`` on every worker
+
+        Callers publish after their write has committed, so a broker outage
+        is counted rather than raised: the write stands and clients still
+        see it on their next fetch.
+        """
+        try:
+            await self._ensure_started()
+            await self.broker.publish(channel, payload)
+        except Exception:
+            with self._lock:
+                self._stats["publish_errors"] += 1
+            return
+        with self._lock:
+            self._stats["published"] += 1
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        """Receive ``channel``'s events for the duration of the block"""
+        await self._ensure_started()
+        subscription = Subscription(channel, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def clear(self) -> None:
+        """Forget the replay history (subscribers stay attached)"""
+        with self._lock:
+            self._history.clear()
+
+    async def close(self) -> None:
+        await self.broker.close()
+        self._started = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["channels"] = len(self._subscribers)
+            stats["subscribers"] = sum(len(s) for s in self._subscribers.values())
+            stats["replay_channels"] = len(self._history)
+        stats["broker"] = type(self.broker).__name__
+        return stats
+
+
+def build_message_hub() -> MessageHub:
+    """Create the hub configured by MESSAGE_BROKER_BACKEND / MESSAGE_STREAM_* / REALTIME_REPLAY_*"""
+    backend_name = settings.MESSAGE_BROKER_BACKEND.lower()
+    if backend_name == "local":
+        broker: Broker = LocalBroker()
+    elif backend_name == "redis":
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("MESSAGE_BROKER_BACKEND=redis requires the 'redis' package") from exc
+        if not settings.REDIS_URL:
+            raise RuntimeError("MESSAGE_BROKER_BACKEND=redis requires REDIS_URL")
+        broker = RedisBroker(redis_asyncio.Redis.from_url(settings.REDIS_URL))
+    else:
+        raise RuntimeError(f"Unknown MESSAGE_BROKER_BACKEND: {settings.MESSAGE_BROKER_BACKEND}")
+    return MessageHub(
+        broker,
+        queue_size=settings.MESSAGE_STREAM_QUEUE_SIZE,
+        replay_size=settings.REALTIME_REPLAY_SIZE,
+        replay_channels=settings.REALTIME_REPLAY_CHANNELS,
+    )
+
+
+message_hub = build_message_hub()
@@ -1,9 +1,16 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 import bcrypt
 from app.core.config import settings
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
@@ -18,6 +25,131 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+class PasswordHashPool:
+    """
+    Bounded worker pool for bcrypt work
+    
+    bcrypt takes ~250ms of CPU per call; run inline in an async handler it
+    stalls every other request on the worker. bcrypt releases the GIL, so a
+    small thread pool gives real parallelism without a process pool's
+    pickling and startup costs. ``max_workers`` caps concurrent hashes and
+    ``max_queue`` caps callers waiting for a worker (excess get a 503
+    instead of piling up). ``max_workers=0`` runs inline (legacy behavior).
+    """
+    
+    def __init__(self, max_workers: int = 4, max_queue: int = 256):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._counters: Dict[str, Any] = {
+            "completed": 0,
+            "rejected": 0,
+            "max_queued": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+        }
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hash",
+                )
+            return self._executor
+    
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` on the pool and await its result
+        
+        Raises:
+            HTTPException: 503 if the wait queue is full
+        """
+        if self.max_workers <= 0:
+            return fn(*args)
+        
+        with self._lock:
+            if self.max_queue and self._queued >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in requests in progress, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._queued += 1
+            self._counters["max_queued"] = max(self._counters["max_queued"], self._queued)
+        submitted = time.perf_counter()
+        dequeued = False
+        
+        def leave_queue() -> None:
+            # Called with the lock held, by whichever of the worker or a
+            # cancelled caller gets there first
+            nonlocal dequeued
+            if not dequeued:
+                dequeued = True
+                self._queued -= 1
+        
+        def task() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                leave_queue()
+                self._active += 1
+                wait = started - submitted
+                self._counters["wait_seconds_total"] += wait
+                self._counters["wait_seconds_max"] = max(self._counters["wait_seconds_max"], wait)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._counters["completed"] += 1
+                    self._counters["run_seconds_total"] += time.perf_counter() - started
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), task)
+        finally:
+            # A caller cancelled while still queued never reaches task()
+            with self._lock:
+                leave_queue()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["queued"] = self._queued
+            stats["active"] = self._active
+        completed = stats["completed"]
+        stats["wait_seconds_avg"] = round(stats["wait_seconds_total"] / completed, 4) if completed else 0.0
+        stats["run_seconds_avg"] = round(stats["run_seconds_total"] / completed, 4) if completed else 0.0
+        stats["max_workers"] = self.max_workers
+        stats["max_queue"] = self.max_queue
+        return stats
+    
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0.0 if isinstance(self._counters[name], float) else 0
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hash pool (use from async code)"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hash pool (use from async code)"""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
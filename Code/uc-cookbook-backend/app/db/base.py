@@ -3,10 +3,13 @@ from app.db.session import Base
 from app.db.models import (
     User,
     Recipe,
+    RecipeTag,
     CookbookSave,
     RecipeComment,
     CommentReaction,
+    CommentReactionCount,
     Conversation,
+    ConversationRead,
     Message,
 )
 
@@ -14,9 +17,12 @@ __all__ = [
     "Base",
     "User",
     "Recipe",
+    "RecipeTag",
     "CookbookSave",
     "RecipeComment",
     "CommentReaction",
+    "CommentReactionCount",
     "Conversation",
+    "ConversationRead",
     "Message",
 ]
@@ -11,10 +11,14 @@ from sqlalchemy import (
     UniqueConstraint,
     Boolean,
     CheckConstraint,
+    Index,
+    event,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, object_session, relationship
 import enum
 from app.db.session import Base
+from app.db.search import create_search_index, drop_search_index
+from app.core.identity import identity_cache
 
 
 class DifficultyEnum(str, enum.Enum):
@@ -60,6 +64,34 @@ class User(Base):
     comment_reactions = relationship("CommentReaction", back_populates="user", cascade="all, delete-orphan")
 
 
+# session.info key: ids of users written in the session's current transaction
+PENDING_IDENTITY_INVALIDATIONS = "pending_identity_invalidations"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _queue_identity_invalidation(mapper, connection, target):
+    """Remember a written user row; its cached snapshot is dropped on commit"""
+    object_session(target).info.setdefault(PENDING_IDENTITY_INVALIDATIONS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_identities(session):
+    """
+    Drop cached CurrentUser snapshots of users written in the committed transaction
+
+    Not done at flush: a request reading between flush and commit would
+    re-cache the old row right after it was invalidated.
+    """
+    for user_id in session.info.pop(PENDING_IDENTITY_INVALIDATIONS, ()):
+        identity_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_identity_invalidations(session):
+    session.info.pop(PENDING_IDENTITY_INVALIDATIONS, None)
+
+
 class Recipe(Base):
     """Recipe model containing cooking instructions and metadata"""
     __tablename__ = "recipes"
@@ -79,6 +111,13 @@ class Recipe(Base):
     # Optional attribution for forked/derived recipes
     origin_recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=True)
     origin_author_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Denormalized number of recipes forked from this one (maintained by RecipeService)
+    fork_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Denormalized cookbook saves and comments (maintained by CookbookService / CommentService)
+    save_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped on every comment/reaction change; drives comment list ETags
+    comments_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -88,6 +127,56 @@ class Recipe(Base):
     origin_recipe = relationship("Recipe", remote_side=[id], foreign_keys=[origin_recipe_id])
     cookbook_saves = relationship("CookbookSave", back_populates="recipe", cascade="all, delete-orphan")
     comments = relationship("RecipeComment", back_populates="recipe", cascade="all, delete-orphan")
+    tag_links = relationship("RecipeTag", back_populates="recipe", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Public feed: equality on the visibility filters, then newest-first
+        # order (also serves keyset pagination)
+        Index("ix_recipes_feed", "is_published", "visibility", "created_at", "id"),
+        Index("ix_recipes_feed_difficulty", "is_published", "visibility", "difficulty", "created_at", "id"),
+        Index("ix_recipes_feed_fork_count", "is_published", "visibility", "fork_count", "created_at", "id"),
+        Index("ix_recipes_feed_save_count", "is_published", "visibility", "save_count", "created_at", "id"),
+        Index("ix_recipes_feed_comment_count", "is_published", "visibility", "comment_count", "created_at", "id"),
+    )
+
+
+# Score behind sort=popular; queries must use this exact expression to hit its index
+RECIPE_POPULARITY = Recipe.save_count + Recipe.comment_count + Recipe.fork_count
+Index(
+    "ix_recipes_feed_popularity",
+    Recipe.is_published,
+    Recipe.visibility,
+    RECIPE_POPULARITY,
+    Recipe.created_at,
+    Recipe.id,
+)
+
+
+# Full-text index lives outside the ORM (FTS5 table / GIN expression index)
+event.listen(Recipe.__table__, "after_create", create_search_index)
+event.listen(Recipe.__table__, "before_drop", drop_search_index)
+
+
+class RecipeTag(Base):
+    """Normalized copy of Recipe.tags so tag filters and counts can use an index"""
+    __tablename__ = "recipe_tags"
+
+    recipe_id = Column(Integer, ForeignKey("recipes.id"), primary_key=True)
+    tag = Column(Text, primary_key=True)
+
+    recipe = relationship("Recipe", back_populates="tag_links")
+
+    __table_args__ = (
+        Index("ix_recipe_tags_tag_recipe_id", "tag", "recipe_id"),
+    )
+
+
+@event.listens_for(Recipe.tags, "set")
+def _sync_recipe_tag_links(target, value, oldvalue, initiator):
+    """Mirror every assignment to Recipe.tags into recipe_tags rows"""
+    wanted = list(dict.fromkeys(value or []))
+    existing = {link.tag: link for link in target.tag_links}
+    target.tag_links = [existing.get(tag) or RecipeTag(tag=tag) for tag in wanted]
 
 
 class CookbookSave(Base):
@@ -106,6 +195,8 @@ class CookbookSave(Base):
     # Unique constraint to prevent duplicate saves
     __table_args__ = (
         UniqueConstraint('user_id', 'recipe_id', name='unique_user_recipe'),
+        # Cookbook pages: a user's saves newest first, keyset on (created_at, id)
+        Index("ix_cookbook_saves_user_created", "user_id", "created_at", "id"),
     )
 
 
@@ -139,6 +230,17 @@ class RecipeComment(Base):
         back_populates="comment",
         cascade="all, delete-orphan",
     )
+    reaction_counts = relationship(
+        "CommentReactionCount",
+        back_populates="comment",
+        cascade="all, delete-orphan",
+        order_by="CommentReactionCount.emoji",
+    )
+
+    __table_args__ = (
+        # Paged top-level comments (parent_id IS NULL) and replies per parent
+        Index("ix_recipe_comments_thread", "recipe_id", "parent_id", "created_at", "id"),
+    )
 
 
 class CommentReaction(Base):
@@ -158,6 +260,17 @@ class CommentReaction(Base):
     )
 
 
+class CommentReactionCount(Base):
+    """Per-emoji reaction counter, maintained in the same transaction as CommentReaction writes"""
+    __tablename__ = "comment_reaction_counts"
+
+    comment_id = Column(Integer, ForeignKey("recipe_comments.id"), primary_key=True)
+    emoji = Column(String(16), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    comment = relationship("RecipeComment", back_populates="reaction_counts")
+
+
 class Conversation(Base):
     """Direct conversation between two users"""
     __tablename__ = "conversations"
@@ -171,10 +284,14 @@ class Conversation(Base):
     user_one = relationship("User", foreign_keys=[user_one_id], back_populates="conversations_as_user_one")
     user_two = relationship("User", foreign_keys=[user_two_id], back_populates="conversations_as_user_two")
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
+    reads = relationship("ConversationRead", back_populates="conversation", cascade="all, delete-orphan")
 
     __table_args__ = (
         UniqueConstraint("user_one_id", "user_two_id", name="unique_conversation_pair"),
         CheckConstraint("user_one_id < user_two_id", name="check_user_order"),
+        # A participant's conversation list, most recently active first
+        Index("ix_conversations_user_one_updated", "user_one_id", "updated_at", "id"),
+        Index("ix_conversations_user_two_updated", "user_two_id", "updated_at", "id"),
     )
 
 
@@ -190,3 +307,29 @@ class Message(Base):
 
     conversation = relationship("Conversation", back_populates="messages")
     sender = relationship("User", back_populates="sent_messages")
+
+    __table_args__ = (
+        # History pages and incremental polls within one conversation
+        Index("ix_messages_conversation_created_id", "conversation_id", "created_at", "id"),
+        # Unread counts: messages after a read receipt, excluding the reader's own
+        Index("ix_messages_conversation_unread", "conversation_id", "id", "sender_id"),
+        # User.sent_messages loads and cascades on user deletion
+        Index("ix_messages_sender_id", "sender_id"),
+    )
+
+
+class ConversationRead(Base):
+    """Read receipt: the newest message a participant has read in a conversation"""
+    __tablename__ = "conversation_reads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    last_read_message_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    conversation = relationship("Conversation", back_populates="reads")
+
+    __table_args__ = (
+        UniqueConstraint("conversation_id", "user_id", name="uq_conversation_read_user"),
+    )
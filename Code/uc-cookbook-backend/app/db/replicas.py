@@ -0,0 +1,143 @@
+"""
+Read-replica routing.
+
+Read-only routes take their session from get_read_db (app.api.deps), which
+asks ``replica_router`` for a session factory: replicas are used round-robin,
+except for a user who wrote within the last READ_YOUR_WRITES_SECONDS, who
+keeps reading from the primary so their own changes are visible despite
+replication lag. ReadYourWritesMiddleware records a write by handing the
+client a short-lived signed WRITE_MARKER_COOKIE, so any worker process can
+tell a recent writer from the request alone.
+
+Read sessions are tagged in ``session.info`` with their route (READ_ROUTE)
+and the time their data is known to be current as of (READ_AS_OF), so
+callers sharing results across users (the response cache) can tell a
+replica or primary-pinned read apart from an ordinary one.
+
+With no DATABASE_REPLICA_URLS every read goes to the primary.
+"""
+
+import hashlib
+import hmac
+import itertools
+import math
+import threading
+import time
+from typing import Callable, List, Optional
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db import session as db_session
+
+PRIMARY = "primary"
+REPLICA = "replica"
+PINNED = "pinned"
+
+READ_ROUTE = "read_route"
+READ_AS_OF = "read_as_of"
+
+WRITE_MARKER_COOKIE = "last_write"
+
+
+class ReadReplicaRouter:
+    """Chooses the primary or a replica session factory per request"""
+
+    def __init__(
+        self,
+        primary: Callable,
+        replicas: Optional[List[Callable]] = None,
+        window_seconds: float = 5,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.window_seconds = window_seconds
+        self._next_replica = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @property
+    def marker_max_age(self) -> int:
+        """Cookie lifetime for a write marker, in whole seconds"""
+        return max(1, math.ceil(self.window_seconds))
+
+    @staticmethod
+    def _sign(message: str) -> str:
+        key = hashlib.sha256(f"{WRITE_MARKER_COOKIE}:{settings.SECRET_KEY}".encode()).digest()
+        return hmac.new(key, message.encode(), hashlib.sha256).hexdigest()
+
+    def write_marker(self, user_id: int, wrote_at: Optional[float] = None) -> str:
+        """Signed WRITE_MARKER_COOKIE value recording that ``user_id`` just wrote"""
+        message = f"{user_id}.{time.time() if wrote_at is None else wrote_at:.3f}"
+        return f"{message}.{self._sign(message)}"
+
+    def is_recent_writer(self, user_id: Optional[int], marker: Optional[str]) -> bool:
+        """True if ``marker`` is a valid write marker for ``user_id`` inside the window"""
+        if user_id is None or not marker:
+            return False
+        message, _, signature = marker.rpartition(".")
+        if not hmac.compare_digest(signature, self._sign(message)):
+            return False
+        marker_user, _, wrote_at = message.partition(".")
+        try:
+            if int(marker_user) != user_id:
+                return False
+            return time.time() - float(wrote_at) < self.window_seconds
+        except ValueError:
+            return False
+
+    def read_route(self, user_id: Optional[int] = None, marker: Optional[str] = None) -> str:
+        """PRIMARY without replicas, PINNED for a recent writer, otherwise REPLICA"""
+        if not self.enabled:
+            return PRIMARY
+        if self.is_recent_writer(user_id, marker):
+            return PINNED
+        return REPLICA
+
+    def read_session_factory(
+        self,
+        user_id: Optional[int] = None,
+        marker: Optional[str] = None,
+        route: Optional[str] = None,
+    ) -> Callable:
+        """Session factory for a read-only request by ``user_id`` (None = anonymous)"""
+        if (route or self.read_route(user_id, marker)) != REPLICA:
+            return self.primary
+        with self._lock:
+            return next(self._next_replica)
+
+    def read_session(self, user_id: Optional[int] = None, marker: Optional[str] = None):
+        """
+        Open a read session for ``user_id`` (carrying write ``marker``), tagged with READ_ROUTE and READ_AS_OF
+
+        A replica is assumed to lag by at most the stickiness window (the
+        same bound read-your-writes relies on), so its data is only known to
+        be current as of that long before the session was opened.
+        """
+        route = self.read_route(user_id, marker)
+        session = self.read_session_factory(route=route)()
+        session.info[READ_ROUTE] = route
+        session.info[READ_AS_OF] = time.time() - (self.window_seconds if route == REPLICA else 0)
+        return session
+
+
+def build_replica_router() -> ReadReplicaRouter:
+    """Create the router configured by DATABASE_REPLICA_URLS / READ_YOUR_WRITES_SECONDS"""
+    if settings.DATABASE_ASYNC:
+        primary = db_session.AsyncSessionLocal
+        replicas = [
+            async_sessionmaker(db_session.create_async_db_engine(url), autoflush=False, expire_on_commit=False)
+            for url in settings.database_replica_urls
+        ]
+    else:
+        primary = db_session.SessionLocal
+        replicas = [
+            sessionmaker(autocommit=False, autoflush=False, bind=db_session.create_db_engine(url))
+            for url in settings.database_replica_urls
+        ]
+    return ReadReplicaRouter(primary, replicas, window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+
+replica_router = build_replica_router()
@@ -0,0 +1,153 @@
+"""
+Full-text search index for recipes.
+
+SQLite uses an external-content FTS5 table (``recipes_fts``) kept in sync with
+``recipes`` by triggers, so every insert/update/delete - whether it comes from
+RecipeService, a script or a raw SQL statement - updates the index in the same
+transaction. PostgreSQL uses a GIN expression index over the same document.
+Other dialects fall back to ILIKE matching in RecipeService.
+"""
+
+import re
+from typing import List, Optional
+from sqlalchemy import Float, Integer, column, func, literal_column, select, table, text
+
+FTS_TABLE = "recipes_fts"
+
+# Indexed document for PostgreSQL. Queries must use the exact same expression
+# as the index definition or the planner will not pick the GIN index.
+PG_SEARCH_DOCUMENT = (
+    "to_tsvector('english', "
+    "coalesce(recipes.title, '') || ' ' || "
+    "coalesce(recipes.description, '') || ' ' || "
+    "coalesce(CAST(recipes.ingredients AS TEXT), '') || ' ' || "
+    "coalesce(CAST(recipes.tags AS TEXT), ''))"
+)
+
+SQLITE_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, ingredients, tags,
+        content='recipes', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS recipes_fts_ai AFTER INSERT ON recipes BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, ingredients, tags)
+        VALUES (new.id, new.title, new.description, new.ingredients, new.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS recipes_fts_ad AFTER DELETE ON recipes BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, ingredients, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.ingredients, old.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS recipes_fts_au
+    AFTER UPDATE OF title, description, ingredients, tags ON recipes BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, ingredients, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.ingredients, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, ingredients, tags)
+        VALUES (new.id, new.title, new.description, new.ingredients, new.tags);
+    END
+    """,
+]
+
+SQLITE_DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS recipes_fts_au",
+    "DROP TRIGGER IF EXISTS recipes_fts_ad",
+    "DROP TRIGGER IF EXISTS recipes_fts_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+PG_CREATE_STATEMENTS = [
+    f"CREATE INDEX IF NOT EXISTS ix_recipes_search ON recipes USING GIN ({PG_SEARCH_DOCUMENT})",
+]
+
+PG_DROP_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_recipes_search",
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def supports_full_text(dialect_name: str) -> bool:
+    """Return True if the dialect has a native full-text index for recipes"""
+    return dialect_name in ("sqlite", "postgresql")
+
+
+def search_terms(search: str) -> List[str]:
+    """Split a raw search box value into index tokens."""
+    return _TOKEN_RE.findall(search.lower())
+
+
+def build_fts_query(dialect_name: str, search: str) -> Optional[str]:
+    """
+    Translate user input into a safe MATCH / to_tsquery expression.
+
+    Every term is prefix-matched so search-as-you-type ("chick" -> "chicken")
+    keeps working, and all terms must match. Returns None when the input
+    contains no searchable tokens.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return None
+    if dialect_name == "postgresql":
+        return " & ".join(f"{term}:*" for term in terms)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_matches(dialect_name: str, fts_query: str):
+    """
+    Subquery of (recipe_id, rank) rows matching ``fts_query``.
+
+    Lower rank is more relevant on every dialect (SQLite's bm25() is already
+    ordered that way; PostgreSQL's ts_rank_cd is negated).
+    """
+    if dialect_name == "postgresql":
+        recipes = table("recipes", column("id", Integer))
+        document = literal_column(PG_SEARCH_DOCUMENT)
+        ts_query = func.to_tsquery("english", fts_query)
+        return (
+            select(
+                recipes.c.id.label("recipe_id"),
+                (-func.ts_rank_cd(document, ts_query)).label("rank"),
+            )
+            .where(document.op("@@")(ts_query))
+            .subquery("search_matches")
+        )
+
+    fts = table(FTS_TABLE, column("rowid", Integer))
+    return (
+        select(
+            fts.c.rowid.label("recipe_id"),
+            func.bm25(literal_column(FTS_TABLE), type_=Float).label("rank"),
+        )
+        .where(literal_column(FTS_TABLE).op("MATCH")(fts_query))
+        .subquery("search_matches")
+    )
+
+
+def create_search_index(target, connection, **kw) -> None:
+    """``after_create`` hook for the recipes table"""
+    if connection.dialect.name == "sqlite":
+        statements = SQLITE_CREATE_STATEMENTS
+    elif connection.dialect.name == "postgresql":
+        statements = PG_CREATE_STATEMENTS
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def drop_search_index(target, connection, **kw) -> None:
+    """``before_drop`` hook for the recipes table"""
+    if connection.dialect.name == "sqlite":
+        statements = SQLITE_DROP_STATEMENTS
+    elif connection.dialect.name == "postgresql":
+        statements = PG_DROP_STATEMENTS
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
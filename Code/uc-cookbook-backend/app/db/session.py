@@ -1,12 +1,88 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import Any, Callable, Dict, List, TypeVar, Union
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 
+T = TypeVar("T")
+
+# Session type handed to route handlers by get_db (see DATABASE_ASYNC)
+DbSession = Union[Session, AsyncSession]
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.partition("://")[0].split("+")[0] == "sqlite"
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    create_engine keyword arguments for ``url`` from DB_* / SQLITE_* settings
+
+    Server databases get explicit pool sizing, recycling and pre-ping. SQLite
+    connections may be shared across threadpool workers and wait up to
+    SQLITE_BUSY_TIMEOUT_MS for a lock instead of failing immediately.
+    """
+    if _is_sqlite(url):
+        return {
+            "connect_args": {
+                "check_same_thread": False,  # Needed for SQLite
+                "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        }
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas() -> List[str]:
+    """Per-connection PRAGMA statements from SQLITE_* settings"""
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}",
+    ]
+    if settings.SQLITE_JOURNAL_MODE:
+        # WAL lets readers proceed while a writer commits
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    return pragmas
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """``connect`` hook: tune every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str) -> Engine:
+    """Create a sync engine configured from settings (see engine_options)"""
+    db_engine = create_engine(url, **engine_options(url))
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """Async counterpart of create_db_engine; ``url`` is the sync DATABASE_URL"""
+    async_url = async_database_url(url)
+    db_engine = create_async_engine(async_url, **engine_options(async_url))
+    if _is_sqlite(async_url):
+        event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+engine = create_db_engine(settings.DATABASE_URL)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -15,7 +91,34 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
-def get_db():
+def async_database_url(url: str) -> str:
+    """
+    Map a sync DATABASE_URL onto the matching asyncio driver
+
+    sqlite:// -> sqlite+aiosqlite://, postgresql:// -> postgresql+asyncpg://.
+    URLs that already name a driver are returned unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        return url
+    if scheme == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if scheme in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+# Async engine/session for DATABASE_ASYNC=true. Sessions don't expire on
+# commit: attribute reloads can't happen outside the session's greenlet.
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_db_engine(settings.DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+
+def get_sync_db():
     """
     Dependency function to get database session.
     Yields a database session and ensures it's closed after use.
@@ -25,3 +128,36 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency function to get an asyncio database session.
+    Yields an AsyncSession and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Request-scoped session dependency used by routes, selected by DATABASE_ASYNC
+get_db = get_async_db if settings.DATABASE_ASYNC else get_sync_db
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    Service code stays synchronous. With an AsyncSession it runs on the
+    asyncio driver via run_sync; with a plain Session it runs in the
+    threadpool. Either way other requests keep being served meanwhile.
+
+    Args:
+        db: Session from get_db
+        fn: Callable taking a sync Session as its first argument
+
+    Returns:
+        Whatever ``fn`` returns
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
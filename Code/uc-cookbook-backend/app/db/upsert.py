@@ -0,0 +1,37 @@
+"""
+INSERT ... ON CONFLICT for the supported dialects.
+
+SQLite (3.24+) and PostgreSQL share the ``on_conflict_do_update`` /
+``on_conflict_do_nothing`` API through their dialect ``insert`` constructs;
+upserts let a write be retried without first reading the row it replaces.
+"""
+
+from typing import Any
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def upsert_insert(db: Session, model: Any):
+    """
+    Dialect INSERT for ``model``'s table, ready for ``on_conflict_*``
+
+    Args:
+        db: Session whose bind decides the dialect
+        model: Mapped class (its ``__table__`` is targeted, bypassing ORM bulk semantics)
+
+    Returns:
+        A sqlite or postgresql Insert construct
+
+    Raises:
+        RuntimeError: If the dialect has no ON CONFLICT support here
+    """
+    dialect_name = db.get_bind().dialect.name
+    try:
+        return _DIALECT_INSERTS[dialect_name](model.__table__)
+    except KeyError:
+        raise RuntimeError(f"Upserts are not supported on {dialect_name}") from None
@@ -1,7 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.routes import health, auth, recipes, cookbook, comments, conversations, messages
+from app.core.realtime import message_hub
+from app.api.middleware import ReadYourWritesMiddleware
+from app.api.routes import health, auth, recipes, tags, cookbook, comments, conversations, messages
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop the message broker listener (Redis pub/sub) on shutdown
+    await message_hub.close()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -9,7 +20,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="A recipe sharing platform for University of Cincinnati students",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -19,12 +31,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Pin recent writers' reads to the primary when read replicas are configured
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
 app.include_router(auth.router, tags=["Authentication"])
 app.include_router(recipes.router, tags=["Recipes"])
+app.include_router(tags.router, tags=["Tags"])
 app.include_router(cookbook.router, tags=["Cookbook"])
 app.include_router(comments.router, tags=["Comments"])
 app.include_router(conversations.router, tags=["Conversations"])
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 from app.schemas.auth import AuthorResponse
 
@@ -21,6 +21,29 @@ class ReactionSummary(BaseModel):
     reacted_by_me: bool = False
 
 
+class ReactionChange(BaseModel):
+    comment_id: int = Field(..., ge=1)
+    # The emoji to set, or None to clear the reaction
+    emoji: Optional[str] = Field(default=None, min_length=1, max_length=16)
+
+
+class BatchReactionRequest(BaseModel):
+    changes: List[ReactionChange] = Field(..., min_length=1, max_length=100)
+
+
+class ReactionUpdate(BaseModel):
+    """The viewer's reaction on one comment and the per-emoji counts it changed"""
+    comment_id: int
+    emoji: Optional[str] = None
+    # Only the emojis whose count moved; count 0 means the emoji is gone
+    reactions: List[ReactionSummary] = []
+
+
+class BatchReactionResponse(BaseModel):
+    # Comments whose reaction actually changed (repeated writes are no-ops)
+    updated: List[ReactionUpdate] = []
+
+
 class RecipeCommentResponse(BaseModel):
     id: int
     recipe_id: int
@@ -33,3 +56,36 @@ class RecipeCommentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CommentThreadResponse(RecipeCommentResponse):
+    """A comment with its direct-reply count and the first few replies"""
+    reply_count: int = 0
+    replies: List["CommentThreadResponse"] = []
+
+
+class CommentPageResponse(BaseModel):
+    comments: List[CommentThreadResponse]
+    next_cursor: Optional[str] = None
+
+
+class CommentDeletedData(BaseModel):
+    comment_id: int
+    # The comment plus every reply removed with it
+    deleted_ids: List[int]
+
+
+class ReactionChangedData(BaseModel):
+    comment_id: int
+    user_id: int
+    # The reacting user's emoji after the change (None = reaction removed)
+    emoji: Optional[str] = None
+    reactions: List[ReactionSummary] = []
+
+
+class CommentEvent(BaseModel):
+    """Incremental change to a recipe's comments, streamed over SSE"""
+    id: int  # Recipe.comments_version after the change
+    recipe_id: int
+    event: Literal["comment_added", "comment_deleted", "reaction_changed"]
+    data: Union[RecipeCommentResponse, CommentDeletedData, ReactionChangedData]
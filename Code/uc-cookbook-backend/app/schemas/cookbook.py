@@ -1,5 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel
+from typing import List
+from pydantic import BaseModel, Field, model_validator
 from app.schemas.recipe import RecipeResponse
 
 
@@ -27,3 +28,25 @@ class CookbookSaveResponse(BaseModel):
             'saved_at': obj.created_at  # Map created_at to saved_at
         }
         return cls(**data)
+
+
+class CookbookBatchRequest(BaseModel):
+    """Recipe ids to save to and remove from the cookbook in one request"""
+    save: List[int] = Field(default_factory=list, max_length=200)
+    remove: List[int] = Field(default_factory=list, max_length=200)
+
+    @model_validator(mode="after")
+    def check_disjoint(self):
+        if not self.save and not self.remove:
+            raise ValueError("Nothing to save or remove")
+        if set(self.save) & set(self.remove):
+            raise ValueError("A recipe cannot be both saved and removed")
+        return self
+
+
+class CookbookBatchResponse(BaseModel):
+    # Newly saved / removed; ids already in the requested state are omitted
+    saved: List[int] = []
+    removed: List[int] = []
+    # Recipes that don't exist or aren't visible to the user
+    unavailable: List[int] = []
@@ -25,6 +25,25 @@ class MessageResponse(BaseModel):
         from_attributes = True
 
 
+class MarkReadRequest(BaseModel):
+    # Defaults to the conversation's latest message
+    message_id: Optional[int] = Field(default=None, ge=1)
+
+
+class ConversationReadResponse(BaseModel):
+    conversation_id: int
+    last_read_message_id: int
+    unread_count: int
+
+
+class LastMessagePreview(BaseModel):
+    id: int
+    sender_id: int
+    sender: Optional[AuthorResponse] = None
+    snippet: str
+    created_at: datetime
+
+
 class ConversationResponse(BaseModel):
     id: int
     user_one_id: int
@@ -33,6 +52,8 @@ class ConversationResponse(BaseModel):
     user_two: Optional[AuthorResponse] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    last_message: Optional[LastMessagePreview] = None
+    unread_count: int = 0
 
     class Config:
         from_attributes = True
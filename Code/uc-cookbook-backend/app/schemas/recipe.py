@@ -1,3 +1,4 @@
+import enum
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
@@ -5,6 +6,22 @@ from app.schemas.auth import AuthorResponse
 from app.db.models import DifficultyEnum, VisibilityEnum
 
 
+class RecipeSortEnum(str, enum.Enum):
+    """Orderings supported by the recipe list endpoint"""
+    newest = "newest"
+    relevance = "relevance"
+    most_forked = "most_forked"
+    popular = "popular"
+    most_saved = "most_saved"
+    most_discussed = "most_discussed"
+
+
+class TagMatchEnum(str, enum.Enum):
+    """How multiple tag filters combine"""
+    any = "any"
+    all = "all"
+
+
 class RecipeBase(BaseModel):
     """Base recipe schema"""
     title: str = Field(..., min_length=3, max_length=120)
@@ -49,8 +66,12 @@ class RecipeResponse(RecipeBase):
     origin_author_id: Optional[int] = None
     origin_author: Optional[AuthorResponse] = None
     fork_count: int = 0
+    save_count: int = 0
+    comment_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
+    # Whether the caller saved it; only set on authenticated feed pages
+    is_saved: Optional[bool] = None
     
     class Config:
         from_attributes = True
@@ -59,9 +80,16 @@ class RecipeResponse(RecipeBase):
 class RecipesResponse(BaseModel):
     """Schema for paginated recipe list"""
     recipes: List[RecipeResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+
+
+class TagCountResponse(BaseModel):
+    """Number of public recipes carrying a tag"""
+    tag: str
+    count: int
 
 
 # Backward-compatible aliases used in existing code
@@ -3,18 +3,58 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.db.models import User
+from app.db.session import DbSession, run_db
 from app.schemas.auth import UserCreate
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import get_password_hash_async, verify_password_async, create_access_token
 
 
 class AuthService:
     """Service layer for authentication logic"""
     
     @staticmethod
-    def register_user(db: Session, user_data: UserCreate) -> User:
+    def _email_registered(db: Session, email: str) -> bool:
+        exists = db.query(User.id).filter(User.email == email).first() is not None
+        # Return the pooled connection before the caller awaits bcrypt
+        db.rollback()
+        return exists
+    
+    @staticmethod
+    def _insert_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
+        db_user = User(
+            email=user_data.email,
+            username=user_data.username,
+            password_hash=hashed_password
+        )
+        
+        try:
+            db.add(db_user)
+            db.commit()
+            db.refresh(db_user)
+            return db_user
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+    
+    @staticmethod
+    def _find_detached_user(db: Session, email: str) -> Optional[User]:
+        user = db.query(User).filter(User.email == email).first()
+        if user is not None:
+            db.expunge(user)
+        # Return the pooled connection before the caller awaits bcrypt
+        db.rollback()
+        return user
+    
+    @staticmethod
+    async def register_user(db: DbSession, user_data: UserCreate) -> User:
         """
         Register a new user
         
+        The password is hashed on the password hash pool, off the event loop;
+        no DB connection is held while it runs.
+        
         Args:
             db: Database session
             user_data: User registration data
@@ -25,39 +65,23 @@ class AuthService:
         Raises:
             HTTPException: If email already exists
         """
-        # Check if user already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
+        if await run_db(db, AuthService._email_registered, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
-        # Create new user
-        hashed_password = get_password_hash(user_data.password)
-        db_user = User(
-            email=user_data.email,
-            username=user_data.username,
-            password_hash=hashed_password
-        )
-        
-        try:
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
-            return db_user
-        except IntegrityError:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+        hashed_password = await get_password_hash_async(user_data.password)
+        return await run_db(db, AuthService._insert_user, user_data, hashed_password)
     
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    async def authenticate_user(db: DbSession, email: str, password: str) -> Optional[User]:
         """
         Authenticate a user by email and password
         
+        The bcrypt check runs on the password hash pool, off the event loop;
+        no DB connection is held while it runs.
+        
         Args:
             db: Database session
             email: User email
@@ -66,10 +90,10 @@ class AuthService:
         Returns:
             User object if authenticated, None otherwise
         """
-        user = db.query(User).filter(User.email == email).first()
+        user = await run_db(db, AuthService._find_detached_user, email)
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         return user
     
@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import and_, or_
 from app.db.models import Recipe, User, Conversation, VisibilityEnum
 
 
@@ -9,5 +10,13 @@ def can_view_recipe(recipe: Recipe, current_user: Optional[User]) -> bool:
     return recipe.is_published and recipe.visibility == VisibilityEnum.public
 
 
+def viewable_recipe_clause(user_id: Optional[int]):
+    """SQL counterpart of can_view_recipe, for filtering recipes in a query"""
+    public = and_(Recipe.is_published.is_(True), Recipe.visibility == VisibilityEnum.public)
+    if user_id is None:
+        return public
+    return or_(Recipe.author_id == user_id, public)
+
+
 def is_participant(conversation: Conversation, user: User) -> bool:
     return conversation.user_one_id == user.id or conversation.user_two_id == user.id
@@ -1,43 +1,227 @@
 from collections import defaultdict
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, tuple_
 from sqlalchemy.orm import Session, joinedload, selectinload
-from app.db.models import CommentReaction, RecipeComment, Recipe, User
+from app.core.pagination import cursor_datetime, decode_cursor, encode_cursor
+from app.core.cache import response_cache
+from app.core.realtime import comments_channel, message_hub
+from app.db.models import CommentReaction, CommentReactionCount, RecipeComment, Recipe, User
+from app.db.session import DbSession, run_db
+from app.db.upsert import upsert_insert
 from app.schemas.auth import AuthorResponse
 from app.schemas.comment import (
     AddCommentRequest,
     ALLOWED_COMMENT_EMOJIS,
+    BatchReactionResponse,
+    CommentDeletedData,
+    CommentEvent,
+    CommentThreadResponse,
+    ReactionChange,
+    ReactionChangedData,
     ReactionSummary,
+    ReactionUpdate,
     RecipeCommentResponse,
 )
+from app.services.recipe_service import RecipeService
 
+# Session.info key for comment events awaiting publication after commit
+PENDING_COMMENT_EVENTS = "pending_comment_events"
 
-def _reaction_summaries(
-    rows: List[CommentReaction],
-    current_user_id: Optional[int],
-) -> List[ReactionSummary]:
-    by_emoji: dict[str, list[int]] = defaultdict(list)
-    for r in rows:
-        by_emoji[r.emoji].append(r.user_id)
-    out: List[ReactionSummary] = []
-    for emoji in sorted(by_emoji.keys()):
-        user_ids = by_emoji[emoji]
-        out.append(
-            ReactionSummary(
-                emoji=emoji,
-                count=len(user_ids),
-                reacted_by_me=current_user_id is not None and current_user_id in user_ids,
+# Relationships every comment response needs
+COMMENT_LOADERS = (joinedload(RecipeComment.user), selectinload(RecipeComment.reaction_counts))
+
+
+def _bump_comments_version(db: Session, recipe_id: int, changes: int = 1) -> int:
+    """
+    Advance the recipe's comment version in the caller's transaction.
+
+    The version is the comment list ETag input and the id of the SSE event
+    describing the change; a write emitting several events advances it once
+    per event.
+
+    Returns:
+        The new version
+    """
+    db.query(Recipe).filter(Recipe.id == recipe_id).update(
+        {
+            Recipe.comments_version: Recipe.comments_version + changes,
+            Recipe.updated_at: Recipe.updated_at,
+        },
+        synchronize_session=False,
+    )
+    return db.query(Recipe.comments_version).filter(Recipe.id == recipe_id).scalar()
+
+
+def _queue_event(db: Session, event: CommentEvent) -> None:
+    """Hold ``event`` on the session until AsyncCommentService publishes it"""
+    db.info.setdefault(PENDING_COMMENT_EVENTS, []).append(event)
+
+
+def _thread_ids(comment: RecipeComment) -> List[int]:
+    ids = [comment.id]
+    for reply in comment.replies:
+        ids.extend(_thread_ids(reply))
+    return ids
+
+
+def _apply_count_deltas(db: Session, deltas: Dict[Tuple[int, str], int]) -> None:
+    """
+    Add each (comment_id, emoji) delta to its counter in the caller's transaction.
+
+    One upsert adds to existing counters atomically (no read first, so
+    concurrent reactions can't lose increments) and creates missing ones;
+    counters that reach zero are then removed.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    stmt = upsert_insert(db, CommentReactionCount)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["comment_id", "emoji"],
+            set_={"count": CommentReactionCount.__table__.c.count + stmt.excluded.count},
+        ),
+        [{"comment_id": c, "emoji": e, "count": delta} for (c, e), delta in deltas.items()],
+    )
+    if any(delta < 0 for delta in deltas.values()):
+        db.execute(
+            delete(CommentReactionCount)
+            .where(
+                CommentReactionCount.comment_id.in_({c for c, _ in deltas}),
+                CommentReactionCount.count <= 0,
             )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _check_emoji(emoji: Optional[str]) -> None:
+    if emoji is not None and emoji not in ALLOWED_COMMENT_EMOJIS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Emoji must be one of: {', '.join(sorted(ALLOWED_COMMENT_EMOJIS))}",
         )
-    return out
+
+
+def _write_reactions(
+    db: Session,
+    recipe_id: int,
+    user_id: int,
+    targets: Dict[int, Optional[str]],
+) -> List[ReactionUpdate]:
+    """
+    Make ``user_id``'s reaction on each comment equal its target emoji (None = none)
+
+    Runs in the caller's transaction: reactions not in their target state
+    are removed with one DELETE ... RETURNING and targets are added with one
+    INSERT ... ON CONFLICT DO NOTHING RETURNING, so counter deltas come from
+    the rows each statement actually changed. A retried or racing write
+    finds the row already removed or already present and moves nothing.
+    A reaction_changed event is queued per changed comment.
+
+    Returns:
+        One ReactionUpdate per changed comment, holding only the emojis whose count moved
+
+    Raises:
+        HTTPException: If a comment doesn't belong to the recipe
+    """
+    found = db.query(func.count(RecipeComment.id)).filter(
+        RecipeComment.recipe_id == recipe_id,
+        RecipeComment.id.in_(targets),
+    ).scalar()
+    if found != len(targets):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comment not found",
+        )
+
+    reactions = CommentReaction.__table__
+    kept = [(cid, emoji) for cid, emoji in targets.items() if emoji is not None]
+    stale = delete(reactions).where(
+        reactions.c.user_id == user_id,
+        reactions.c.comment_id.in_(targets),
+    )
+    if kept:
+        stale = stale.where(tuple_(reactions.c.comment_id, reactions.c.emoji).not_in(kept))
+    removed = db.execute(stale.returning(reactions.c.comment_id, reactions.c.emoji)).all()
+
+    added = []
+    if kept:
+        stmt = upsert_insert(db, CommentReaction).values(
+            [{"comment_id": cid, "user_id": user_id, "emoji": emoji} for cid, emoji in kept]
+        )
+        added = db.execute(
+            stmt.on_conflict_do_nothing(index_elements=["comment_id", "user_id"])
+            .returning(reactions.c.comment_id, reactions.c.emoji)
+        ).all()
+
+    deltas: Dict[Tuple[int, str], int] = defaultdict(int)
+    for cid, emoji in removed:
+        deltas[(cid, emoji)] -= 1
+    for cid, emoji in added:
+        deltas[(cid, emoji)] += 1
+    changed = {cid: targets[cid] for cid in sorted({cid for cid, _ in deltas})}
+    if not changed:
+        return []
+    _apply_count_deltas(db, deltas)
+
+    counts: Dict[int, list] = defaultdict(list)
+    for row in db.query(
+        CommentReactionCount.comment_id, CommentReactionCount.emoji, CommentReactionCount.count
+    ).filter(CommentReactionCount.comment_id.in_(changed)):
+        counts[row.comment_id].append(row)
+
+    version = _bump_comments_version(db, recipe_id, len(changed))
+    updates: List[ReactionUpdate] = []
+    for event_id, (cid, emoji) in enumerate(changed.items(), start=version - len(changed) + 1):
+        summaries = _reaction_summaries(counts[cid], None)
+        _queue_event(db, CommentEvent(
+            id=event_id,
+            recipe_id=recipe_id,
+            event="reaction_changed",
+            data=ReactionChangedData(comment_id=cid, user_id=user_id, emoji=emoji, reactions=summaries),
+        ))
+        now = {summary.emoji: summary.count for summary in summaries}
+        updates.append(ReactionUpdate(
+            comment_id=cid,
+            emoji=emoji,
+            reactions=[
+                ReactionSummary(emoji=e, count=now.get(e, 0), reacted_by_me=e == emoji)
+                for e in sorted(e for c, e in deltas if c == cid)
+            ],
+        ))
+    return updates
+
+
+def _viewer_reactions(db: Session, user_id: Optional[int], comment_ids: List[int]) -> Dict[int, str]:
+    """The viewer's emoji on each of ``comment_ids`` (one lookup for the whole page)"""
+    if user_id is None or not comment_ids:
+        return {}
+    rows = db.query(CommentReaction.comment_id, CommentReaction.emoji).filter(
+        CommentReaction.user_id == user_id,
+        CommentReaction.comment_id.in_(comment_ids),
+    )
+    return dict(rows.all())
+
+
+def _reaction_summaries(
+    counts: list,
+    my_emoji: Optional[str],
+) -> List[ReactionSummary]:
+    return [
+        ReactionSummary(emoji=c.emoji, count=c.count, reacted_by_me=c.emoji == my_emoji)
+        for c in sorted(counts, key=lambda c: c.emoji)
+        if c.count > 0
+    ]
 
 
 def _to_response(
     comment: RecipeComment,
-    current_user_id: Optional[int],
+    my_emoji: Optional[str],
+    response_cls: type = RecipeCommentResponse,
+    **extra,
 ) -> RecipeCommentResponse:
-    rows = list(comment.comment_reactions) if comment.comment_reactions else []
-    return RecipeCommentResponse(
+    return response_cls(
         id=comment.id,
         recipe_id=comment.recipe_id,
         user_id=comment.user_id,
@@ -45,10 +229,93 @@ def _to_response(
         content=comment.content,
         created_at=comment.created_at,
         user=AuthorResponse.model_validate(comment.user) if comment.user else None,
-        reactions=_reaction_summaries(rows, current_user_id),
+        reactions=_reaction_summaries(comment.reaction_counts, my_emoji),
+        **extra,
     )
 
 
+def _reply_counts(db: Session, recipe_id: int, parent_ids: List[int]) -> Dict[int, int]:
+    """Direct-reply counts for ``parent_ids`` (index-only GROUP BY)"""
+    if not parent_ids:
+        return {}
+    rows = (
+        db.query(RecipeComment.parent_id, func.count(RecipeComment.id))
+        .filter(RecipeComment.recipe_id == recipe_id, RecipeComment.parent_id.in_(parent_ids))
+        .group_by(RecipeComment.parent_id)
+        .all()
+    )
+    return dict(rows)
+
+
+def _first_replies(
+    db: Session,
+    recipe_id: int,
+    parent_ids: List[int],
+    per_parent: int,
+) -> Dict[int, List[RecipeComment]]:
+    """The oldest ``per_parent`` direct replies of each parent, in one query"""
+    if not parent_ids or per_parent <= 0:
+        return {}
+    # Rank on index columns only, then load full rows for the winners
+    ranked = (
+        select(
+            RecipeComment.id,
+            func.row_number().over(
+                partition_by=RecipeComment.parent_id,
+                order_by=(RecipeComment.created_at, RecipeComment.id),
+            ).label("position"),
+        )
+        .where(RecipeComment.recipe_id == recipe_id, RecipeComment.parent_id.in_(parent_ids))
+        .subquery()
+    )
+    replies = (
+        db.query(RecipeComment)
+        .options(*COMMENT_LOADERS)
+        .join(ranked, ranked.c.id == RecipeComment.id)
+        .filter(ranked.c.position <= per_parent)
+        .order_by(RecipeComment.created_at.asc(), RecipeComment.id.asc())
+        .all()
+    )
+    by_parent: Dict[int, List[RecipeComment]] = defaultdict(list)
+    for reply in replies:
+        by_parent[reply.parent_id].append(reply)
+    return by_parent
+
+
+def _comment_page(
+    db: Session,
+    recipe_id: int,
+    parent_id: Optional[int],
+    limit: int,
+    cursor: Optional[str],
+) -> Tuple[List[RecipeComment], Optional[str]]:
+    """Oldest-first keyset page of a recipe's comments under ``parent_id`` (None = top level)"""
+    query = (
+        db.query(RecipeComment)
+        .options(*COMMENT_LOADERS)
+        .filter(RecipeComment.recipe_id == recipe_id, RecipeComment.parent_id == parent_id)
+        .order_by(RecipeComment.created_at.asc(), RecipeComment.id.asc())
+    )
+    if cursor is not None:
+        created_at, comment_id = decode_cursor(cursor, 2)
+        if not isinstance(comment_id, int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        query = query.filter(
+            tuple_(RecipeComment.created_at, RecipeComment.id) > tuple_(cursor_datetime(created_at), comment_id)
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    comments = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+    return comments, next_cursor
+
+
 class CommentService:
     @staticmethod
     def list_comments(
@@ -58,15 +325,117 @@ class CommentService:
     ) -> List[RecipeCommentResponse]:
         comments = (
             db.query(RecipeComment)
-            .options(
-                joinedload(RecipeComment.user),
-                selectinload(RecipeComment.comment_reactions),
-            )
+            .options(*COMMENT_LOADERS)
             .filter(RecipeComment.recipe_id == recipe_id)
             .order_by(RecipeComment.created_at.asc())
             .all()
         )
-        return [_to_response(c, current_user_id) for c in comments]
+        mine = _viewer_reactions(db, current_user_id, [c.id for c in comments])
+        return [_to_response(c, mine.get(c.id)) for c in comments]
+
+    @staticmethod
+    def list_threads(
+        db: Session,
+        recipe_id: int,
+        current_user_id: Optional[int],
+        limit: int = 20,
+        reply_limit: int = 3,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[CommentThreadResponse], Optional[str]]:
+        """
+        Page through a recipe's top-level comments, oldest first
+
+        Each comment carries its direct-reply count and its first
+        ``reply_limit`` replies; deeper pages come from list_replies. The
+        whole page costs a fixed number of index-backed queries however
+        large the thread is.
+
+        Args:
+            db: Database session
+            recipe_id: Recipe whose comments to list
+            current_user_id: Viewer (for reacted_by_me), None if anonymous
+            limit: Maximum number of top-level comments
+            reply_limit: Replies previewed per comment
+            cursor: Opaque next_cursor from a previous page
+
+        Returns:
+            Tuple of (comment threads, next cursor or None)
+
+        Raises:
+            HTTPException: If the cursor is invalid
+        """
+        comments, next_cursor = _comment_page(db, recipe_id, None, limit, cursor)
+        ids = [c.id for c in comments]
+        counts = _reply_counts(db, recipe_id, ids)
+        previews = _first_replies(db, recipe_id, ids, reply_limit)
+        reply_ids = [r.id for rs in previews.values() for r in rs]
+        reply_counts = _reply_counts(db, recipe_id, reply_ids)
+        mine = _viewer_reactions(db, current_user_id, ids + reply_ids)
+
+        threads = [
+            _to_response(
+                comment,
+                mine.get(comment.id),
+                CommentThreadResponse,
+                reply_count=counts.get(comment.id, 0),
+                replies=[
+                    _to_response(
+                        reply,
+                        mine.get(reply.id),
+                        CommentThreadResponse,
+                        reply_count=reply_counts.get(reply.id, 0),
+                    )
+                    for reply in previews.get(comment.id, [])
+                ],
+            )
+            for comment in comments
+        ]
+        return threads, next_cursor
+
+    @staticmethod
+    def list_replies(
+        db: Session,
+        recipe_id: int,
+        parent_id: int,
+        current_user_id: Optional[int],
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[CommentThreadResponse], Optional[str]]:
+        """
+        Page through the direct replies of one comment, oldest first
+
+        Args:
+            db: Database session
+            recipe_id: Recipe the comment belongs to
+            parent_id: Comment whose replies to list
+            current_user_id: Viewer (for reacted_by_me), None if anonymous
+            limit: Maximum number of replies
+            cursor: Opaque next_cursor from a previous page
+
+        Returns:
+            Tuple of (replies with their own reply counts, next cursor or None)
+
+        Raises:
+            HTTPException: If the parent comment doesn't exist or the cursor is invalid
+        """
+        parent_exists = db.query(RecipeComment.id).filter(
+            RecipeComment.id == parent_id,
+            RecipeComment.recipe_id == recipe_id,
+        ).first()
+        if not parent_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Comment not found",
+            )
+
+        replies, next_cursor = _comment_page(db, recipe_id, parent_id, limit, cursor)
+        ids = [r.id for r in replies]
+        counts = _reply_counts(db, recipe_id, ids)
+        mine = _viewer_reactions(db, current_user_id, ids)
+        return [
+            _to_response(reply, mine.get(reply.id), CommentThreadResponse, reply_count=counts.get(reply.id, 0))
+            for reply in replies
+        ], next_cursor
 
     @staticmethod
     def add_comment(
@@ -98,18 +467,26 @@ class CommentService:
             content=payload.content,
         )
         db.add(comment)
+        db.flush()
+        RecipeService.adjust_comment_count(db, recipe.id, 1)
+        version = _bump_comments_version(db, recipe.id)
         db.commit()
-        db.refresh(comment)
+        response_cache.invalidate_counters(recipe.id)
         comment = (
             db.query(RecipeComment)
-            .options(
-                joinedload(RecipeComment.user),
-                selectinload(RecipeComment.comment_reactions),
-            )
+            .options(*COMMENT_LOADERS)
             .filter(RecipeComment.id == comment.id)
             .first()
         )
-        return _to_response(comment, user.id)
+        response = _to_response(comment, None)
+        _queue_event(db, CommentEvent(
+            id=version,
+            recipe_id=recipe.id,
+            event="comment_added",
+            data=response,
+        ))
+        # A new comment has no reactions, so the viewer's view is the neutral one
+        return response
 
     @staticmethod
     def set_reaction(
@@ -119,59 +496,84 @@ class CommentService:
         user: User,
         emoji: str,
     ) -> RecipeCommentResponse:
-        if emoji not in ALLOWED_COMMENT_EMOJIS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Emoji must be one of: {', '.join(sorted(ALLOWED_COMMENT_EMOJIS))}",
-            )
+        """Toggle ``emoji`` on a comment: set it, or clear it if it's already the user's reaction"""
+        _check_emoji(emoji)
+        existing = _viewer_reactions(db, user.id, [comment_id]).get(comment_id)
+        target = None if existing == emoji else emoji
+        _write_reactions(db, recipe.id, user.id, {comment_id: target})
+        db.commit()
 
         comment = (
             db.query(RecipeComment)
-            .filter(
-                RecipeComment.id == comment_id,
-                RecipeComment.recipe_id == recipe.id,
-            )
+            .options(*COMMENT_LOADERS)
+            .filter(RecipeComment.id == comment_id)
             .first()
         )
-        if not comment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Comment not found",
-            )
+        return _to_response(comment, target)
 
-        existing = (
-            db.query(CommentReaction)
-            .filter(
-                CommentReaction.comment_id == comment.id,
-                CommentReaction.user_id == user.id,
-            )
-            .first()
-        )
-        if existing:
-            if existing.emoji == emoji:
-                db.delete(existing)
-            else:
-                existing.emoji = emoji
-        else:
-            db.add(
-                CommentReaction(
-                    comment_id=comment.id,
-                    user_id=user.id,
-                    emoji=emoji,
-                )
-            )
+    @staticmethod
+    def put_reaction(
+        db: Session,
+        recipe: Recipe,
+        comment_id: int,
+        user: User,
+        emoji: Optional[str],
+    ) -> ReactionUpdate:
+        """
+        Set (or with ``emoji=None`` clear) the user's reaction on a comment
+
+        Idempotent: repeating the request leaves the state unchanged.
+
+        Args:
+            db: Database session
+            recipe: Recipe the comment belongs to
+            comment_id: Comment to react to
+            user: Reacting user
+            emoji: Reaction to set, None to clear
+
+        Returns:
+            The user's reaction and the counts that changed (none if it was already set)
+
+        Raises:
+            HTTPException: If the emoji isn't allowed or the comment doesn't exist
+        """
+        _check_emoji(emoji)
+        updates = _write_reactions(db, recipe.id, user.id, {comment_id: emoji})
         db.commit()
+        return updates[0] if updates else ReactionUpdate(comment_id=comment_id, emoji=emoji)
 
-        comment = (
-            db.query(RecipeComment)
-            .options(
-                joinedload(RecipeComment.user),
-                selectinload(RecipeComment.comment_reactions),
-            )
-            .filter(RecipeComment.id == comment_id)
-            .first()
-        )
-        return _to_response(comment, user.id)
+    @staticmethod
+    def apply_reactions(
+        db: Session,
+        recipe: Recipe,
+        user: User,
+        changes: List[ReactionChange],
+    ) -> BatchReactionResponse:
+        """
+        Set or clear many of the user's reactions on a recipe's comments at once
+
+        All changes commit in one transaction; if a comment appears more than
+        once the last change wins.
+
+        Args:
+            db: Database session
+            recipe: Recipe the comments belong to
+            user: Reacting user
+            changes: Target reaction per comment
+
+        Returns:
+            The comments whose reaction changed, with the counts that moved
+
+        Raises:
+            HTTPException: If an emoji isn't allowed or a comment doesn't belong to the recipe
+        """
+        targets = {}
+        for change in changes:
+            _check_emoji(change.emoji)
+            targets[change.comment_id] = change.emoji
+        updates = _write_reactions(db, recipe.id, user.id, targets)
+        db.commit()
+        return BatchReactionResponse(updated=updates)
 
     @staticmethod
     def delete_comment(db: Session, recipe: Recipe, comment_id: int, user: User) -> None:
@@ -192,5 +594,162 @@ class CommentService:
                 detail="Not authorized to delete this comment",
             )
 
+        deleted_ids = _thread_ids(comment)
         db.delete(comment)
+        db.flush()
+        RecipeService.adjust_comment_count(db, recipe.id, -len(deleted_ids))
+        version = _bump_comments_version(db, recipe.id)
         db.commit()
+        response_cache.invalidate_counters(recipe.id)
+        _queue_event(db, CommentEvent(
+            id=version,
+            recipe_id=recipe.id,
+            event="comment_deleted",
+            data=CommentDeletedData(comment_id=comment_id, deleted_ids=deleted_ids),
+        ))
+
+    @staticmethod
+    def reconcile_reaction_counts(db: Session) -> int:
+        """
+        Recompute every reaction counter from COUNT(*) over comment_reactions
+
+        Orphaned counters are deleted, drifted ones overwritten and missing
+        ones inserted, one statement each; recipes whose counters changed get
+        a new comment version so cached comment lists revalidate.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of (comment, emoji) counters corrected
+        """
+        counts = CommentReactionCount.__table__
+        reactions = CommentReaction.__table__
+        same_group = (reactions.c.comment_id == counts.c.comment_id) & (reactions.c.emoji == counts.c.emoji)
+        actual = select(func.count()).select_from(reactions).where(same_group).scalar_subquery()
+
+        orphaned = db.execute(
+            delete(counts)
+            .where(~select(reactions.c.id).where(same_group).exists())
+            .returning(counts.c.comment_id)
+        ).scalars().all()
+        drifted = db.execute(
+            counts.update()
+            .where(counts.c.count != actual)
+            .values(count=actual)
+            .returning(counts.c.comment_id)
+        ).scalars().all()
+        missing = (
+            select(reactions.c.comment_id, reactions.c.emoji, func.count())
+            .where(~select(counts.c.comment_id).where(same_group).exists())
+            .group_by(reactions.c.comment_id, reactions.c.emoji)
+        )
+        inserted = db.execute(
+            counts.insert()
+            .from_select(["comment_id", "emoji", "count"], missing)
+            .returning(counts.c.comment_id)
+        ).scalars().all()
+
+        changed = orphaned + drifted + inserted
+        recipe_ids = db.execute(
+            select(RecipeComment.recipe_id).where(RecipeComment.id.in_(set(changed))).distinct()
+        ).scalars().all()
+        for recipe_id in recipe_ids:
+            _bump_comments_version(db, recipe_id)
+        db.commit()
+        return len(changed)
+
+
+class AsyncCommentService:
+    """
+    Awaitable CommentService for async route handlers (see run_db)
+
+    Writes publish their CommentEvent to the recipe's comment channel once
+    committed (see comments_channel and the SSE stream route).
+    """
+
+    @staticmethod
+    async def _run_and_publish(db: DbSession, fn, *args):
+        try:
+            result = await run_db(db, fn, *args)
+        except BaseException:
+            db.info.pop(PENDING_COMMENT_EVENTS, None)
+            raise
+        for event in db.info.pop(PENDING_COMMENT_EVENTS, []):
+            await message_hub.publish(comments_channel(event.recipe_id), event.model_dump_json())
+        return result
+
+    @staticmethod
+    async def list_comments(
+        db: DbSession,
+        recipe_id: int,
+        current_user_id: Optional[int],
+    ) -> List[RecipeCommentResponse]:
+        return await run_db(db, CommentService.list_comments, recipe_id, current_user_id)
+
+    @staticmethod
+    async def list_threads(
+        db: DbSession,
+        recipe_id: int,
+        current_user_id: Optional[int],
+        **page,
+    ) -> Tuple[List[CommentThreadResponse], Optional[str]]:
+        return await run_db(db, CommentService.list_threads, recipe_id, current_user_id, **page)
+
+    @staticmethod
+    async def list_replies(
+        db: DbSession,
+        recipe_id: int,
+        parent_id: int,
+        current_user_id: Optional[int],
+        **page,
+    ) -> Tuple[List[CommentThreadResponse], Optional[str]]:
+        return await run_db(db, CommentService.list_replies, recipe_id, parent_id, current_user_id, **page)
+
+    @staticmethod
+    async def add_comment(
+        db: DbSession,
+        recipe: Recipe,
+        user: User,
+        payload: AddCommentRequest,
+    ) -> RecipeCommentResponse:
+        return await AsyncCommentService._run_and_publish(db, CommentService.add_comment, recipe, user, payload)
+
+    @staticmethod
+    async def set_reaction(
+        db: DbSession,
+        recipe: Recipe,
+        comment_id: int,
+        user: User,
+        emoji: str,
+    ) -> RecipeCommentResponse:
+        return await AsyncCommentService._run_and_publish(
+            db, CommentService.set_reaction, recipe, comment_id, user, emoji
+        )
+
+    @staticmethod
+    async def put_reaction(
+        db: DbSession,
+        recipe: Recipe,
+        comment_id: int,
+        user: User,
+        emoji: Optional[str],
+    ) -> ReactionUpdate:
+        return await AsyncCommentService._run_and_publish(
+            db, CommentService.put_reaction, recipe, comment_id, user, emoji
+        )
+
+    @staticmethod
+    async def apply_reactions(
+        db: DbSession,
+        recipe: Recipe,
+        user: User,
+        changes: List[ReactionChange],
+    ) -> BatchReactionResponse:
+        return await AsyncCommentService._run_and_publish(
+            db, CommentService.apply_reactions, recipe, user, changes
+        )
+
+    @staticmethod
+    async def delete_comment(db: DbSession, recipe: Recipe, comment_id: int, user: User) -> None:
+        await AsyncCommentService._run_and_publish(db, CommentService.delete_comment, recipe, comment_id, user)
@@ -1,91 +1,196 @@
-from typing import List
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import DateTime, delete, func, literal, select, tuple_
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
-from app.db.models import CookbookSave, Recipe, User
-from app.services.authorization_service import can_view_recipe
+from app.core.cache import response_cache
+from app.core.pagination import cursor_datetime, decode_cursor, encode_cursor
+from app.db.models import CookbookSave, Recipe, RecipeTag, User
+from app.db.session import DbSession, run_db
+from app.db.upsert import upsert_insert
+from app.schemas.cookbook import CookbookBatchRequest, CookbookBatchResponse, CookbookSaveResponse
+from app.services.authorization_service import can_view_recipe, viewable_recipe_clause
+from app.services.recipe_service import RECIPE_LIST_LOADERS, RecipeService, load_response_relationships
+
+
+def _insert_saves(db: Session, recipe_ids: Iterable[int], user_id: int) -> Set[int]:
+    """
+    Save every viewable recipe in ``recipe_ids`` in one statement
+
+    INSERT ... SELECT picks only recipes that exist and the user may view;
+    ON CONFLICT DO NOTHING skips ones already saved. The saved recipes'
+    save_count goes up in the same transaction.
+
+    Returns:
+        The recipe ids newly saved
+    """
+    saves = CookbookSave.__table__
+    stmt = upsert_insert(db, CookbookSave).from_select(
+        ["user_id", "recipe_id", "created_at"],
+        select(
+            literal(user_id),
+            Recipe.id,
+            literal(datetime.utcnow(), DateTime),
+        ).where(Recipe.id.in_(list(recipe_ids)), viewable_recipe_clause(user_id)),
+    )
+    stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "recipe_id"]).returning(saves.c.recipe_id)
+    saved = set(db.execute(stmt).scalars())
+    RecipeService.adjust_save_count(db, saved, 1)
+    return saved
+
+
+def _delete_saves(db: Session, recipe_ids: Iterable[int], user_id: int) -> Set[int]:
+    """Remove the user's saves of ``recipe_ids`` in one statement (save_count follows); returns the recipe ids removed"""
+    saves = CookbookSave.__table__
+    stmt = (
+        delete(saves)
+        .where(saves.c.user_id == user_id, saves.c.recipe_id.in_(list(recipe_ids)))
+        .returning(saves.c.recipe_id)
+    )
+    removed = set(db.execute(stmt).scalars())
+    RecipeService.adjust_save_count(db, removed, -1)
+    return removed
 
 
 class CookbookService:
     """Service layer for cookbook/save functionality"""
     
     @staticmethod
-    def save_recipe(db: Session, recipe_id: int, user: User) -> CookbookSave:
+    def save_recipe(db: Session, recipe_id: int, user: User) -> None:
         """
         Save a recipe to user's cookbook
         
+        The insert is a single statement; only when nothing was inserted
+        is the recipe looked up to report why.
+        
         Args:
             db: Database session
             recipe_id: ID of recipe to save
             user: Current user
             
-        Returns:
-            CookbookSave object
-            
         Raises:
-            HTTPException: If recipe not found or already saved
+            HTTPException: If recipe not found, not viewable or already saved
         """
-        # Check if recipe exists
+        if recipe_id in _insert_saves(db, [recipe_id], user.id):
+            db.commit()
+            response_cache.invalidate_counters(recipe_id)
+            return
+        db.rollback()
+        
         recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
         if not recipe:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Recipe not found"
             )
-
+        
         if not can_view_recipe(recipe, user):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this recipe"
             )
         
-        # Check if already saved
-        existing_save = db.query(CookbookSave).filter(
-            CookbookSave.user_id == user.id,
-            CookbookSave.recipe_id == recipe_id
-        ).first()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Recipe already saved to cookbook"
+        )
+    
+    @staticmethod
+    def get_saved_recipes(
+        db: Session,
+        user: User,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        difficulty: Optional[str] = None,
+    ) -> Tuple[List[CookbookSave], Optional[str]]:
+        """
+        Get a page of recipes saved by a user, most recently saved first
         
-        if existing_save:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Recipe already saved to cookbook"
-            )
+        Keyset-paginated on (created_at, id) over the user's saves index;
+        pass next_cursor back as ``cursor`` for the following page.
         
-        # Create save
-        cookbook_save = CookbookSave(
-            user_id=user.id,
-            recipe_id=recipe_id
+        Args:
+            db: Database session
+            user: Current user
+            limit: Max number of saves
+            cursor: Opaque cursor from a previous page
+            tags: Only recipes with any of these tags
+            difficulty: Only recipes of this difficulty
+            
+        Returns:
+            Tuple of (CookbookSave objects with recipe data, next cursor or None)
+            
+        Raises:
+            HTTPException: If the cursor is invalid
+        """
+        # Recipes join into the main query; their authors load in one IN query each
+        query = db.query(CookbookSave).options(
+            joinedload(CookbookSave.recipe).options(*RECIPE_LIST_LOADERS)
+        ).filter(
+            CookbookSave.user_id == user.id
         )
         
-        try:
-            db.add(cookbook_save)
-            db.commit()
-            db.refresh(cookbook_save)
-            return cookbook_save
-        except IntegrityError:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Recipe already saved to cookbook"
+        if tags:
+            tagged = db.query(RecipeTag.recipe_id).filter(RecipeTag.tag.in_(list(dict.fromkeys(tags))))
+            query = query.filter(CookbookSave.recipe_id.in_(tagged.scalar_subquery()))
+        
+        if difficulty:
+            matching = db.query(Recipe.id).filter(Recipe.difficulty == difficulty)
+            query = query.filter(CookbookSave.recipe_id.in_(matching.scalar_subquery()))
+        
+        if cursor is not None:
+            created_at, save_id = decode_cursor(cursor, 2)
+            if not isinstance(save_id, int):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            query = query.filter(
+                tuple_(CookbookSave.created_at, CookbookSave.id) < tuple_(cursor_datetime(created_at), save_id)
             )
+        
+        # Fetch one extra row to learn whether another page exists
+        saves = query.order_by(
+            CookbookSave.created_at.desc(), CookbookSave.id.desc()
+        ).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(saves) > limit:
+            saves = saves[:limit]
+            next_cursor = encode_cursor(saves[-1].created_at, saves[-1].id)
+        
+        return saves, next_cursor
     
     @staticmethod
-    def get_saved_recipes(db: Session, user: User) -> List[CookbookSave]:
+    def get_cookbook_version(db: Session, user: User) -> tuple:
         """
-        Get all recipes saved by a user
+        Cheap fingerprint of a user's cookbook for ETag generation
+        
+        Covers saves being added/removed and saved recipes being edited,
+        forked, saved or commented on, without loading the saves themselves.
         
         Args:
             db: Database session
             user: Current user
             
         Returns:
-            List of CookbookSave objects with recipe data
+            Tuple of aggregate values that changes whenever the payload does
         """
-        saves = db.query(CookbookSave).filter(
-            CookbookSave.user_id == user.id
-        ).order_by(CookbookSave.created_at.desc()).all()
-        
-        return saves
+        return tuple(
+            db.query(
+                func.count(CookbookSave.id),
+                func.max(CookbookSave.id),
+                func.max(CookbookSave.created_at),
+                func.max(Recipe.updated_at),
+                func.sum(Recipe.fork_count),
+                func.sum(Recipe.save_count),
+                func.sum(Recipe.comment_count),
+            )
+            .join(Recipe, Recipe.id == CookbookSave.recipe_id)
+            .filter(CookbookSave.user_id == user.id)
+            .one()
+        )
     
     @staticmethod
     def remove_saved_recipe(db: Session, recipe_id: int, user: User) -> None:
@@ -100,19 +205,75 @@ class CookbookService:
         Raises:
             HTTPException: If save not found
         """
-        cookbook_save = db.query(CookbookSave).filter(
-            CookbookSave.user_id == user.id,
-            CookbookSave.recipe_id == recipe_id
-        ).first()
-        
-        if not cookbook_save:
+        if not _delete_saves(db, [recipe_id], user.id):
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Recipe not found in cookbook"
             )
         
-        db.delete(cookbook_save)
         db.commit()
+        response_cache.invalidate_counters(recipe_id)
+    
+    @staticmethod
+    def apply_batch(db: Session, payload: CookbookBatchRequest, user: User) -> CookbookBatchResponse:
+        """
+        Save and remove many recipes in one transaction
+        
+        Idempotent: recipes already saved (or already absent) are left as
+        they are rather than failing the batch.
+        
+        Args:
+            db: Database session
+            payload: Recipe ids to save and to remove
+            user: Current user
+            
+        Returns:
+            Recipe ids newly saved, removed, and those that can't be saved
+            because they don't exist or aren't visible to the user
+        """
+        saved = _insert_saves(db, payload.save, user.id) if payload.save else set()
+        removed = _delete_saves(db, payload.remove, user.id) if payload.remove else set()
+        
+        unavailable: Set[int] = set()
+        missing = set(payload.save) - saved
+        if missing:
+            already_saved = {
+                recipe_id for (recipe_id,) in db.query(CookbookSave.recipe_id).filter(
+                    CookbookSave.user_id == user.id,
+                    CookbookSave.recipe_id.in_(missing)
+                )
+            }
+            unavailable = missing - already_saved
+        db.commit()
+        response_cache.invalidate_counters(*saved, *removed)
+        
+        return CookbookBatchResponse(
+            saved=sorted(saved),
+            removed=sorted(removed),
+            unavailable=sorted(unavailable),
+        )
+    
+    @staticmethod
+    def get_saved_recipe_ids(db: Session, user_id: int, recipe_ids: List[int]) -> Set[int]:
+        """
+        Which of ``recipe_ids`` a user has saved, in one IN query
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            recipe_ids: Recipes on the page being rendered
+            
+        Returns:
+            The saved subset of recipe_ids
+        """
+        if not recipe_ids:
+            return set()
+        rows = db.query(CookbookSave.recipe_id).filter(
+            CookbookSave.user_id == user_id,
+            CookbookSave.recipe_id.in_(recipe_ids)
+        )
+        return {recipe_id for (recipe_id,) in rows}
     
     @staticmethod
     def is_recipe_saved(db: Session, recipe_id: int, user_id: int) -> bool:
@@ -133,3 +294,44 @@ class CookbookService:
         ).first()
         
         return save is not None
+
+
+class AsyncCookbookService:
+    """Awaitable CookbookService for async route handlers (see run_db)"""
+    
+    @staticmethod
+    async def save_recipe(db: DbSession, recipe_id: int, user: User) -> None:
+        await run_db(db, CookbookService.save_recipe, recipe_id, user)
+    
+    @staticmethod
+    async def get_saved_recipes(
+        db: DbSession,
+        user: User,
+        **page,
+    ) -> Tuple[List[CookbookSaveResponse], Optional[str]]:
+        """A page of saved recipes, serialized inside the session context"""
+        def query(session: Session) -> Tuple[List[CookbookSaveResponse], Optional[str]]:
+            saves, next_cursor = CookbookService.get_saved_recipes(session, user, **page)
+            load_response_relationships([save.recipe for save in saves])
+            return [CookbookSaveResponse.from_orm(save) for save in saves], next_cursor
+        return await run_db(db, query)
+    
+    @staticmethod
+    async def get_cookbook_version(db: DbSession, user: User) -> tuple:
+        return await run_db(db, CookbookService.get_cookbook_version, user)
+    
+    @staticmethod
+    async def remove_saved_recipe(db: DbSession, recipe_id: int, user: User) -> None:
+        await run_db(db, CookbookService.remove_saved_recipe, recipe_id, user)
+    
+    @staticmethod
+    async def apply_batch(db: DbSession, payload: CookbookBatchRequest, user: User) -> CookbookBatchResponse:
+        return await run_db(db, CookbookService.apply_batch, payload, user)
+    
+    @staticmethod
+    async def get_saved_recipe_ids(db: DbSession, user_id: int, recipe_ids: List[int]) -> Set[int]:
+        return await run_db(db, CookbookService.get_saved_recipe_ids, user_id, recipe_ids)
+    
+    @staticmethod
+    async def is_recipe_saved(db: DbSession, recipe_id: int, user_id: int) -> bool:
+        return await run_db(db, CookbookService.is_recipe_saved, recipe_id, user_id)
@@ -1,8 +1,22 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
-from app.db.models import Conversation, Message, User
+from sqlalchemy import and_, func, select, tuple_, union_all
+from sqlalchemy.orm import Session, aliased, joinedload
+from app.core.pagination import cursor_datetime, decode_cursor, encode_cursor
+from app.core.realtime import conversation_channel, message_hub
+from app.db.models import Conversation, ConversationRead, Message, User
+from app.db.session import DbSession, run_db
+from app.schemas.auth import AuthorResponse
+from app.schemas.messaging import (
+    ConversationReadResponse,
+    ConversationResponse,
+    LastMessagePreview,
+    MessageResponse,
+)
+from app.services.authorization_service import is_participant
+
+# Characters of the latest message shown in the conversation list
+SNIPPET_LENGTH = 140
 
 
 class MessagingService:
@@ -45,20 +59,130 @@ class MessagingService:
         return conversation
 
     @staticmethod
-    def list_conversations(db: Session, user: User) -> List[Conversation]:
-        # Load related user objects so API can include usernames in responses
-        return (
-            db.query(Conversation)
-            .options(joinedload(Conversation.user_one), joinedload(Conversation.user_two))
-            .filter(
-                or_(
-                    Conversation.user_one_id == user.id,
-                    Conversation.user_two_id == user.id,
+    def list_conversations(
+        db: Session,
+        user: User,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ConversationResponse], Optional[str]]:
+        """
+        Page through a user's conversations, most recently active first
+
+        The page is picked as a UNION ALL of the user_one and user_two sides,
+        each read in order from its (user_id, updated_at, id) index and cut
+        at the page size, so only 2 * limit rows are ever sorted. Each row
+        carries the latest message (snippet and sender) and the user's
+        unread count, computed by correlated subqueries in the same
+        statement: the latest message is an index seek on
+        ix_messages_conversation_created_id, the unread count a range scan of
+        ix_messages_conversation_unread past the user's read receipt.
+
+        Args:
+            db: Database session
+            user: Participant whose conversations to list
+            limit: Maximum number of conversations
+            cursor: Opaque next_cursor from a previous page
+
+        Returns:
+            Tuple of (conversations, next cursor or None)
+
+        Raises:
+            HTTPException: If the cursor is invalid
+        """
+        keyset = None
+        if cursor is not None:
+            updated_at, conversation_id = decode_cursor(cursor, 2)
+            if not isinstance(conversation_id, int):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor",
                 )
+            keyset = tuple_(cursor_datetime(updated_at), conversation_id)
+
+        def participant_side(column):
+            side = select(Conversation.id).where(column == user.id)
+            if keyset is not None:
+                side = side.where(tuple_(Conversation.updated_at, Conversation.id) < keyset)
+            side = (
+                side.order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+                .limit(limit + 1)
+                .subquery()
+            )
+            return select(side.c.id)
+
+        # Two index-ordered branches instead of an OR the planner can't sort by index
+        page_ids = union_all(
+            participant_side(Conversation.user_one_id),
+            participant_side(Conversation.user_two_id),
+        )
+
+        latest_message_id = (
+            select(Message.id)
+            .where(Message.conversation_id == Conversation.id)
+            .order_by(Message.created_at.desc(), Message.id.desc())
+            .limit(1)
+            .correlate(Conversation)
+            .scalar_subquery()
+        )
+        unread_count = (
+            select(func.count(Message.id))
+            .where(
+                Message.conversation_id == Conversation.id,
+                Message.id > func.coalesce(ConversationRead.last_read_message_id, 0),
+                Message.sender_id != user.id,
             )
-            .order_by(Conversation.updated_at.desc(), Conversation.created_at.desc())
-            .all()
+            .correlate(Conversation, ConversationRead)
+            .scalar_subquery()
         )
+        last = aliased(Message)
+        query = (
+            db.query(
+                Conversation,
+                last.id,
+                last.sender_id,
+                func.substr(last.content, 1, SNIPPET_LENGTH),
+                last.created_at,
+                unread_count,
+            )
+            # Load related user objects so API can include usernames in responses
+            .options(joinedload(Conversation.user_one), joinedload(Conversation.user_two))
+            .outerjoin(
+                ConversationRead,
+                and_(
+                    ConversationRead.conversation_id == Conversation.id,
+                    ConversationRead.user_id == user.id,
+                ),
+            )
+            .outerjoin(last, last.id == latest_message_id)
+            .filter(Conversation.id.in_(page_ids))
+            .order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+        )
+
+        # Fetch one extra row to learn whether another page exists
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        conversations = []
+        for conversation, message_id, sender_id, snippet, sent_at, unread in rows:
+            preview = None
+            if message_id is not None:
+                sender = conversation.user_one if sender_id == conversation.user_one_id else conversation.user_two
+                preview = LastMessagePreview(
+                    id=message_id,
+                    sender_id=sender_id,
+                    sender=AuthorResponse.model_validate(sender) if sender else None,
+                    snippet=snippet,
+                    created_at=sent_at,
+                )
+            response = ConversationResponse.model_validate(conversation)
+            conversations.append(response.model_copy(update={"last_message": preview, "unread_count": unread}))
+
+        next_cursor = None
+        if has_more:
+            last_conversation = rows[-1][0]
+            next_cursor = encode_cursor(last_conversation.updated_at, last_conversation.id)
+        return conversations, next_cursor
 
     @staticmethod
     def get_conversation(db: Session, conversation_id: int) -> Conversation:
@@ -71,13 +195,125 @@ class MessagingService:
         return conversation
 
     @staticmethod
-    def list_messages(db: Session, conversation_id: int) -> List[Message]:
-        return (
+    def list_messages(
+        db: Session,
+        conversation_id: int,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        limit: int = 50,
+    ) -> List[Message]:
+        """
+        Page through a conversation, oldest first within the page
+
+        Without cursors the latest ``limit`` messages are returned. ``before``
+        pages back through history from a message id; ``after`` returns only
+        messages newer than a message id, so pollers fetch just what they have
+        not seen. Both walk ix_messages_conversation_created_id.
+
+        Args:
+            db: Database session
+            conversation_id: Conversation to read
+            before: Only messages older than this message id
+            after: Only messages newer than this message id
+            limit: Maximum number of messages
+
+        Returns:
+            Up to ``limit`` messages ordered by (created_at, id)
+
+        Raises:
+            HTTPException: If a cursor is not a message in this conversation
+        """
+        key = tuple_(Message.created_at, Message.id)
+        query = (
             db.query(Message)
             .options(joinedload(Message.sender))
             .filter(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
-            .all()
+        )
+        if before is not None:
+            query = query.filter(key < MessagingService._cursor_key(db, conversation_id, before))
+        if after is not None:
+            # Incremental poll: the oldest unseen messages first
+            query = query.filter(key > MessagingService._cursor_key(db, conversation_id, after))
+            return query.order_by(Message.created_at.asc(), Message.id.asc()).limit(limit).all()
+
+        newest = query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit).all()
+        return newest[::-1]
+
+    @staticmethod
+    def _cursor_key(db: Session, conversation_id: int, message_id: int) -> Tuple:
+        key = (
+            db.query(Message.created_at, Message.id)
+            .filter(Message.id == message_id, Message.conversation_id == conversation_id)
+            .first()
+        )
+        if key is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid message cursor",
+            )
+        return tuple(key)
+
+    @staticmethod
+    def _advance_read(db: Session, conversation_id: int, user_id: int, message_id: int) -> int:
+        """Move a read receipt forward to ``message_id`` (never back); returns its position"""
+        receipt = db.query(ConversationRead).filter(
+            ConversationRead.conversation_id == conversation_id,
+            ConversationRead.user_id == user_id,
+        ).first()
+        if receipt is None:
+            receipt = ConversationRead(conversation_id=conversation_id, user_id=user_id, last_read_message_id=message_id)
+            db.add(receipt)
+        elif receipt.last_read_message_id < message_id:
+            receipt.last_read_message_id = message_id
+        return receipt.last_read_message_id
+
+    @staticmethod
+    def mark_read(
+        db: Session,
+        conversation: Conversation,
+        user: User,
+        message_id: Optional[int] = None,
+    ) -> ConversationReadResponse:
+        """
+        Record that ``user`` has read ``conversation`` up to a message
+
+        Args:
+            db: Database session
+            conversation: Conversation the user participates in
+            user: Reader
+            message_id: Last message read (defaults to the latest message)
+
+        Returns:
+            The read position and the remaining unread count
+
+        Raises:
+            HTTPException: If message_id is not a message in this conversation
+        """
+        if message_id is None:
+            message_id = db.query(func.max(Message.id)).filter(
+                Message.conversation_id == conversation.id
+            ).scalar() or 0
+        elif not db.query(Message.id).filter(
+            Message.id == message_id,
+            Message.conversation_id == conversation.id,
+        ).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Message not found in this conversation",
+            )
+
+        last_read = MessagingService._advance_read(db, conversation.id, user.id, message_id)
+        db.commit()
+
+        unread = db.query(func.count(Message.id)).filter(
+            Message.conversation_id == conversation.id,
+            Message.id > last_read,
+            Message.sender_id != user.id,
+        ).scalar()
+        return ConversationReadResponse(
+            conversation_id=conversation.id,
+            last_read_message_id=last_read,
+            unread_count=unread,
         )
 
     @staticmethod
@@ -90,6 +326,8 @@ class MessagingService:
         db.add(message)
         db.flush()  # message id + created_at; keep same transaction as conversation update
         conversation.updated_at = message.created_at
+        # Writing a message implies having read the conversation up to it
+        MessagingService._advance_read(db, conversation.id, sender.id, message.id)
         db.commit()
 
         return (
@@ -98,3 +336,93 @@ class MessagingService:
             .filter(Message.id == message.id)
             .one()
         )
+
+
+class AsyncMessagingService:
+    """
+    Awaitable MessagingService for async route handlers (see run_db)
+
+    Results headed for the client come back as response schemas, built
+    inside the session context. New messages are published to the
+    conversation's real-time channel once committed.
+    """
+
+    @staticmethod
+    async def _publish(message: MessageResponse) -> None:
+        await message_hub.publish(conversation_channel(message.conversation_id), message.model_dump_json())
+
+    @staticmethod
+    async def start_conversation(
+        db: DbSession,
+        current_user: User,
+        recipient_user_id: int,
+        initial_message: str | None = None,
+    ) -> ConversationResponse:
+        def start(session: Session) -> Tuple[ConversationResponse, Optional[MessageResponse]]:
+            conversation = MessagingService.start_conversation(session, current_user, recipient_user_id)
+            message = None
+            if initial_message:
+                message = MessageResponse.model_validate(
+                    MessagingService.send_message(session, conversation, current_user, initial_message)
+                )
+            # Load before validation: no lazy loads inside pydantic under an AsyncSession
+            conversation.user_one, conversation.user_two
+            return ConversationResponse.model_validate(conversation), message
+        response, message = await run_db(db, start)
+        if message is not None:
+            await AsyncMessagingService._publish(message)
+        return response
+
+    @staticmethod
+    async def list_conversations(
+        db: DbSession,
+        user: User,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ConversationResponse], Optional[str]]:
+        return await run_db(db, MessagingService.list_conversations, user, limit, cursor)
+
+    @staticmethod
+    async def mark_read(
+        db: DbSession,
+        conversation: Conversation,
+        user: User,
+        message_id: Optional[int] = None,
+    ) -> ConversationReadResponse:
+        return await run_db(db, MessagingService.mark_read, conversation, user, message_id)
+
+    @staticmethod
+    async def get_conversation(db: DbSession, conversation_id: int) -> Conversation:
+        return await run_db(db, MessagingService.get_conversation, conversation_id)
+
+    @staticmethod
+    async def can_subscribe(db: DbSession, conversation_id: int, user: User) -> bool:
+        """
+        Whether ``user`` may stream ``conversation_id``'s messages
+
+        Ends the session's transaction either way, so a long-lived socket
+        doesn't keep a pooled connection checked out.
+        """
+        def check(session: Session) -> bool:
+            conversation = session.get(Conversation, conversation_id)
+            allowed = conversation is not None and is_participant(conversation, user)
+            session.rollback()
+            return allowed
+        return await run_db(db, check)
+
+    @staticmethod
+    async def list_messages(db: DbSession, conversation_id: int, **cursors) -> List[MessageResponse]:
+        def query(session: Session) -> List[MessageResponse]:
+            return [
+                MessageResponse.model_validate(message)
+                for message in MessagingService.list_messages(session, conversation_id, **cursors)
+            ]
+        return await run_db(db, query)
+
+    @staticmethod
+    async def send_message(db: DbSession, conversation: Conversation, sender: User, content: str) -> MessageResponse:
+        def send(session: Session) -> MessageResponse:
+            return MessageResponse.model_validate(MessagingService.send_message(session, conversation, sender, content))
+        message = await run_db(db, send)
+        await AsyncMessagingService._publish(message)
+        return message
@@ -1,9 +1,33 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, or_, select, tuple_, update
 from fastapi import HTTPException, status
-from app.db.models import Recipe, User, VisibilityEnum
-from app.schemas.recipe import CreateRecipeRequest, UpdateRecipeRequest
+from app.core.cache import response_cache
+from app.core.pagination import cursor_datetime, decode_cursor, encode_cursor
+from app.db.models import RECIPE_POPULARITY, CookbookSave, Recipe, RecipeComment, RecipeTag, User, VisibilityEnum
+from app.db.search import build_fts_query, search_matches, supports_full_text
+from app.db.session import DbSession, run_db
+from app.schemas.recipe import (
+    CreateRecipeRequest,
+    UpdateRecipeRequest,
+    RecipeResponse,
+    RecipeSortEnum,
+    TagMatchEnum,
+)
+
+
+# Relationships RecipeResponse serializes. Lists use one IN query per
+# relationship; single rows join them into the main SELECT.
+RECIPE_LIST_LOADERS = (selectinload(Recipe.author), selectinload(Recipe.origin_author))
+RECIPE_DETAIL_LOADERS = (joinedload(Recipe.author), joinedload(Recipe.origin_author))
+
+# Counter-ordered sorts; each has a feed index on (is_published, visibility, score, created_at, id)
+COUNTER_SORTS = {
+    RecipeSortEnum.most_forked: Recipe.fork_count,
+    RecipeSortEnum.most_saved: Recipe.save_count,
+    RecipeSortEnum.most_discussed: Recipe.comment_count,
+    RecipeSortEnum.popular: RECIPE_POPULARITY,
+}
 
 
 class RecipeService:
@@ -43,10 +67,163 @@ class RecipeService:
             db_recipe.origin_author_id = recipe_data.origin_author_id
         
         db.add(db_recipe)
+        if db_recipe.origin_recipe_id:
+            RecipeService.adjust_fork_count(db, db_recipe.origin_recipe_id, 1)
         db.commit()
         db.refresh(db_recipe)
+        # New recipe changes list pages; a fork also changes the origin's fork_count
+        response_cache.invalidate_recipe(db_recipe.origin_recipe_id)
         return db_recipe
     
+    @staticmethod
+    def adjust_fork_count(db: Session, recipe_id: int, delta: int) -> None:
+        """
+        Atomically add ``delta`` to a recipe's fork_count in the current transaction
+        
+        Args:
+            db: Database session
+            recipe_id: Origin recipe ID
+            delta: +1 when a fork is created, -1 when one is deleted
+        """
+        db.query(Recipe).filter(Recipe.id == recipe_id).update(
+            {
+                Recipe.fork_count: Recipe.fork_count + delta,
+                # Counter changes are not edits; keep updated_at as-is
+                Recipe.updated_at: Recipe.updated_at,
+            },
+            synchronize_session=False,
+        )
+    
+    @staticmethod
+    def adjust_save_count(db: Session, recipe_ids: Iterable[int], delta: int) -> None:
+        """
+        Atomically add ``delta`` to the save_count of each recipe in the current transaction
+        
+        Args:
+            db: Database session
+            recipe_ids: Recipes saved or removed
+            delta: +1 per save, -1 per removal
+        """
+        RecipeService._adjust_counter(db, Recipe.save_count, recipe_ids, delta)
+    
+    @staticmethod
+    def adjust_comment_count(db: Session, recipe_id: int, delta: int) -> None:
+        """
+        Atomically add ``delta`` to a recipe's comment_count in the current transaction
+        
+        Args:
+            db: Database session
+            recipe_id: Recipe commented on
+            delta: +1 per comment, minus the comments removed with a deleted thread
+        """
+        RecipeService._adjust_counter(db, Recipe.comment_count, [recipe_id], delta)
+    
+    @staticmethod
+    def _adjust_counter(db: Session, counter, recipe_ids: Iterable[int], delta: int) -> None:
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids or not delta:
+            return
+        db.query(Recipe).filter(Recipe.id.in_(recipe_ids)).update(
+            {
+                counter: counter + delta,
+                # Counter changes are not edits; keep updated_at as-is
+                Recipe.updated_at: Recipe.updated_at,
+            },
+            synchronize_session=False,
+        )
+    
+    @staticmethod
+    def get_feed_state(db: Session, recipe_ids: List[int], user_id: Optional[int] = None) -> Dict[int, dict]:
+        """
+        Live per-recipe fields of a feed page, in one IN query
+        
+        Args:
+            db: Database session
+            recipe_ids: Recipes on the page being rendered
+            user_id: Viewer whose is_saved is included, if any
+            
+        Returns:
+            save_count, comment_count (and is_saved) keyed by recipe id
+        """
+        if not recipe_ids:
+            return {}
+        columns = [Recipe.id, Recipe.save_count, Recipe.comment_count]
+        if user_id is not None:
+            columns.append(
+                select(CookbookSave.recipe_id)
+                .where(CookbookSave.user_id == user_id, CookbookSave.recipe_id == Recipe.id)
+                .exists()
+                .label("is_saved")
+            )
+        state = {}
+        for row in db.query(*columns).filter(Recipe.id.in_(recipe_ids)):
+            fields = row._asdict()
+            state[fields.pop("id")] = fields
+        return state
+    
+    @staticmethod
+    def reconcile_fork_counts(db: Session) -> int:
+        """
+        Recompute every fork_count from origin_recipe_id in one statement
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of recipes whose counter had drifted
+        """
+        forks = Recipe.__table__.alias("forks")
+        actual = (
+            select(func.count(forks.c.id))
+            .where(forks.c.origin_recipe_id == Recipe.id)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            update(Recipe)
+            .where(Recipe.fork_count != actual)
+            .values(fork_count=actual, updated_at=Recipe.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount:
+            response_cache.invalidate_recipe()
+        return result.rowcount
+    
+    @staticmethod
+    def reconcile_engagement_counts(db: Session) -> dict:
+        """
+        Recompute every save_count and comment_count, one UPDATE per counter
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of recipes corrected, keyed by counter name
+        """
+        sources = {
+            "save_count": (Recipe.save_count, CookbookSave.__table__),
+            "comment_count": (Recipe.comment_count, RecipeComment.__table__),
+        }
+        drifted = {}
+        for name, (counter, source) in sources.items():
+            actual = (
+                select(func.count())
+                .select_from(source)
+                .where(source.c.recipe_id == Recipe.id)
+                .scalar_subquery()
+            )
+            result = db.execute(
+                update(Recipe)
+                .where(counter != actual)
+                .values({counter: actual, Recipe.updated_at: Recipe.updated_at})
+                .execution_options(synchronize_session=False)
+            )
+            drifted[name] = result.rowcount
+        db.commit()
+        if any(drifted.values()):
+            response_cache.invalidate_recipe()
+        return drifted
+    
     @staticmethod
     def get_recipe_by_id(db: Session, recipe_id: int) -> Optional[Recipe]:
         """
@@ -59,60 +236,165 @@ class RecipeService:
         Returns:
             Recipe object or None if not found
         """
-        return db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        return (
+            db.query(Recipe)
+            .options(*RECIPE_DETAIL_LOADERS)
+            .filter(Recipe.id == recipe_id)
+            .first()
+        )
     
     @staticmethod
     def get_recipes(
         db: Session,
         search: Optional[str] = None,
-        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
         difficulty: Optional[str] = None,
         limit: int = 20,
-        offset: int = 0
-    ) -> tuple[List[Recipe], int]:
+        offset: int = 0,
+        sort: Optional[RecipeSortEnum] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        tag_mode: TagMatchEnum = TagMatchEnum.any,
+    ) -> tuple[List[Recipe], Optional[int], Optional[str]]:
         """
         Get recipes with filtering and pagination
         
+        Newest-first listings are keyset-paginated on (created_at, id): pass the
+        returned next_cursor back as ``cursor`` to fetch the following page
+        without OFFSET scanning. Other orderings use limit/offset.
+        
         Args:
             db: Database session
-            search: Search query for title/description
-            tag: Filter by tag
+            search: Full-text query over title, description, ingredients and tags
+            tags: Filter by tags (exact match via the recipe_tags index)
             difficulty: Filter by difficulty
             limit: Max number of results
             offset: Number of results to skip
+            sort: Ordering; relevance (BM25) only applies when searching,
+                most_forked / most_saved / most_discussed order by the
+                persisted counters and popular by their sum
+            cursor: Opaque cursor from a previous page (replaces offset)
+            include_total: Whether to run the COUNT query for the filtered set
+            tag_mode: any = recipe has at least one tag, all = recipe has every tag
             
         Returns:
-            Tuple of (list of recipes, total count)
+            Tuple of (list of recipes, total count or None, next cursor or None)
+            
+        Raises:
+            HTTPException: If the cursor is invalid or used with a non-recency sort
         """
         query = db.query(Recipe).filter(
             Recipe.is_published.is_(True),
             Recipe.visibility == VisibilityEnum.public,
         )
+        rank = None
         
         # Apply filters
         if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Recipe.title.ilike(search_filter),
-                    Recipe.description.ilike(search_filter)
+            dialect_name = db.get_bind().dialect.name
+            if supports_full_text(dialect_name):
+                fts_query = build_fts_query(dialect_name, search)
+                if fts_query is None:
+                    return [], 0 if include_total else None, None
+                matches = search_matches(dialect_name, fts_query)
+                if sort == RecipeSortEnum.relevance:
+                    query = query.join(matches, matches.c.recipe_id == Recipe.id)
+                    rank = matches.c.rank
+                else:
+                    # Materialized id list keeps the feed index driving the ORDER BY
+                    query = query.filter(Recipe.id.in_(select(matches.c.recipe_id)))
+            else:
+                search_filter = f"%{search}%"
+                query = query.filter(
+                    or_(
+                        Recipe.title.ilike(search_filter),
+                        Recipe.description.ilike(search_filter)
+                    )
                 )
-            )
         
-        if tag:
-            # SQLite JSON filtering
-            query = query.filter(Recipe.tags.contains(tag))
+        if tags:
+            wanted = list(dict.fromkeys(tags))
+            tagged = db.query(RecipeTag.recipe_id).filter(RecipeTag.tag.in_(wanted))
+            if tag_mode == TagMatchEnum.all and len(wanted) > 1:
+                tagged = tagged.group_by(RecipeTag.recipe_id).having(
+                    func.count(RecipeTag.tag) == len(wanted)
+                )
+            query = query.filter(Recipe.id.in_(tagged.scalar_subquery()))
         
         if difficulty:
             query = query.filter(Recipe.difficulty == difficulty)
         
         # Get total count
-        total = query.count()
+        total = query.count() if include_total else None
+        
+        # relevance without a search term falls back to newest-first
+        keyset = sort not in COUNTER_SORTS and (
+            sort != RecipeSortEnum.relevance or rank is None
+        )
+        if cursor is not None and not keyset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is only supported for newest-first ordering"
+            )
         
         # Apply pagination and order
-        recipes = query.order_by(Recipe.created_at.desc()).limit(limit).offset(offset).all()
+        if sort == RecipeSortEnum.relevance and rank is not None:
+            query = query.order_by(rank.asc(), Recipe.created_at.desc(), Recipe.id.desc())
+        elif sort in COUNTER_SORTS:
+            query = query.order_by(COUNTER_SORTS[sort].desc(), Recipe.created_at.desc(), Recipe.id.desc())
+        else:
+            query = query.order_by(Recipe.created_at.desc(), Recipe.id.desc())
         
-        return recipes, total
+        if cursor is not None:
+            created_at, recipe_id = decode_cursor(cursor, 2)
+            if not isinstance(recipe_id, int):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            query = query.filter(
+                tuple_(Recipe.created_at, Recipe.id) < tuple_(cursor_datetime(created_at), recipe_id)
+            )
+        else:
+            query = query.offset(offset)
+        
+        # Fetch one extra row to learn whether another page exists
+        recipes = query.options(*RECIPE_LIST_LOADERS).limit(limit + 1).all()
+        has_more = len(recipes) > limit
+        recipes = recipes[:limit]
+        
+        next_cursor = None
+        if keyset and has_more:
+            last = recipes[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        
+        return recipes, total, next_cursor
+    
+    @staticmethod
+    def get_tag_counts(db: Session, limit: int = 50) -> List[tuple[str, int]]:
+        """
+        Count public, published recipes per tag
+        
+        Args:
+            db: Database session
+            limit: Max number of tags to return
+            
+        Returns:
+            List of (tag, count) tuples, most used first
+        """
+        count = func.count(RecipeTag.recipe_id)
+        return (
+            db.query(RecipeTag.tag, count)
+            .join(Recipe, Recipe.id == RecipeTag.recipe_id)
+            .filter(
+                Recipe.is_published.is_(True),
+                Recipe.visibility == VisibilityEnum.public,
+            )
+            .group_by(RecipeTag.tag)
+            .order_by(count.desc(), RecipeTag.tag.asc())
+            .limit(limit)
+            .all()
+        )
     
     @staticmethod
     def update_recipe(
@@ -152,6 +434,7 @@ class RecipeService:
         
         db.commit()
         db.refresh(recipe)
+        response_cache.invalidate_recipe(recipe.id)
         return recipe
     
     @staticmethod
@@ -174,5 +457,90 @@ class RecipeService:
                 detail="Not authorized to delete this recipe"
             )
         
+        recipe_id, origin_recipe_id = recipe.id, recipe.origin_recipe_id
+        if origin_recipe_id:
+            RecipeService.adjust_fork_count(db, origin_recipe_id, -1)
         db.delete(recipe)
         db.commit()
+        response_cache.invalidate_recipe(recipe_id)
+        if origin_recipe_id:
+            response_cache.invalidate_recipe(origin_recipe_id)
+
+
+def load_response_relationships(recipes: List[Recipe]) -> None:
+    """
+    Load the relationships RecipeResponse reads, before it is validated
+    
+    pydantic-core reads attributes from native code, where a lazy load can't
+    safely switch greenlets under an AsyncSession; loading them up front in
+    Python keeps validation free of I/O. Many-to-one loads hit the identity
+    map for repeated authors.
+    """
+    for recipe in recipes:
+        recipe.author
+        recipe.origin_author
+
+
+class AsyncRecipeService:
+    """
+    Awaitable RecipeService for async route handlers
+    
+    Each method runs the matching RecipeService query through run_db, so it
+    works with either session type and never blocks the event loop. Methods
+    whose result is sent to the client return response schemas built inside
+    the session context, since relationships can't lazy-load after the await.
+    """
+    
+    @staticmethod
+    async def to_response(db: DbSession, recipe: Recipe) -> RecipeResponse:
+        """Serialize a recipe loaded through ``db`` (author relationships included)"""
+        def serialize(session: Session) -> RecipeResponse:
+            load_response_relationships([recipe])
+            return RecipeResponse.model_validate(recipe)
+        return await run_db(db, serialize)
+    
+    @staticmethod
+    async def create_recipe(db: DbSession, recipe_data: CreateRecipeRequest, user: User) -> RecipeResponse:
+        def create(session: Session) -> RecipeResponse:
+            recipe = RecipeService.create_recipe(session, recipe_data, user)
+            load_response_relationships([recipe])
+            return RecipeResponse.model_validate(recipe)
+        return await run_db(db, create)
+    
+    @staticmethod
+    async def get_recipe_by_id(db: DbSession, recipe_id: int) -> Optional[Recipe]:
+        return await run_db(db, RecipeService.get_recipe_by_id, recipe_id)
+    
+    @staticmethod
+    async def get_recipes(db: DbSession, **filters) -> tuple[List[RecipeResponse], Optional[int], Optional[str]]:
+        """Same filters as RecipeService.get_recipes"""
+        def query(session: Session) -> tuple[List[RecipeResponse], Optional[int], Optional[str]]:
+            recipes, total, next_cursor = RecipeService.get_recipes(session, **filters)
+            load_response_relationships(recipes)
+            return [RecipeResponse.model_validate(r) for r in recipes], total, next_cursor
+        return await run_db(db, query)
+    
+    @staticmethod
+    async def get_feed_state(db: DbSession, recipe_ids: List[int], user_id: Optional[int] = None) -> Dict[int, dict]:
+        return await run_db(db, RecipeService.get_feed_state, recipe_ids, user_id)
+    
+    @staticmethod
+    async def get_tag_counts(db: DbSession, limit: int = 50) -> List[tuple[str, int]]:
+        return await run_db(db, RecipeService.get_tag_counts, limit=limit)
+    
+    @staticmethod
+    async def update_recipe(
+        db: DbSession,
+        recipe: Recipe,
+        recipe_data: UpdateRecipeRequest,
+        user: User
+    ) -> RecipeResponse:
+        def update(session: Session) -> RecipeResponse:
+            updated = RecipeService.update_recipe(session, recipe, recipe_data, user)
+            load_response_relationships([updated])
+            return RecipeResponse.model_validate(updated)
+        return await run_db(db, update)
+    
+    @staticmethod
+    async def delete_recipe(db: DbSession, recipe: Recipe, user: User) -> None:
+        await run_db(db, RecipeService.delete_recipe, recipe, user)
@@ -9,6 +9,7 @@ This script is for local dev smoke-tests only.
 import sys
 from app.db.session import SessionLocal
 from app.db.models import Recipe
+from app.services.recipe_service import RecipeService
 
 def clone_recipe(source_id: int, new_author_id: int):
     db = SessionLocal()
@@ -35,12 +36,13 @@ def clone_recipe(source_id: int, new_author_id: int):
         )
 
         db.add(new)
+        # bump the source's counter in the same transaction as the insert
+        RecipeService.adjust_fork_count(db, src.id, 1)
         db.commit()
         db.refresh(new)
+        db.refresh(src)
 
-        # compute fork_count for source
-        fc = db.query(Recipe).filter(Recipe.origin_recipe_id == src.id).count()
-        print(f'Cloned recipe id={new.id} from source={src.id}; fork_count={fc}')
+        print(f'Cloned recipe id={new.id} from source={src.id}; fork_count={src.fork_count}')
         return new
     finally:
         db.close()
@@ -4,7 +4,7 @@ This script performs quick, readable smoke checks useful during local
 development. It runs two checks:
 
 1. DB check: queries published public recipes via the service layer and
-   prints each recipe id, origin id and computed fork_count.
+   prints each recipe id, origin id and its persisted fork_count.
 2. API check: uses FastAPI TestClient to request the `/recipes` route and
    pretty-prints the JSON response (status and top-level summary).
 
@@ -21,22 +21,18 @@ from typing import Any
 
 from app.db.session import SessionLocal
 from app.services.recipe_service import RecipeService
-from app.db.models import Recipe as RecipeModel
 
 
 def db_check():
     db = SessionLocal()
     try:
         print('=== DB CHECK: recipes via service layer ===')
-        recipes, total = RecipeService.get_recipes(db)
+        recipes, total, _ = RecipeService.get_recipes(db)
         print(f'Total (service query): {total}\n')
         for r in recipes:
             rid = getattr(r, 'id', None)
             origin = getattr(r, 'origin_recipe_id', None)
-            try:
-                fc = db.query(RecipeModel).filter(RecipeModel.origin_recipe_id == rid).count()
-            except Exception:
-                fc = '<error>'
+            fc = getattr(r, 'fork_count', '<missing>')
             print(f'- id={rid} origin={origin} fork_count={fc}')
     except Exception:
         print('DB check failed:')
@@ -0,0 +1,110 @@
+"""
+Concurrent login benchmark: bcrypt inline vs. on the password hash pool.
+
+Run from the backend root (same directory as alembic.ini):
+
+    python scripts/bench_login.py --logins 32 --workers 4
+
+For each mode the app is driven in-process (httpx ASGI transport, one event
+loop, like a single uvicorn worker) against a throwaway SQLite database.
+N logins are fired at once while a probe keeps hitting GET /health; the
+report shows login throughput and how long the probe was stalled.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp(prefix="bench-login-")
+os.environ.setdefault("SECRET_KEY", "bench-login-secret")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+import httpx  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.security import PasswordHashPool, get_password_hash  # noqa: E402
+from app.db.models import User  # noqa: E402
+from app.db.session import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+EMAIL = "bench@mail.uc.edu"
+PASSWORD = "bench-password"
+
+
+def _setup_database() -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.email == EMAIL).first():
+            db.add(User(email=EMAIL, username="bench", password_hash=get_password_hash(PASSWORD)))
+            db.commit()
+    finally:
+        db.close()
+
+
+async def _run(logins: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        done = asyncio.Event()
+        probe_latencies = []
+
+        async def probe() -> None:
+            # Latency is measured from when the probe *wanted* to run, so time
+            # spent waiting for a blocked event loop counts against it
+            while not done.is_set():
+                due = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                await client.get("/health")
+                probe_latencies.append(time.perf_counter() - due)
+
+        async def login() -> int:
+            response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            return response.status_code
+
+        probe_task = asyncio.create_task(probe())
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "ok": sum(1 for code in statuses if code == 200),
+        "elapsed": elapsed,
+        "throughput": logins / elapsed,
+        "probe_p50_ms": statistics.median(probe_latencies) * 1000,
+        "probe_max_ms": max(probe_latencies) * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=32, help="concurrent logins per run")
+    parser.add_argument("--workers", type=int, default=4, help="hash pool size for the pooled run")
+    args = parser.parse_args()
+
+    _setup_database()
+    print("UC Cookbook - concurrent login benchmark")
+    print("=" * 50)
+    for label, workers in (("inline (before)", 0), (f"pool x{args.workers} (after)", args.workers)):
+        security.password_hash_pool = PasswordHashPool(max_workers=workers, max_queue=0)
+        result = asyncio.run(_run(args.logins))
+        print(
+            f"{label:<20} {result['ok']}/{args.logins} ok  "
+            f"{result['elapsed']:.2f}s  {result['throughput']:.1f} logins/s  "
+            f"/health p50 {result['probe_p50_ms']:.1f}ms max {result['probe_max_ms']:.1f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
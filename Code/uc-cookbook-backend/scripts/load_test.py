@@ -0,0 +1,201 @@
+"""
+Mixed read/write load test: sync driver in the threadpool vs. asyncio driver.
+
+Run from the backend root (same directory as alembic.ini):
+
+    python scripts/load_test.py --concurrency 1,8,32 --duration 10
+
+For each mode (DATABASE_ASYNC=false/true) a uvicorn worker is started on a
+throwaway SQLite database seeded with users and recipes, with the response
+cache disabled so every request reaches the database. Each virtual user
+loops over an authenticated mix of
+
+    50% GET /recipes (random page)   20% GET /recipes/{id}
+    15% GET /cookbook                10% POST /recipes/{id}/comments
+     5% POST + DELETE /cookbook/{id}
+
+and the report shows requests/s and latency percentiles per concurrency
+level. Pass --base-url to drive an already running server instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_ROOT)
+
+SECRET_KEY = "load-test-secret"
+USERS = 20
+RECIPES = 500
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _seed(database_url: str) -> None:
+    """Create tables and seed data in a subprocess-independent way"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core.security import get_password_hash
+    from app.db.models import Recipe, User
+    from app.db.session import Base
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    password_hash = get_password_hash("load-test")
+    users = [
+        User(email=f"load{i}@mail.uc.edu", username=f"load{i}", password_hash=password_hash)
+        for i in range(USERS)
+    ]
+    db.add_all(users)
+    db.flush()
+    for i in range(RECIPES):
+        db.add(Recipe(
+            title=f"Load recipe {i}",
+            description="Seeded for the load test",
+            ingredients=["flour", "water"],
+            steps=["mix", "bake"],
+            tags=[random.choice(["dinner", "vegan", "quick", "dessert"])],
+            time_minutes=30,
+            difficulty="easy",
+            is_published=True,
+            author_id=users[i % USERS].id,
+        ))
+    db.commit()
+    db.close()
+    engine.dispose()
+
+
+def _tokens() -> list[str]:
+    from app.core.security import create_access_token
+    return [create_access_token({"sub": str(i + 1)}) for i in range(USERS)]
+
+
+async def _virtual_user(client, token: str, deadline: float, latencies: list, errors: list) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        recipe_id = random.randint(1, RECIPES)
+        roll = random.random()
+        started = time.perf_counter()
+        if roll < 0.50:
+            response = await client.get("/recipes", params={"offset": random.randint(0, RECIPES - 20)}, headers=headers)
+        elif roll < 0.70:
+            response = await client.get(f"/recipes/{recipe_id}", headers=headers)
+        elif roll < 0.85:
+            response = await client.get("/cookbook", headers=headers)
+        elif roll < 0.95:
+            response = await client.post(f"/recipes/{recipe_id}/comments", json={"content": "load"}, headers=headers)
+        else:
+            response = await client.post(f"/cookbook/{recipe_id}", headers=headers)
+            if response.status_code == 201:
+                response = await client.delete(f"/cookbook/{recipe_id}", headers=headers)
+            elif response.status_code == 400:  # already saved by an earlier loop
+                response = await client.delete(f"/cookbook/{recipe_id}", headers=headers)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 500:
+            errors.append(response.status_code)
+
+
+async def _run_level(base_url: str, tokens: list[str], concurrency: int, duration: float) -> dict:
+    import httpx
+
+    latencies: list = []
+    errors: list = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _virtual_user(client, tokens[i % len(tokens)], deadline, latencies, errors)
+            for i in range(concurrency)
+        ))
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "rps": len(ordered) / duration,
+        "p50_ms": statistics.median(ordered) * 1000 if ordered else 0.0,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000 if ordered else 0.0,
+        "errors": len(errors),
+    }
+
+
+def _start_server(database_url: str, async_mode: bool, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        SECRET_KEY=SECRET_KEY,
+        DATABASE_URL=database_url,
+        DATABASE_ASYNC="true" if async_mode else "false",
+        RESPONSE_CACHE_BACKEND="none",
+        DEBUG="false",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_ROOT,
+        env=env,
+    )
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated virtual user counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--modes", default="sync,async", help="sync, async or both")
+    parser.add_argument("--base-url", help="drive an already running server (uses its DATABASE_ASYNC)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", SECRET_KEY)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    modes = ["external"] if args.base_url else args.modes.split(",")
+
+    print("UC Cookbook - mixed read/write load test")
+    print("=" * 50)
+    for mode in modes:
+        server = None
+        if args.base_url:
+            base_url = args.base_url
+        else:
+            db_path = os.path.join(tempfile.mkdtemp(prefix="load-test-"), "load.db")
+            database_url = f"sqlite:///{db_path}"
+            _seed(database_url)
+            port = _free_port()
+            server = _start_server(database_url, mode == "async", port)
+            base_url = f"http://127.0.0.1:{port}"
+        try:
+            tokens = _tokens()
+            for concurrency in levels:
+                result = asyncio.run(_run_level(base_url, tokens, concurrency, args.duration))
+                print(
+                    f"{mode:<8} c={concurrency:<4} {result['rps']:8.1f} req/s  "
+                    f"p50 {result['p50_ms']:7.1f}ms  p95 {result['p95_ms']:7.1f}ms  "
+                    f"5xx {result['errors']}"
+                )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
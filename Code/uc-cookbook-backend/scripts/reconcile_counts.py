@@ -0,0 +1,44 @@
+"""
+Recompute denormalized recipe counters from their source tables.
+
+Run from the backend root (same directory as alembic.ini):
+
+    python scripts/reconcile_counts.py
+
+Counters are maintained transactionally by the service layer; this is the
+bulk repair path for drift caused by manual SQL, restores or old scripts.
+Each counter is fixed with set-based statements, so it is safe on large tables.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.comment_service import CommentService  # noqa: E402
+from app.services.recipe_service import RecipeService  # noqa: E402
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        print("UC Cookbook - counter reconciliation")
+        print("=" * 50)
+        drifted = RecipeService.reconcile_fork_counts(db)
+        print(f"fork_count: {drifted} recipe(s) corrected")
+        for counter, count in RecipeService.reconcile_engagement_counts(db).items():
+            print(f"{counter}: {count} recipe(s) corrected")
+        drifted = CommentService.reconcile_reaction_counts(db)
+        print(f"reaction counts: {drifted} counter(s) corrected")
+        print("\nDone.")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
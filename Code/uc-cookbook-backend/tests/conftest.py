@@ -1,15 +1,19 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.db.session import Base, get_db
-from app.core.security import get_password_hash
-from app.db.models import User
+from app.api.deps import get_read_db
+from app.core.cache import response_cache
+from app.core.identity import identity_cache
+from app.core.realtime import message_hub
+from app.db.session import Base, create_db_engine, get_db
+from app.core.security import create_access_token, get_password_hash
+from app.db.models import Conversation, Recipe, User
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -35,6 +39,10 @@ def client(db):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    response_cache.clear()
+    identity_cache.clear()
+    message_hub.clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -54,6 +62,66 @@ def test_user(db):
     return user
 
 
+@pytest.fixture
+def make_user(db):
+    """Factory: make_user("name") commits a user with email name@mail.uc.edu"""
+    def make(username, password=None):
+        user = User(
+            email=f"{username}@mail.uc.edu",
+            username=username,
+            password_hash=get_password_hash(password) if password else "x"
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+    return make
+
+
+@pytest.fixture
+def make_recipe(db):
+    """Factory: make_recipe(author, title, **fields) commits a published public recipe"""
+    def make(author, title="Test Recipe", **fields):
+        values = {
+            "title": title,
+            "description": "Test",
+            "ingredients": ["ingredient"],
+            "steps": ["step"],
+            "tags": ["test"],
+            "time_minutes": 20,
+            "difficulty": "easy",
+            "is_published": True,
+            "author_id": author.id,
+        }
+        values.update(fields)
+        recipe = Recipe(**values)
+        db.add(recipe)
+        db.commit()
+        return recipe
+    return make
+
+
+@pytest.fixture
+def make_conversation(db):
+    """Factory: make_conversation(user_a, user_b) commits their conversation"""
+    def make(user_a, user_b):
+        low_id, high_id = sorted((user_a.id, user_b.id))
+        conversation = Conversation(user_one_id=low_id, user_two_id=high_id)
+        db.add(conversation)
+        db.commit()
+        return conversation
+    return make
+
+
+@pytest.fixture
+def auth_headers():
+    """Factory: auth_headers(user) returns a Bearer Authorization header for a new token"""
+    def make(user, expires_delta=None):
+        token = create_access_token({"sub": str(user.id), "email": user.email}, expires_delta)
+        return {"Authorization": f"Bearer {token}"}
+    return make
+
+
 @pytest.fixture
 def authenticated_client(client, test_user):
     """Create an authenticated client"""
@@ -64,3 +132,18 @@ def authenticated_client(client, test_user):
     )
     assert response.status_code == 200
     return client
+
+
+@pytest.fixture
+def query_counter(db):
+    """Record SQL statements executed against the test engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
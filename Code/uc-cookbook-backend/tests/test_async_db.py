@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.db.session import async_database_url, get_db
+from app.main import app
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+@pytest.fixture
+def async_client(client, db):
+    """Test client whose routes get an AsyncSession (DATABASE_ASYNC=true path)"""
+    engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    return client
+
+
+def test_async_database_url():
+    """Sync URLs map onto their asyncio drivers"""
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_database_url("postgresql+psycopg://db/app") == "postgresql+psycopg://db/app"
+
+
+def test_routes_over_async_session(async_client, test_user, make_user):
+    """Recipe, comment, cookbook and messaging routes work on an AsyncSession"""
+    recipient = make_user("friend")
+
+    login = async_client.post("/auth/login", json={"email": "test@mail.uc.edu", "password": "testpass123"})
+    assert login.status_code == 200
+
+    created = async_client.post("/recipes", json={
+        "title": "Async Chili",
+        "description": "Slow cooked",
+        "ingredients": ["beans"],
+        "steps": ["simmer"],
+        "tags": ["dinner"],
+        "time_minutes": 60,
+        "difficulty": "easy",
+        "is_published": True,
+    })
+    assert created.status_code == 201
+    recipe_id = created.json()["id"]
+    assert created.json()["author"]["username"] == "test_user"
+
+    assert async_client.get(f"/recipes/{recipe_id}").json()["author"]["username"] == "test_user"
+    assert async_client.get("/recipes").json()["recipes"][0]["id"] == recipe_id
+    assert async_client.put(f"/recipes/{recipe_id}", json={"title": "Async Chili 2"}).json()["title"] == "Async Chili 2"
+
+    comment = async_client.post(f"/recipes/{recipe_id}/comments", json={"content": "Great"})
+    assert comment.json()["user"]["username"] == "test_user"
+    assert len(async_client.get(f"/recipes/{recipe_id}/comments").json()) == 1
+
+    assert async_client.post(f"/cookbook/{recipe_id}").status_code == 201
+    assert async_client.get("/cookbook").json()[0]["recipe"]["title"] == "Async Chili 2"
+
+    conversation = async_client.post("/conversations", json={
+        "recipient_user_id": recipient.id,
+        "initial_message": "Hi!",
+    }).json()
+    assert {conversation["user_one"]["username"], conversation["user_two"]["username"]} == {"test_user", "friend"}
+    messages = async_client.get(f"/conversations/{conversation['id']}/messages").json()
+    assert [m["content"] for m in messages] == ["Hi!"]
+    with async_client.websocket_connect(f"/conversations/{conversation['id']}/ws") as websocket:
+        async_client.post(f"/conversations/{conversation['id']}/messages", json={"content": "Live"})
+        assert websocket.receive_json()["content"] == "Live"
+
+    assert async_client.delete(f"/recipes/{recipe_id}").status_code == 204
+    assert async_client.get(f"/recipes/{recipe_id}").status_code == 404
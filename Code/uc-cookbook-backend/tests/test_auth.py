@@ -1,3 +1,10 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from app.core.security import PasswordHashPool
+
+
 def test_register_user(client):
     """Test user registration"""
     response = client.post(
@@ -82,3 +89,67 @@ def test_logout(authenticated_client):
     response = authenticated_client.post("/auth/logout")
     assert response.status_code == 200
     assert "message" in response.json()
+
+
+def test_login_hashes_off_the_event_loop(client, test_user):
+    """Password checks run on the hash pool and show up in its stats"""
+    before = client.get("/health/password-hashing").json()["password_hash_pool"]["completed"]
+    client.post("/auth/login", json={"email": "test@mail.uc.edu", "password": "testpass123"})
+    stats = client.get("/health/password-hashing").json()["password_hash_pool"]
+    assert stats["completed"] == before + 1
+    assert stats["queued"] == 0
+    assert stats["active"] == 0
+
+
+def test_password_hash_pool_limits_concurrency_and_queue():
+    """The pool runs at most max_workers hashes and rejects past max_queue"""
+    pool = PasswordHashPool(max_workers=2, max_queue=3)
+    running = []
+    peak = []
+    release = threading.Event()
+
+    def work(i):
+        running.append(i)
+        peak.append(len(running))
+        release.wait(5)
+        running.remove(i)
+        return i
+
+    async def scenario():
+        tasks = [asyncio.create_task(pool.run(work, i)) for i in range(5)]
+        await asyncio.sleep(0.1)
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(work, 99)
+        assert exc.value.status_code == 503
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3, 4]
+    stats = pool.stats()
+    assert max(peak) == 2
+    assert stats["completed"] == 5
+    assert stats["rejected"] == 1
+    assert stats["max_queued"] == 3
+
+
+def test_password_hash_pool_cancelled_caller_leaves_queue():
+    """Cancelling a call still waiting for a worker releases its queue slot"""
+    pool = PasswordHashPool(max_workers=1, max_queue=2)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.create_task(pool.run(release.wait, 5))
+        queued = asyncio.create_task(pool.run(release.wait, 5))
+        await asyncio.sleep(0.1)
+        assert pool.stats()["queued"] == 1
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert pool.stats()["queued"] == 0
+        release.set()
+        await busy
+
+    asyncio.run(scenario())
+    stats = pool.stats()
+    assert stats["queued"] == 0
+    assert stats["active"] == 0
@@ -0,0 +1,82 @@
+import json
+import threading
+import pytest
+from app.core.config import settings
+from app.core.realtime import message_hub
+
+
+@pytest.fixture
+def recipe(test_user, make_recipe):
+    return make_recipe(test_user, "Streamed Recipe")
+
+
+@pytest.fixture
+def short_streams(monkeypatch):
+    """End streams quickly so the test client can read the whole body"""
+    monkeypatch.setattr(settings, "SSE_MAX_STREAM_SECONDS", 0.5)
+    monkeypatch.setattr(settings, "SSE_KEEPALIVE_SECONDS", 0.1)
+
+
+def _events(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for frame in response.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_replays_from_last_event_id(authenticated_client, recipe, short_streams):
+    """Reconnecting with Last-Event-ID replays exactly the missed deltas"""
+    base = f"/recipes/{recipe.id}/comments"
+    first = authenticated_client.post(base, json={"content": "First"}).json()
+    authenticated_client.post(f"{base}/{first['id']}/reactions", json={"emoji": "🔥"})
+    reply = authenticated_client.post(base, json={"content": "Reply", "parent_id": first["id"]}).json()
+    authenticated_client.delete(f"{base}/{first['id']}")
+
+    events = _events(authenticated_client.get(f"{base}/stream", headers={"Last-Event-ID": "1"}))
+
+    assert [(event_id, name) for event_id, name, _ in events] == [
+        (2, "reaction_changed"),
+        (3, "comment_added"),
+        (4, "comment_deleted"),
+    ]
+    reaction = events[0][2]
+    assert reaction["emoji"] == "🔥"
+    assert reaction["reactions"] == [{"emoji": "🔥", "count": 1, "reacted_by_me": False}]
+    assert events[1][2]["parent_id"] == first["id"]
+    assert sorted(events[2][2]["deleted_ids"]) == sorted([first["id"], reply["id"]])
+
+
+def test_stream_resets_when_history_is_gone(authenticated_client, recipe, short_streams):
+    """Unreplayable gaps produce a reset event at the current version"""
+    base = f"/recipes/{recipe.id}/comments"
+    authenticated_client.post(base, json={"content": "One"})
+    authenticated_client.post(base, json={"content": "Two"})
+    message_hub.clear()
+
+    events = _events(authenticated_client.get(f"{base}/stream", headers={"Last-Event-ID": "0"}))
+    assert events == [(2, "reset", {"recipe_id": recipe.id})]
+
+
+def test_stream_pushes_live_changes(authenticated_client, recipe, short_streams):
+    """An open stream receives comments as they are committed"""
+    base = f"/recipes/{recipe.id}/comments"
+    poster = threading.Timer(0.2, authenticated_client.post, args=(base,), kwargs={"json": {"content": "Live"}})
+    poster.start()
+    try:
+        events = _events(authenticated_client.get(f"{base}/stream"))
+    finally:
+        poster.join()
+
+    assert [(event_id, name, data["content"]) for event_id, name, data in events] == [(1, "comment_added", "Live")]
+
+
+def test_stream_respects_visibility(client, test_user, make_recipe):
+    """Private recipes can't be streamed by other users"""
+    private = make_recipe(test_user, "Draft", is_published=False)
+
+    assert client.get(f"/recipes/{private.id}/comments/stream").status_code == 403
+    assert client.get("/recipes/99999/comments/stream").status_code == 404
@@ -0,0 +1,166 @@
+import pytest
+from app.db.models import CommentReaction, CommentReactionCount, Recipe, RecipeComment
+
+
+@pytest.fixture
+def recipe_with_comments(db, make_recipe):
+    """Factory: a recipe by ``author`` with ``count`` top-level comments"""
+    def make(author, count=3):
+        recipe = make_recipe(author, "Reacted Recipe")
+        for i in range(count):
+            db.add(RecipeComment(recipe_id=recipe.id, user_id=author.id, content=f"comment {i}"))
+        db.commit()
+        return recipe
+    return make
+
+
+def _counters(db, comment_id):
+    db.expire_all()
+    rows = db.query(CommentReactionCount).filter(CommentReactionCount.comment_id == comment_id)
+    return {row.emoji: row.count for row in rows}
+
+
+def test_reaction_counters_follow_add_change_and_remove(authenticated_client, db, test_user, recipe_with_comments, make_user):
+    """Counters are kept in step with each reaction write"""
+    recipe = recipe_with_comments(test_user, count=1)
+    comment_id = db.query(RecipeComment.id).filter(RecipeComment.recipe_id == recipe.id).scalar()
+    other = make_user("other")
+    url = f"/recipes/{recipe.id}/comments/{comment_id}/reactions"
+
+    response = authenticated_client.post(url, json={"emoji": "🔥"})
+    assert response.status_code == 200
+    assert response.json()["reactions"] == [{"emoji": "🔥", "count": 1, "reacted_by_me": True}]
+    assert _counters(db, comment_id) == {"🔥": 1}
+
+    # Someone else's reaction counts without marking the viewer
+    db.add(CommentReactionCount(comment_id=comment_id, emoji="👍", count=1))
+    db.commit()
+    response = authenticated_client.post(url, json={"emoji": "👍"})
+    assert response.json()["reactions"] == [
+        {"emoji": "👍", "count": 2, "reacted_by_me": True},
+    ]
+    assert _counters(db, comment_id) == {"👍": 2}
+
+    authenticated_client.post(url, json={"emoji": "👍"})
+    assert _counters(db, comment_id) == {"👍": 1}
+
+
+def test_reacted_by_me_uses_one_lookup_per_page(client, db, test_user, query_counter, recipe_with_comments):
+    """Listing comments reads counters and one viewer lookup, not every reaction row"""
+    recipe = recipe_with_comments(test_user, count=4)
+    comments = db.query(RecipeComment).filter(RecipeComment.recipe_id == recipe.id).all()
+    for comment in comments:
+        db.add(CommentReactionCount(comment_id=comment.id, emoji="🔥", count=50))
+    db.commit()
+    login = client.post("/auth/login", json={"email": "test@mail.uc.edu", "password": "testpass123"})
+    assert login.status_code == 200
+    client.post(f"/recipes/{recipe.id}/comments/{comments[0].id}/reactions", json={"emoji": "🔥"})
+
+    db.expire_all()
+    query_counter.clear()
+    response = client.get(f"/recipes/{recipe.id}/comments")
+    assert response.status_code == 200
+    reactions = [c["reactions"] for c in response.json()]
+    assert reactions[0] == [{"emoji": "🔥", "count": 51, "reacted_by_me": True}]
+    assert all(r == [{"emoji": "🔥", "count": 50, "reacted_by_me": False}] for r in reactions[1:])
+    assert sum("FROM comment_reactions" in s for s in query_counter) == 1
+
+
+def test_put_and_delete_reaction_are_idempotent(authenticated_client, db, test_user, recipe_with_comments):
+    """PUT sets and DELETE clears; repeating either changes nothing"""
+    recipe = recipe_with_comments(test_user, count=1)
+    comment_id = db.query(RecipeComment.id).filter(RecipeComment.recipe_id == recipe.id).scalar()
+    url = f"/recipes/{recipe.id}/comments/{comment_id}/reactions"
+
+    first = authenticated_client.put(url, json={"emoji": "🔥"}).json()
+    assert first == {
+        "comment_id": comment_id,
+        "emoji": "🔥",
+        "reactions": [{"emoji": "🔥", "count": 1, "reacted_by_me": True}],
+    }
+    retry = authenticated_client.put(url, json={"emoji": "🔥"}).json()
+    assert retry["emoji"] == "🔥" and retry["reactions"] == []
+    assert _counters(db, comment_id) == {"🔥": 1}
+
+    changed = authenticated_client.put(url, json={"emoji": "👍"}).json()
+    assert changed["reactions"] == [
+        {"emoji": "👍", "count": 1, "reacted_by_me": True},
+        {"emoji": "🔥", "count": 0, "reacted_by_me": False},
+    ]
+
+    cleared = authenticated_client.delete(url).json()
+    assert cleared["emoji"] is None
+    assert cleared["reactions"] == [{"emoji": "👍", "count": 0, "reacted_by_me": False}]
+    assert authenticated_client.delete(url).json()["reactions"] == []
+    assert _counters(db, comment_id) == {}
+
+    assert authenticated_client.put(url, json={"emoji": "🙃"}).status_code == 400
+
+
+def test_same_put_twice_counts_once(authenticated_client, db, test_user, recipe_with_comments):
+    """A retried PUT derives no counter delta, so the count matches the reaction rows"""
+    recipe = recipe_with_comments(test_user, count=1)
+    comment_id = db.query(RecipeComment.id).filter(RecipeComment.recipe_id == recipe.id).scalar()
+    url = f"/recipes/{recipe.id}/comments/{comment_id}/reactions"
+
+    for _ in range(2):
+        assert authenticated_client.put(url, json={"emoji": "🔥"}).status_code == 200
+
+    assert _counters(db, comment_id) == {"🔥": 1}
+    assert db.query(CommentReaction).filter(CommentReaction.comment_id == comment_id).count() == 1
+
+
+def test_batch_reactions_apply_in_one_transaction(authenticated_client, db, test_user, recipe_with_comments):
+    """A batch returns only the changed comments and is all-or-nothing"""
+    recipe = recipe_with_comments(test_user, count=3)
+    ids = [c.id for c in db.query(RecipeComment).filter(RecipeComment.recipe_id == recipe.id).order_by(RecipeComment.id)]
+    url = f"/recipes/{recipe.id}/comments/reactions/batch"
+    authenticated_client.put(f"/recipes/{recipe.id}/comments/{ids[2]}/reactions", json={"emoji": "😂"})
+
+    response = authenticated_client.post(url, json={"changes": [
+        {"comment_id": ids[0], "emoji": "🔥"},
+        {"comment_id": ids[1], "emoji": "❤️"},
+        {"comment_id": ids[2], "emoji": "😂"},
+    ]})
+    assert response.status_code == 200
+    assert [u["comment_id"] for u in response.json()["updated"]] == ids[:2]
+
+    response = authenticated_client.post(url, json={"changes": [
+        {"comment_id": ids[0], "emoji": None},
+        {"comment_id": 999999, "emoji": "🔥"},
+    ]})
+    assert response.status_code == 404
+    assert _counters(db, ids[0]) == {"🔥": 1}
+
+    response = authenticated_client.post(url, json={"changes": [{"comment_id": ids[1], "emoji": None}]})
+    assert response.json()["updated"] == [{
+        "comment_id": ids[1],
+        "emoji": None,
+        "reactions": [{"emoji": "❤️", "count": 0, "reacted_by_me": False}],
+    }]
+    version = db.query(Recipe.comments_version).filter(Recipe.id == recipe.id).scalar()
+    assert version == 4
+
+
+def test_reconcile_reaction_counts(db, test_user, make_user, recipe_with_comments):
+    """Bulk reconciliation repairs drifted, missing and orphaned reaction counters"""
+    from app.services.comment_service import CommentService
+
+    recipe = recipe_with_comments(test_user, count=3)
+    ids = [c.id for c in db.query(RecipeComment).filter(RecipeComment.recipe_id == recipe.id).order_by(RecipeComment.id)]
+    other = make_user("reactor")
+    db.add_all([
+        CommentReaction(comment_id=ids[0], user_id=test_user.id, emoji="🔥"),
+        CommentReaction(comment_id=ids[0], user_id=other.id, emoji="🔥"),
+        CommentReaction(comment_id=ids[1], user_id=test_user.id, emoji="👍"),
+        CommentReactionCount(comment_id=ids[0], emoji="🔥", count=5),
+        CommentReactionCount(comment_id=ids[2], emoji="😂", count=1),
+    ])
+    db.commit()
+    version = recipe.comments_version
+
+    assert CommentService.reconcile_reaction_counts(db) == 3
+    assert [_counters(db, cid) for cid in ids] == [{"🔥": 2}, {"👍": 1}, {}]
+    db.refresh(recipe)
+    assert recipe.comments_version == version + 1
+    assert CommentService.reconcile_reaction_counts(db) == 0
@@ -0,0 +1,74 @@
+import pytest
+from app.db.models import RecipeComment
+
+
+@pytest.fixture
+def recipe_with_threads(db, make_recipe):
+    """Factory: a recipe by ``author`` with ``top_level`` comments of ``replies`` replies each"""
+    def make(author, top_level=5, replies=4):
+        recipe = make_recipe(author, "Popular Recipe")
+        for i in range(top_level):
+            parent = RecipeComment(recipe_id=recipe.id, user_id=author.id, content=f"top {i}")
+            db.add(parent)
+            db.commit()
+            for j in range(replies):
+                db.add(RecipeComment(recipe_id=recipe.id, user_id=author.id, parent_id=parent.id, content=f"reply {i}.{j}"))
+                db.commit()
+        return recipe
+    return make
+
+
+def test_threads_page_top_level_with_reply_previews(client, test_user, recipe_with_threads):
+    """Top-level comments page by cursor, each with a reply count and preview"""
+    recipe = recipe_with_threads(test_user)
+    url = f"/recipes/{recipe.id}/comments/threads"
+
+    first = client.get(url, params={"limit": 3, "replies": 2}).json()
+    assert [c["content"] for c in first["comments"]] == ["top 0", "top 1", "top 2"]
+    assert all(c["parent_id"] is None for c in first["comments"])
+    assert first["comments"][0]["reply_count"] == 4
+    assert [r["content"] for r in first["comments"][0]["replies"]] == ["reply 0.0", "reply 0.1"]
+
+    second = client.get(url, params={"limit": 3, "replies": 2, "cursor": first["next_cursor"]}).json()
+    assert [c["content"] for c in second["comments"]] == ["top 3", "top 4"]
+    assert second["next_cursor"] is None
+
+
+def test_replies_page_by_cursor(client, db, test_user, recipe_with_threads):
+    """A parent's replies page past the preview, with nested reply counts"""
+    recipe = recipe_with_threads(test_user, top_level=1, replies=5)
+    parent = client.get(f"/recipes/{recipe.id}/comments/threads").json()["comments"][0]
+    nested = RecipeComment(
+        recipe_id=recipe.id,
+        user_id=test_user.id,
+        parent_id=parent["replies"][0]["id"],
+        content="nested",
+    )
+    db.add(nested)
+    db.commit()
+    url = f"/recipes/{recipe.id}/comments/{parent['id']}/replies"
+
+    first = client.get(url, params={"limit": 3}).json()
+    assert [r["content"] for r in first["comments"]] == ["reply 0.0", "reply 0.1", "reply 0.2"]
+    assert first["comments"][0]["reply_count"] == 1
+    rest = client.get(url, params={"limit": 3, "cursor": first["next_cursor"]}).json()
+    assert [r["content"] for r in rest["comments"]] == ["reply 0.3", "reply 0.4"]
+
+    assert client.get(f"/recipes/{recipe.id}/comments/999999/replies").status_code == 404
+
+
+def test_thread_page_query_count_is_bounded(client, db, test_user, query_counter, recipe_with_threads, make_user):
+    """The statements per page don't grow with the size of the thread"""
+    small = recipe_with_threads(test_user, top_level=2, replies=1)
+    other = make_user("other")
+    large = recipe_with_threads(other, top_level=30, replies=8)
+
+    counts = []
+    for recipe in (small, large):
+        db.expire_all()
+        query_counter.clear()
+        response = client.get(f"/recipes/{recipe.id}/comments/threads", params={"limit": 10})
+        assert response.status_code == 200
+        counts.append(len(query_counter))
+
+    assert counts[0] == counts[1]
@@ -201,3 +201,49 @@ def test_remove_recipe_unauthenticated(client, test_user, db):
     
     response = client.delete(f"/cookbook/{recipe.id}")
     assert response.status_code == 401
+
+
+def test_batch_save_and_remove(authenticated_client, test_user, make_user, make_recipe):
+    """Batch saves/removes in one request, ignoring ids already in place"""
+    recipes = [make_recipe(test_user, f"Recipe {i}") for i in range(3)]
+    private = make_recipe(make_user("other"), "Private", is_published=False)
+    ids = [r.id for r in recipes]
+    authenticated_client.post(f"/cookbook/{ids[0]}")
+    
+    response = authenticated_client.post("/cookbook/batch", json={"save": ids + [private.id, 999999]})
+    assert response.status_code == 200
+    assert response.json() == {"saved": ids[1:], "removed": [], "unavailable": sorted([private.id, 999999])}
+    
+    response = authenticated_client.post("/cookbook/batch", json={"save": [ids[0]], "remove": [ids[1], ids[2]]})
+    assert response.json() == {"saved": [], "removed": ids[1:], "unavailable": []}
+    assert [s["recipe_id"] for s in authenticated_client.get("/cookbook").json()] == [ids[0]]
+    
+    response = authenticated_client.post("/cookbook/batch", json={"save": [ids[0]], "remove": [ids[0]]})
+    assert response.status_code == 422
+
+
+def test_cookbook_pages_by_cursor_with_filters(authenticated_client, test_user, make_recipe):
+    """Saves page newest first via X-Next-Cursor and filter by tag/difficulty"""
+    recipes = [
+        make_recipe(
+            test_user,
+            f"Recipe {i}",
+            tags=["soup" if i % 2 else "salad"],
+            difficulty="hard" if i == 4 else "easy",
+        )
+        for i in range(5)
+    ]
+    for recipe in recipes:
+        authenticated_client.post(f"/cookbook/{recipe.id}")
+    
+    first = authenticated_client.get("/cookbook", params={"limit": 3})
+    assert [s["recipe"]["title"] for s in first.json()] == ["Recipe 4", "Recipe 3", "Recipe 2"]
+    rest = authenticated_client.get("/cookbook", params={"limit": 3, "cursor": first.headers["x-next-cursor"]})
+    assert [s["recipe"]["title"] for s in rest.json()] == ["Recipe 1", "Recipe 0"]
+    assert "x-next-cursor" not in rest.headers
+    
+    soups = authenticated_client.get("/cookbook", params={"tag": "soup"}).json()
+    assert [s["recipe"]["title"] for s in soups] == ["Recipe 3", "Recipe 1"]
+    hard = authenticated_client.get("/cookbook", params={"difficulty": "hard"}).json()
+    assert [s["recipe"]["title"] for s in hard] == ["Recipe 4"]
+    assert authenticated_client.get("/cookbook", params={"cursor": "bogus"}).status_code == 400
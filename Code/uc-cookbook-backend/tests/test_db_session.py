@@ -0,0 +1,64 @@
+import threading
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.db.models import Conversation, Message, User
+from app.db.session import Base, create_db_engine
+
+
+def test_every_pooled_connection_is_tuned(tmp_path):
+    """The connect hook tunes each connection the engine opens, not just the first"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pooled.db'}")
+    with engine.connect() as first, engine.connect() as second:
+        for conn in (first, second):
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
+
+
+def test_sqlite_connections_are_tuned(tmp_path):
+    """Every SQLite connection runs in WAL mode with a busy timeout"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+    engine.dispose()
+
+
+def test_concurrent_writers_wait_instead_of_failing(tmp_path):
+    """Parallel message writes queue on the lock rather than raising 'database is locked'"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'writers.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        one = User(email="a@mail.uc.edu", username="a", password_hash="x")
+        two = User(email="b@mail.uc.edu", username="b", password_hash="x")
+        db.add_all([one, two])
+        db.flush()
+        conversation = Conversation(user_one_id=one.id, user_two_id=two.id)
+        db.add(conversation)
+        db.commit()
+        conversation_id, sender_id = conversation.id, one.id
+
+    errors = []
+
+    def writer():
+        try:
+            for _ in range(20):
+                with Session() as db:
+                    db.add(Message(conversation_id=conversation_id, sender_id=sender_id, content="hi"))
+                    db.commit()
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with Session() as db:
+        assert db.query(Message).count() == 160
+    engine.dispose()
@@ -0,0 +1,88 @@
+def test_recipe_detail_conditional_get(client, test_user, make_recipe):
+    """Matching If-None-Match returns 304 for both cache misses and hits"""
+    recipe = make_recipe(test_user)
+
+    first = client.get(f"/recipes/{recipe.id}")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    # Served from the response cache, validated against the stored ETag
+    cached = client.get(f"/recipes/{recipe.id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    mismatch = client.get(f"/recipes/{recipe.id}", headers={"If-None-Match": 'W/"other"'})
+    assert mismatch.status_code == 200
+    assert mismatch.headers["etag"] == etag
+
+
+
+def test_browser_clients_can_read_etag(client, test_user, make_recipe):
+    """CORS exposes ETag so cross-origin clients can send If-None-Match"""
+    from app.core.config import settings
+
+    recipe = make_recipe(test_user)
+    response = client.get(f"/recipes/{recipe.id}", headers={"Origin": settings.cors_origins_list[0]})
+
+    exposed = {h.strip().lower() for h in response.headers["access-control-expose-headers"].split(",")}
+    assert {"etag", "x-next-cursor"} <= exposed
+
+def test_recipe_etag_changes_on_update(authenticated_client, test_user, make_recipe):
+    """Editing a recipe yields a new validator"""
+    recipe = make_recipe(test_user)
+
+    etag = authenticated_client.get(f"/recipes/{recipe.id}").headers["etag"]
+    authenticated_client.put(f"/recipes/{recipe.id}", json={"title": "Renamed"})
+
+    response = authenticated_client.get(f"/recipes/{recipe.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.headers["etag"] != etag
+
+
+def test_comments_conditional_get(authenticated_client, test_user, make_recipe):
+    """Comment list ETag changes when comments or reactions change"""
+    recipe = make_recipe(test_user)
+    url = f"/recipes/{recipe.id}/comments"
+
+    etag = authenticated_client.get(url).headers["etag"]
+    assert authenticated_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    comment = authenticated_client.post(url, json={"content": "Tasty"}).json()
+    after_comment = authenticated_client.get(url, headers={"If-None-Match": etag})
+    assert after_comment.status_code == 200
+    assert len(after_comment.json()) == 1
+
+    etag = after_comment.headers["etag"]
+    authenticated_client.post(f"{url}/{comment['id']}/reactions", json={"emoji": "👍"})
+    after_reaction = authenticated_client.get(url, headers={"If-None-Match": etag})
+    assert after_reaction.status_code == 200
+    assert after_reaction.json()[0]["reactions"][0]["reacted_by_me"] is True
+
+    etag = after_reaction.headers["etag"]
+    authenticated_client.delete(f"{url}/{comment['id']}")
+    after_delete = authenticated_client.get(url, headers={"If-None-Match": etag})
+    assert after_delete.status_code == 200
+    assert after_delete.json() == []
+
+
+def test_cookbook_conditional_get(authenticated_client, test_user, make_recipe):
+    """Cookbook ETag tracks saves and edits to saved recipes"""
+    recipe = make_recipe(test_user)
+
+    etag = authenticated_client.get("/cookbook").headers["etag"]
+    assert authenticated_client.get("/cookbook", headers={"If-None-Match": etag}).status_code == 304
+
+    authenticated_client.post(f"/cookbook/{recipe.id}")
+    saved = authenticated_client.get("/cookbook", headers={"If-None-Match": etag})
+    assert saved.status_code == 200
+    assert len(saved.json()) == 1
+
+    etag = saved.headers["etag"]
+    assert authenticated_client.get("/cookbook", headers={"If-None-Match": etag}).status_code == 304
+
+    authenticated_client.put(f"/recipes/{recipe.id}", json={"title": "Renamed"})
+    edited = authenticated_client.get("/cookbook", headers={"If-None-Match": etag})
+    assert edited.status_code == 200
+    assert edited.json()[0]["recipe"]["title"] == "Renamed"
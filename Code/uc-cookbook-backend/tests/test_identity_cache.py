@@ -0,0 +1,51 @@
+from datetime import timedelta
+from app.core.identity import identity_cache
+
+
+def test_warm_identity_skips_user_lookup(client, test_user, query_counter, auth_headers):
+    """A repeated token resolves without re-selecting the user row"""
+    headers = auth_headers(test_user)
+
+    query_counter.clear()
+    assert client.get("/cookbook", headers=headers).status_code == 200
+    assert any("FROM users" in statement for statement in query_counter)
+
+    query_counter.clear()
+    assert client.get("/cookbook", headers=headers).status_code == 200
+    assert not any("FROM users" in statement for statement in query_counter)
+
+    stats = identity_cache.stats()
+    assert stats["token_hits"] == 1
+    assert stats["user_hits"] == 1
+    assert stats["users"] == 1
+
+
+def test_user_update_invalidates_snapshot(client, test_user, db, auth_headers):
+    """Writing the user row drops its cached snapshot"""
+    headers = auth_headers(test_user)
+    assert client.get("/cookbook", headers=headers).status_code == 200
+    assert identity_cache.get_user(test_user.id).username == "test_user"
+
+    # Flushed but uncommitted (then rolled back) writes keep the snapshot
+    test_user.username = "discarded"
+    db.flush()
+    assert identity_cache.get_user(test_user.id).username == "test_user"
+    db.rollback()
+    assert identity_cache.get_user(test_user.id).username == "test_user"
+
+    test_user.username = "renamed"
+    db.flush()
+    assert identity_cache.get_user(test_user.id) is not None
+    db.commit()
+    assert identity_cache.get_user(test_user.id) is None
+
+    db.delete(test_user)
+    db.commit()
+    assert client.get("/cookbook", headers=headers).status_code == 401
+
+
+def test_expired_token_is_not_served_from_cache(client, test_user, auth_headers):
+    """Cached claims never outlive the token's exp"""
+    expired = auth_headers(test_user, expires_delta=timedelta(seconds=-1))
+    assert client.get("/cookbook", headers=expired).status_code == 401
+    assert identity_cache.stats()["tokens"] == 0
@@ -0,0 +1,173 @@
+import pytest
+from fastapi import status
+from starlette.websockets import WebSocketDisconnect
+from app.core.security import create_access_token
+from app.db.models import Message
+
+
+@pytest.fixture
+def conversation(db, test_user, make_user, make_conversation):
+    """Conversation between test_user and a friend with 10 messages"""
+    conversation = make_conversation(test_user, make_user("friend"))
+    for i in range(10):
+        db.add(Message(conversation_id=conversation.id, sender_id=test_user.id, content=f"m{i}"))
+        db.commit()
+    return conversation
+
+
+def _contents(response):
+    assert response.status_code == 200
+    return [message["content"] for message in response.json()]
+
+
+def test_messages_default_to_latest_page(authenticated_client, conversation):
+    """Without cursors the newest ``limit`` messages come back oldest first"""
+    url = f"/conversations/{conversation.id}/messages"
+
+    assert _contents(authenticated_client.get(url)) == [f"m{i}" for i in range(10)]
+    assert _contents(authenticated_client.get(url, params={"limit": 3})) == ["m7", "m8", "m9"]
+
+
+def test_messages_page_back_with_before(authenticated_client, conversation):
+    """``before`` walks history from the first message of the current page"""
+    url = f"/conversations/{conversation.id}/messages"
+    page = authenticated_client.get(url, params={"limit": 4}).json()
+
+    older = authenticated_client.get(url, params={"before": page[0]["id"], "limit": 4})
+    assert _contents(older) == ["m2", "m3", "m4", "m5"]
+    oldest = authenticated_client.get(url, params={"before": older.json()[0]["id"], "limit": 4})
+    assert _contents(oldest) == ["m0", "m1"]
+
+
+def test_messages_poll_with_after(authenticated_client, conversation):
+    """``after`` returns only messages newer than the last one seen"""
+    url = f"/conversations/{conversation.id}/messages"
+    last_seen = authenticated_client.get(url).json()[-1]["id"]
+
+    assert _contents(authenticated_client.get(url, params={"after": last_seen})) == []
+
+    authenticated_client.post(url, json={"content": "new 1"})
+    authenticated_client.post(url, json={"content": "new 2"})
+    assert _contents(authenticated_client.get(url, params={"after": last_seen})) == ["new 1", "new 2"]
+    assert _contents(authenticated_client.get(url, params={"after": last_seen, "limit": 1})) == ["new 1"]
+
+
+def test_messages_reject_foreign_cursor(authenticated_client, conversation, db, test_user, make_user, make_conversation):
+    """A cursor must be a message of the same conversation"""
+    other = make_user("other")
+    elsewhere = make_conversation(test_user, other)
+    foreign = Message(conversation_id=elsewhere.id, sender_id=other.id, content="elsewhere")
+    db.add(foreign)
+    db.commit()
+
+    response = authenticated_client.get(
+        f"/conversations/{conversation.id}/messages", params={"after": foreign.id}
+    )
+    assert response.status_code == 400
+
+
+def test_websocket_pushes_new_messages(authenticated_client, conversation):
+    """Participants receive each committed message as a MessageResponse frame"""
+    url = f"/conversations/{conversation.id}/messages"
+    with authenticated_client.websocket_connect(f"/conversations/{conversation.id}/ws") as websocket:
+        sent = authenticated_client.post(url, json={"content": "live"}).json()
+        pushed = websocket.receive_json()
+
+    assert pushed == sent
+    assert pushed["sender"]["username"] == "test_user"
+
+
+def test_websocket_accepts_query_token(client, conversation, test_user):
+    """Browser clients authenticate with ?token= since they can't set headers"""
+    token = create_access_token({"sub": str(test_user.id)})
+    with client.websocket_connect(f"/conversations/{conversation.id}/ws?token={token}") as websocket:
+        client.post(
+            f"/conversations/{conversation.id}/messages",
+            json={"content": "via token"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert websocket.receive_json()["content"] == "via token"
+
+
+def test_websocket_rejects_outsiders(client, conversation, make_user):
+    """Anonymous users and non-participants are refused at the handshake"""
+    with pytest.raises(WebSocketDisconnect) as anonymous:
+        with client.websocket_connect(f"/conversations/{conversation.id}/ws"):
+            pass
+    assert anonymous.value.code == status.WS_1008_POLICY_VIOLATION
+
+    token = create_access_token({"sub": str(make_user("outsider").id)})
+    with pytest.raises(WebSocketDisconnect) as forbidden:
+        with client.websocket_connect(f"/conversations/{conversation.id}/ws?token={token}"):
+            pass
+    assert forbidden.value.code == status.WS_1008_POLICY_VIOLATION
+
+
+@pytest.fixture
+def inbox(db, test_user, make_user, make_conversation):
+    """test_user in five conversations, each with one message from the other side"""
+    conversations = []
+    for i in range(5):
+        friend = make_user(f"pal{i}")
+        conversation = make_conversation(test_user, friend)
+        message = Message(conversation_id=conversation.id, sender_id=friend.id, content=f"hello from pal{i} " * 20)
+        db.add(message)
+        db.flush()
+        conversation.updated_at = message.created_at
+        db.commit()
+        conversations.append(conversation)
+    return conversations
+
+
+def test_conversation_list_has_previews_and_unread_counts(authenticated_client, inbox):
+    """Each conversation carries its latest message and the caller's unread count"""
+    conversations = authenticated_client.get("/conversations").json()
+
+    assert [c["id"] for c in conversations] == [c.id for c in reversed(inbox)]
+    newest = conversations[0]
+    assert newest["unread_count"] == 1
+    assert newest["last_message"]["sender"]["username"] == "pal4"
+    assert newest["last_message"]["snippet"].startswith("hello from pal4")
+    assert len(newest["last_message"]["snippet"]) == 140
+
+
+def test_reading_and_replying_clear_unread(authenticated_client, inbox):
+    """Read receipts and the caller's own messages don't count as unread"""
+    first, second = inbox[0], inbox[1]
+
+    marked = authenticated_client.post(f"/conversations/{first.id}/read")
+    assert marked.json()["unread_count"] == 0
+    authenticated_client.post(f"/conversations/{second.id}/messages", json={"content": "hey back"})
+
+    unread = {c["id"]: c["unread_count"] for c in authenticated_client.get("/conversations").json()}
+    assert unread[first.id] == 0
+    assert unread[second.id] == 0
+    assert sum(unread.values()) == 3
+
+    bad = authenticated_client.post(f"/conversations/{first.id}/read", json={"message_id": 999999})
+    assert bad.status_code == 400
+
+
+def test_conversation_list_cursor_pagination(authenticated_client, inbox):
+    """X-Next-Cursor walks the list by (updated_at, id) without repeats"""
+    first_page = authenticated_client.get("/conversations", params={"limit": 2})
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = authenticated_client.get("/conversations", params={"limit": 2, "cursor": cursor})
+    third_page = authenticated_client.get(
+        "/conversations", params={"limit": 2, "cursor": second_page.headers["X-Next-Cursor"]}
+    )
+
+    ids = [c["id"] for page in (first_page, second_page, third_page) for c in page.json()]
+    assert ids == [c.id for c in reversed(inbox)]
+    assert "X-Next-Cursor" not in third_page.headers
+
+
+def test_conversation_list_is_one_query(authenticated_client, inbox, db, query_counter):
+    """Previews and unread counts don't add queries per conversation"""
+    authenticated_client.get("/conversations")  # warm the identity cache
+    db.expire_all()
+    query_counter.clear()
+
+    authenticated_client.get("/conversations")
+
+    assert len(query_counter) == 1
@@ -0,0 +1,89 @@
+import pytest
+from app.db.models import CookbookSave
+
+
+@pytest.fixture
+def forks_by_distinct_authors(make_user, make_recipe):
+    """Factory: ``count`` forks, each with its own author and origin author"""
+    def make(count):
+        authors = [make_user(f"author{i}") for i in range(count * 2)]
+        origins = [make_recipe(authors[i], f"Origin {i}") for i in range(count)]
+        return [
+            make_recipe(
+                authors[count + i],
+                f"Fork {i}",
+                origin_recipe_id=origins[i].id,
+                origin_author_id=origins[i].author_id,
+            )
+            for i in range(count)
+        ]
+    return make
+
+
+def _statements(client, db, query_counter, url, **kwargs):
+    db.expire_all()
+    query_counter.clear()
+    response = client.get(url, **kwargs)
+    assert response.status_code == 200
+    return len(query_counter), response
+
+
+def test_feed_loads_authors_in_fixed_queries(client, db, query_counter, forks_by_distinct_authors):
+    """COUNT + page + one IN query per author relationship, whatever the page size"""
+    forks_by_distinct_authors(10)
+
+    small, _ = _statements(client, db, query_counter, "/recipes?limit=2")
+    large, response = _statements(client, db, query_counter, "/recipes?limit=20")
+
+    assert small == large == 4
+    page = response.json()["recipes"]
+    assert len(page) == 20
+    assert all(recipe["author"] for recipe in page)
+    assert all(recipe["origin_author"] for recipe in page if recipe["origin_recipe_id"])
+
+
+def test_feed_saved_state_is_one_query(client, test_user, db, query_counter, forks_by_distinct_authors, auth_headers):
+    """A cached feed page costs an authenticated caller one IN query for is_saved and counters"""
+    headers = auth_headers(test_user)
+    forks = forks_by_distinct_authors(5)
+    db.add(CookbookSave(user_id=test_user.id, recipe_id=forks[2].id))
+    db.commit()
+    assert all(r["is_saved"] is None for r in client.get("/recipes").json()["recipes"])
+    client.get("/recipes", headers=headers)  # warm the identity cache
+
+    count, response = _statements(client, db, query_counter, "/recipes", headers=headers)
+
+    assert count == 1
+    assert "cookbook_saves" in query_counter[0]
+    saved = {r["id"]: r["is_saved"] for r in response.json()["recipes"]}
+    assert saved[forks[2].id] is True
+    assert sum(saved.values()) == 1
+
+
+def test_recipe_detail_is_one_query(client, db, query_counter, forks_by_distinct_authors):
+    """Detail joins author and origin author into a single SELECT"""
+    fork = forks_by_distinct_authors(1)[0]
+
+    count, response = _statements(client, db, query_counter, f"/recipes/{fork.id}")
+
+    assert count == 1
+    assert response.json()["origin_author"]["username"] == "author0"
+
+
+def test_cookbook_loads_in_fixed_queries(client, test_user, db, query_counter, forks_by_distinct_authors, auth_headers):
+    """A full cookbook costs the same statements as a single save"""
+    headers = auth_headers(test_user)
+    forks = forks_by_distinct_authors(8)
+    db.add(CookbookSave(user_id=test_user.id, recipe_id=forks[0].id))
+    db.commit()
+    client.get("/cookbook", headers=headers)  # warm the identity cache
+
+    one, _ = _statements(client, db, query_counter, "/cookbook", headers=headers)
+
+    db.add_all(CookbookSave(user_id=test_user.id, recipe_id=fork.id) for fork in forks[1:])
+    db.commit()
+    many, response = _statements(client, db, query_counter, "/cookbook", headers=headers)
+
+    assert one == many
+    assert len(response.json()) == 8
+    assert all(save["recipe"]["author"] for save in response.json())
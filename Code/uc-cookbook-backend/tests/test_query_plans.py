@@ -0,0 +1,149 @@
+import re
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app.core.pagination import encode_cursor
+from app.db.models import Message, RecipeComment
+from app.schemas.recipe import RecipeSortEnum, TagMatchEnum
+from app.services.comment_service import CommentService
+from app.services.cookbook_service import CookbookService
+from app.services.messaging_service import MessagingService
+from app.services.recipe_service import RecipeService
+from tests.conftest import engine
+
+FULL_SCAN = re.compile(r"^SCAN (recipes|recipe_tags)\b(?! VIRTUAL TABLE)")
+
+
+@contextmanager
+def capture_selects():
+    """Collect (statement, parameters) for every SELECT issued inside the block"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def query_plan(db, statement, parameters):
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"difficulty": "easy"},
+        {"tags": ["vegan"]},
+        {"tags": ["vegan", "quick"], "tag_mode": TagMatchEnum.all},
+        {"tags": ["vegan"], "difficulty": "medium"},
+        {"search": "pasta"},
+        {"search": "pasta", "difficulty": "hard"},
+        {"search": "pasta", "tags": ["vegan"], "difficulty": "easy"},
+        {"sort": RecipeSortEnum.most_forked},
+        {"sort": RecipeSortEnum.most_forked, "difficulty": "easy"},
+        {"sort": RecipeSortEnum.most_saved},
+        {"sort": RecipeSortEnum.most_discussed},
+        {"sort": RecipeSortEnum.popular},
+        {"include_total": False, "limit": 50},
+        {"cursor": encode_cursor("2026-01-01T00:00:00", 10)},
+    ],
+)
+def test_feed_queries_use_indexes(db, filters):
+    """Feed queries never fall back to a full scan or a sort of the whole table"""
+    with capture_selects() as selects:
+        RecipeService.get_recipes(db, **filters)
+
+    assert selects
+    for statement, parameters in selects:
+        plan = query_plan(db, statement, parameters)
+        assert not [step for step in plan if FULL_SCAN.match(step)], plan
+        assert "USE TEMP B-TREE FOR ORDER BY" not in plan, plan
+
+
+@pytest.mark.parametrize("cursors", [{}, {"before": 5}, {"after": 5}])
+def test_message_pages_use_index(db, cursors, make_user, make_conversation):
+    """Message pages read ix_messages_conversation_created_id instead of sorting"""
+    users = [make_user(f"u{i}") for i in range(2)]
+    conversation = make_conversation(*users)
+    db.add_all(Message(conversation_id=conversation.id, sender_id=users[0].id, content="hi") for _ in range(10))
+    db.commit()
+
+    with capture_selects() as selects:
+        MessagingService.list_messages(db, conversation.id, limit=3, **cursors)
+
+    page_query = selects[-1]
+    plan = query_plan(db, *page_query)
+    assert any("ix_messages_conversation_created_id" in step for step in plan), plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan, plan
+
+
+def test_conversation_list_uses_indexes(db, make_user):
+    """Both participant branches, previews and unread counts are index seeks"""
+    user = make_user("reader")
+
+    with capture_selects() as selects:
+        MessagingService.list_conversations(db, user, cursor=encode_cursor("2026-01-01T00:00:00", 10))
+
+    plan = query_plan(db, *selects[-1])
+    assert not [step for step in plan if re.match(r"SCAN (conversations|messages)\b", step)], plan
+    assert "MULTI-INDEX OR" not in plan, plan
+    for index in (
+        "ix_conversations_user_one_updated",
+        "ix_conversations_user_two_updated",
+        "ix_messages_conversation_created_id",
+        "ix_messages_conversation_unread",
+    ):
+        assert any(index in step for step in plan), (index, plan)
+    # Only the final merge of the two pre-cut branches is sorted
+    assert plan.count("USE TEMP B-TREE FOR ORDER BY") == 1, plan
+
+
+def test_sent_messages_use_sender_index(db):
+    """Loading a user's sent messages (and cascading deletes) seeks ix_messages_sender_id"""
+    with capture_selects() as selects:
+        db.query(Message).filter(Message.sender_id == 1).all()
+
+    plan = query_plan(db, *selects[-1])
+    assert any("ix_messages_sender_id" in step for step in plan), plan
+
+
+def test_comment_thread_pages_use_index(db, make_user, make_recipe):
+    """Top-level pages, reply previews, reply counts and reply pages seek ix_recipe_comments_thread"""
+    user = make_user("commenter")
+    recipe = make_recipe(user, "Threads")
+    parent = RecipeComment(recipe_id=recipe.id, user_id=user.id, content="top")
+    db.add(parent)
+    db.commit()
+    db.add(RecipeComment(recipe_id=recipe.id, user_id=user.id, parent_id=parent.id, content="reply"))
+    db.commit()
+
+    with capture_selects() as selects:
+        CommentService.list_threads(db, recipe.id, None)
+        CommentService.list_replies(db, recipe.id, parent.id, None)
+
+    thread_queries = [s for s in selects if "WHERE recipe_comments.recipe_id" in s[0]]
+    assert len(thread_queries) >= 4
+    for statement, parameters in thread_queries:
+        plan = query_plan(db, statement, parameters)
+        assert not [step for step in plan if step.startswith("SCAN recipe_comments")], plan
+        assert any("ix_recipe_comments_thread" in step for step in plan), plan
+
+
+@pytest.mark.parametrize("cursor", [None, encode_cursor("2026-01-01T00:00:00", 10)])
+def test_cookbook_pages_use_index(db, cursor, make_user):
+    """Cookbook pages walk ix_cookbook_saves_user_created without a sort step"""
+    user = make_user("saver")
+
+    with capture_selects() as selects:
+        CookbookService.get_saved_recipes(db, user, limit=10, cursor=cursor)
+
+    plan = query_plan(db, *selects[0])
+    assert any("ix_cookbook_saves_user_created" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -0,0 +1,112 @@
+import time
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.api import deps, middleware
+from app.api.deps import get_read_db
+from app.db.replicas import PINNED, REPLICA, ReadReplicaRouter
+from app.db.session import create_db_engine
+from app.main import app
+from tests.conftest import TestingSessionLocal, engine as primary_engine
+
+
+@pytest.fixture
+def replica(client, db, tmp_path, monkeypatch):
+    """Second SQLite file standing in for a replica; call .sync() to replicate"""
+    replica_engine = create_db_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    ReplicaSession = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    router = ReadReplicaRouter(TestingSessionLocal, [ReplicaSession], window_seconds=0.5)
+    monkeypatch.setattr(deps, "replica_router", router)
+    monkeypatch.setattr(middleware, "replica_router", router)
+    app.dependency_overrides.pop(get_read_db)
+
+    def sync():
+        source = primary_engine.raw_connection()
+        target = replica_engine.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            target.close()
+            source.close()
+
+    router.sync = sync
+    yield router
+    replica_engine.dispose()
+
+
+def _recipe_payload(title):
+    return {
+        "title": title,
+        "description": "Replicated",
+        "ingredients": ["ingredient"],
+        "steps": ["step"],
+        "time_minutes": 10,
+        "difficulty": "easy",
+        "is_published": True,
+    }
+
+
+def test_round_robin_across_replicas():
+    """Reads alternate between replicas; recent writers stay on the primary"""
+    router = ReadReplicaRouter("primary", ["r1", "r2"], window_seconds=60)
+    assert [router.read_session_factory() for _ in range(4)] == ["r1", "r2", "r1", "r2"]
+    marker = router.write_marker(7)
+    assert router.read_session_factory(7, marker) == "primary"
+    assert router.read_session_factory(8, marker) == "r1"
+    assert ReadReplicaRouter("primary").read_session_factory(7, marker) == "primary"
+
+
+def test_write_marker_is_shared_signed_and_short_lived():
+    """Any worker honours a fresh marker; forged, foreign or expired ones are ignored"""
+    worker_a = ReadReplicaRouter("primary", ["r1"], window_seconds=5)
+    worker_b = ReadReplicaRouter("primary", ["r1"], window_seconds=5)
+    marker = worker_a.write_marker(7)
+
+    assert worker_b.read_route(7, marker) == PINNED
+    assert worker_b.read_route(8, marker) == REPLICA
+    assert worker_b.read_route(7, marker.replace("7.", "8.", 1)) == REPLICA
+    assert worker_b.read_route(7, "garbage") == REPLICA
+    assert worker_b.read_route(7, worker_a.write_marker(7, time.time() - 10)) == REPLICA
+
+
+def test_reads_use_replica_with_read_your_writes(client, test_user, replica, auth_headers):
+    """Writers see their own writes immediately; others see the replica's state"""
+    replica.sync()
+    headers = auth_headers(test_user)
+
+    created = client.post("/recipes", json=_recipe_payload("Fresh"), headers=headers)
+    assert created.status_code == 201
+    recipe_id = created.json()["id"]
+
+    # Replica hasn't caught up: anonymous readers don't see it yet
+    assert client.get(f"/recipes/{recipe_id}").status_code == 404
+    # The writer is pinned to the primary for the stickiness window
+    assert client.get(f"/recipes/{recipe_id}", headers=headers).json()["title"] == "Fresh"
+
+    replica.sync()
+    assert client.get(f"/recipes/{recipe_id}").json()["title"] == "Fresh"
+
+    # Once the window passes, the writer reads from the replica again
+    client.put(f"/recipes/{recipe_id}", json={"title": "Edited"}, headers=headers)
+    time.sleep(0.6)
+    assert client.get(f"/recipes/{recipe_id}", headers=headers).json()["title"] == "Fresh"
+    replica.sync()
+    assert client.get(f"/recipes/{recipe_id}", headers=headers).json()["title"] == "Edited"
+
+
+def test_response_cache_not_filled_from_stale_replica(client, test_user, replica, auth_headers):
+    """A lagging replica's pages aren't cached over a write, and writers bypass the cache"""
+    headers = auth_headers(test_user)
+    recipe_id = client.post("/recipes", json=_recipe_payload("Fresh"), headers=headers).json()["id"]
+    replica.sync()
+
+    client.put(f"/recipes/{recipe_id}", json={"title": "Edited"}, headers=headers)
+
+    # Anonymous reads hit the stale replica; their pages must not be kept
+    assert client.get("/recipes").json()["recipes"][0]["title"] == "Fresh"
+    assert client.get(f"/recipes/{recipe_id}").json()["title"] == "Fresh"
+    # The writer reads the primary, never a shared page from before the edit
+    assert client.get("/recipes", headers=headers).json()["recipes"][0]["title"] == "Edited"
+
+    replica.sync()
+    assert client.get("/recipes").json()["recipes"][0]["title"] == "Edited"
+    assert client.get(f"/recipes/{recipe_id}").json()["title"] == "Edited"
@@ -0,0 +1,124 @@
+import asyncio
+from app.core.realtime import Broker, LocalBroker, MessageHub, RedisBroker
+
+
+class SharedBus(Broker):
+    """Stand-in for Redis: every hub attached to the bus sees every publish"""
+
+    def __init__(self):
+        self.deliveries = []
+
+    async def start(self, deliver):
+        self.deliveries.append(deliver)
+
+    async def publish(self, channel, payload):
+        for deliver in self.deliveries:
+            deliver(channel, payload)
+
+
+def test_local_hub_fans_out_to_channel_subscribers():
+    """Every subscriber of a channel gets the payload; other channels don't"""
+    hub = MessageHub(LocalBroker())
+
+    async def scenario():
+        async with hub.subscribe("a") as first, hub.subscribe("a") as second, hub.subscribe("b") as other:
+            await hub.publish("a", "hello")
+            received = [await first.get(), await second.get()]
+            assert other._queue.empty()
+            return received, hub.stats()
+
+    received, stats = asyncio.run(scenario())
+    assert received == ["hello", "hello"]
+    assert stats["published"] == 1 and stats["delivered"] == 2
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_hubs_share_events_through_broker():
+    """A publish on one worker's hub reaches subscribers on another's"""
+    bus = SharedBus()
+    worker_one = MessageHub(bus)
+    worker_two = MessageHub(bus)
+
+    async def scenario():
+        async with worker_two.subscribe("conversation:1") as subscription:
+            await worker_one.publish("conversation:1", "from worker one")
+            return await asyncio.wait_for(subscription.get(), 1)
+
+    assert asyncio.run(scenario()) == "from worker one"
+
+
+def test_slow_subscriber_is_flagged_lagged():
+    """A full queue marks the subscriber lagged instead of growing"""
+    hub = MessageHub(LocalBroker(), queue_size=2)
+
+    async def scenario():
+        async with hub.subscribe("a") as subscription:
+            for i in range(3):
+                await hub.publish("a", str(i))
+            return subscription.lagged
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_publish_survives_broker_errors():
+    """A failing broker is counted, not raised to the committed write"""
+    class DownBroker(LocalBroker):
+        async def publish(self, channel, payload):
+            raise ConnectionError("broker unavailable")
+
+    hub = MessageHub(DownBroker())
+    asyncio.run(hub.publish("a", "lost"))
+    assert hub.stats()["publish_errors"] == 1
+
+
+class FlakyRedis:
+    """redis.asyncio stand-in whose first pub/sub connection drops"""
+
+    def __init__(self):
+        self.connections = 0
+        self.queues = []
+
+    def pubsub(self):
+        self.connections += 1
+        return FlakyPubSub(self, broken=self.connections == 1)
+
+    async def publish(self, channel, payload):
+        for queue in self.queues:
+            queue.put_nowait({"type": "pmessage", "channel": channel.encode(), "data": payload.encode()})
+
+
+class FlakyPubSub:
+    def __init__(self, client, broken):
+        self.client = client
+        self.broken = broken
+        self.queue = asyncio.Queue()
+
+    async def psubscribe(self, pattern):
+        self.client.queues.append(self.queue)
+
+    async def listen(self):
+        if self.broken:
+            raise ConnectionError("connection reset")
+        while True:
+            yield await self.queue.get()
+
+    async def close(self):
+        self.client.queues.remove(self.queue)
+
+
+def test_redis_broker_resubscribes_after_connection_failure(caplog):
+    """A dropped pub/sub connection is logged and resubscribed, then delivery resumes"""
+    client = FlakyRedis()
+    hub = MessageHub(RedisBroker(client, reconnect_delay=0.01))
+
+    async def scenario():
+        async with hub.subscribe("a") as subscription:
+            while client.connections < 2:
+                await asyncio.sleep(0.01)
+            await hub.publish("a", "after reconnect")
+            received = await asyncio.wait_for(subscription.get(), 1)
+        await hub.close()
+        return received
+
+    assert asyncio.run(scenario()) == "after reconnect"
+    assert "reconnecting" in caplog.text
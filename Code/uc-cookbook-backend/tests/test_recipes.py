@@ -192,3 +192,335 @@ def test_pagination(client, authenticated_client, test_user, db):
     data = response.json()
     assert len(data["recipes"]) == 10
     assert data["offset"] == 10
+
+
+def test_search_matches_ingredients_and_tags(client, test_user, db):
+    """Full-text search covers ingredients and tags, not just title/description"""
+    db.add(Recipe(
+        title="Weeknight Curry",
+        description="Warm and quick",
+        ingredients=["chickpeas", "coconut milk"],
+        steps=["simmer"],
+        tags=["vegan"],
+        time_minutes=25,
+        difficulty="easy",
+        is_published=True,
+        author_id=test_user.id
+    ))
+    db.add(Recipe(
+        title="Plain Toast",
+        description="Bread, toasted",
+        ingredients=["bread"],
+        steps=["toast"],
+        tags=["breakfast"],
+        time_minutes=5,
+        difficulty="easy",
+        is_published=True,
+        author_id=test_user.id
+    ))
+    db.commit()
+
+    data = client.get("/recipes?search=coconut").json()
+    assert [r["title"] for r in data["recipes"]] == ["Weeknight Curry"]
+    assert data["total"] == 1
+
+    data = client.get("/recipes?search=vegan").json()
+    assert [r["title"] for r in data["recipes"]] == ["Weeknight Curry"]
+
+    # Prefix matching for search-as-you-type
+    data = client.get("/recipes?search=chick").json()
+    assert data["total"] == 1
+
+
+def test_search_index_follows_updates_and_deletes(authenticated_client):
+    """Index is kept in sync on create, update and delete"""
+    created = authenticated_client.post("/recipes", json={
+        "title": "Lemon Bars",
+        "description": "Tangy dessert",
+        "ingredients": ["lemons", "butter"],
+        "steps": ["bake"],
+        "tags": ["dessert"],
+        "time_minutes": 60,
+        "difficulty": "medium",
+        "is_published": True
+    }).json()
+
+    assert authenticated_client.get("/recipes?search=lemon").json()["total"] == 1
+
+    authenticated_client.put(f"/recipes/{created['id']}", json={"title": "Lime Bars", "ingredients": ["limes"]})
+    assert authenticated_client.get("/recipes?search=lemon").json()["total"] == 0
+    assert authenticated_client.get("/recipes?search=lime").json()["total"] == 1
+
+    authenticated_client.delete(f"/recipes/{created['id']}")
+    assert authenticated_client.get("/recipes?search=lime").json()["total"] == 0
+
+
+def test_search_sort_by_relevance(client, test_user, db):
+    """sort=relevance orders by BM25 rank instead of recency"""
+    db.add(Recipe(
+        title="Garlic Bread",
+        description="Garlic garlic garlic",
+        ingredients=["garlic", "bread"],
+        steps=["bake"],
+        tags=["garlic"],
+        time_minutes=15,
+        difficulty="easy",
+        is_published=True,
+        author_id=test_user.id
+    ))
+    db.commit()
+    db.add(Recipe(
+        title="Tomato Soup",
+        description="Hint of garlic",
+        ingredients=["tomatoes"],
+        steps=["simmer"],
+        tags=["soup"],
+        time_minutes=30,
+        difficulty="easy",
+        is_published=True,
+        author_id=test_user.id
+    ))
+    db.commit()
+
+    newest = client.get("/recipes?search=garlic").json()["recipes"]
+    assert newest[0]["title"] == "Tomato Soup"
+
+    relevant = client.get("/recipes?search=garlic&sort=relevance").json()["recipes"]
+    assert relevant[0]["title"] == "Garlic Bread"
+
+
+def test_search_without_tokens_returns_nothing(client):
+    """Punctuation-only input does not reach the FTS parser"""
+    response = client.get('/recipes?search="*(')
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+
+def test_list_fork_counts(authenticated_client, test_user, make_recipe):
+    """fork_count is reported for every recipe on a list page"""
+    original = make_recipe(test_user, "Original")
+    authenticated_client.post("/recipes", json=_fork_payload(original))
+    authenticated_client.post("/recipes", json=_fork_payload(original))
+
+    data = authenticated_client.get("/recipes").json()
+    counts = sorted(r["fork_count"] for r in data["recipes"])
+    assert counts == [0, 0, 2]
+
+    assert authenticated_client.get(f"/recipes/{original.id}").json()["fork_count"] == 2
+
+
+def test_list_query_count_is_constant(client, test_user, db, query_counter, make_recipe):
+    """Listing runs the same number of statements regardless of page size"""
+    original = make_recipe(test_user, "Original")
+    for i in range(12):
+        make_recipe(test_user, f"Fork {i}", origin_recipe_id=original.id)
+
+    db.expire_all()
+    query_counter.clear()
+    assert len(client.get("/recipes?limit=2").json()["recipes"]) == 2
+    small_page = len(query_counter)
+
+    db.expire_all()
+    query_counter.clear()
+    assert len(client.get("/recipes?limit=13").json()["recipes"]) == 13
+    large_page = len(query_counter)
+
+    assert small_page == large_page
+
+
+def _fork_payload(origin):
+    return {
+        "title": f"Fork of {origin.title}",
+        "description": "Forked",
+        "ingredients": ["ingredient"],
+        "steps": ["step"],
+        "tags": [],
+        "time_minutes": 20,
+        "difficulty": "easy",
+        "is_published": True,
+        "origin_recipe_id": origin.id,
+        "origin_author_id": origin.author_id
+    }
+
+
+def test_fork_count_maintained_on_create_and_delete(authenticated_client, test_user, db, make_recipe):
+    """Creating and deleting forks keeps the persisted counter in step"""
+    original = make_recipe(test_user, "Original")
+
+    fork = authenticated_client.post("/recipes", json=_fork_payload(original)).json()
+    authenticated_client.post("/recipes", json=_fork_payload(original))
+    db.refresh(original)
+    assert original.fork_count == 2
+    assert authenticated_client.get(f"/recipes/{original.id}").json()["fork_count"] == 2
+
+    authenticated_client.delete(f"/recipes/{fork['id']}")
+    db.refresh(original)
+    assert original.fork_count == 1
+
+
+def test_sort_most_forked(authenticated_client, test_user, make_recipe):
+    """sort=most_forked orders by the persisted counter"""
+    popular = make_recipe(test_user, "Popular")
+    make_recipe(test_user, "Newer")
+    authenticated_client.post("/recipes", json=_fork_payload(popular))
+
+    titles = [r["title"] for r in authenticated_client.get("/recipes?sort=most_forked").json()["recipes"]]
+    assert titles[0] == "Popular"
+
+
+def test_reconcile_fork_counts(test_user, db, make_recipe):
+    """Bulk reconciliation repairs drifted counters"""
+    from app.services.recipe_service import RecipeService
+
+    original = make_recipe(test_user, "Original")
+    make_recipe(test_user, "Fork", origin_recipe_id=original.id)
+    original.fork_count = 7
+    db.commit()
+
+    assert RecipeService.reconcile_fork_counts(db) == 1
+    db.refresh(original)
+    assert original.fork_count == 1
+    assert RecipeService.reconcile_fork_counts(db) == 0
+
+
+def test_cursor_pagination_walks_feed(client, test_user, make_recipe):
+    """next_cursor pages through the feed without gaps or duplicates"""
+    from datetime import datetime
+
+    same_instant = datetime(2026, 1, 1, 12, 0, 0)
+    for i in range(7):
+        # Ties on created_at are broken by id
+        if i < 4:
+            make_recipe(test_user, f"Recipe {i}", created_at=same_instant)
+        else:
+            make_recipe(test_user, f"Recipe {i}")
+
+    seen = []
+    response = client.get("/recipes?limit=3&include_total=false").json()
+    assert response["total"] is None
+    seen.extend(r["id"] for r in response["recipes"])
+    while response["next_cursor"]:
+        response = client.get(f"/recipes?limit=3&include_total=false&cursor={response['next_cursor']}").json()
+        seen.extend(r["id"] for r in response["recipes"])
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    offset_ids = [r["id"] for r in client.get("/recipes?limit=7").json()["recipes"]]
+    assert seen == offset_ids
+
+
+def test_cursor_rejected_when_invalid_or_unsupported(client, test_user, make_recipe):
+    """Malformed cursors and cursors on non-recency sorts return 400"""
+    for i in range(3):
+        make_recipe(test_user, f"Recipe {i}")
+
+    assert client.get("/recipes?cursor=not-a-cursor").status_code == 400
+
+    cursor = client.get("/recipes?limit=1").json()["next_cursor"]
+    assert cursor
+    assert client.get(f"/recipes?cursor={cursor}&sort=most_forked").status_code == 400
+
+
+def test_tag_filter_is_exact(client, test_user, make_recipe):
+    """Tag filters match whole tags only ("pasta" does not match "pasta-salad")"""
+    make_recipe(test_user, "Carbonara", tags=["pasta", "italian"])
+    make_recipe(test_user, "Cold Salad", tags=["pasta-salad"])
+
+    titles = [r["title"] for r in client.get("/recipes?tag=pasta").json()["recipes"]]
+    assert titles == ["Carbonara"]
+
+
+def test_multi_tag_filter_any_and_all(client, test_user, make_recipe):
+    """Repeated tag parameters combine with OR by default, AND with tag_mode=all"""
+    make_recipe(test_user, "Carbonara", tags=["pasta", "italian"])
+    make_recipe(test_user, "Pho", tags=["soup", "vietnamese"])
+    make_recipe(test_user, "Minestrone", tags=["soup", "italian"])
+
+    any_titles = {r["title"] for r in client.get("/recipes?tag=pasta&tag=soup").json()["recipes"]}
+    assert any_titles == {"Carbonara", "Pho", "Minestrone"}
+
+    all_titles = {r["title"] for r in client.get("/recipes?tag=soup&tag=italian&tag_mode=all").json()["recipes"]}
+    assert all_titles == {"Minestrone"}
+
+
+def test_tag_index_follows_updates(authenticated_client):
+    """Updating a recipe's tags rewrites its recipe_tags rows"""
+    created = authenticated_client.post("/recipes", json={
+        "title": "Pancakes",
+        "description": "Fluffy",
+        "ingredients": ["flour"],
+        "steps": ["fry"],
+        "tags": ["breakfast", "sweet"],
+        "time_minutes": 20,
+        "difficulty": "easy",
+        "is_published": True
+    }).json()
+    assert authenticated_client.get("/recipes?tag=sweet").json()["total"] == 1
+
+    authenticated_client.put(f"/recipes/{created['id']}", json={"tags": ["breakfast", "brunch"]})
+    assert authenticated_client.get("/recipes?tag=sweet").json()["total"] == 0
+    assert authenticated_client.get("/recipes?tag=brunch").json()["total"] == 1
+
+
+def test_tag_counts(client, test_user, make_recipe):
+    """GET /tags counts public recipes per tag"""
+    make_recipe(test_user, "Carbonara", tags=["pasta", "italian"])
+    make_recipe(test_user, "Minestrone", tags=["soup", "italian"])
+    make_recipe(test_user, "Secret", tags=["italian"], is_published=False)
+
+    data = client.get("/tags").json()
+    assert data[0] == {"tag": "italian", "count": 2}
+    assert {"tag": "pasta", "count": 1} in data
+
+
+def test_save_and_comment_counts_maintained(authenticated_client, test_user, db, make_recipe):
+    """Saves, removals, comments and thread deletions keep the counters in step"""
+    recipe = make_recipe(test_user, "Counted")
+
+    authenticated_client.post(f"/cookbook/{recipe.id}")
+    parent = authenticated_client.post(f"/recipes/{recipe.id}/comments", json={"content": "top"}).json()
+    authenticated_client.post(f"/recipes/{recipe.id}/comments", json={"content": "reply", "parent_id": parent["id"]})
+    authenticated_client.post(f"/recipes/{recipe.id}/comments", json={"content": "other"})
+    db.refresh(recipe)
+    assert (recipe.save_count, recipe.comment_count) == (1, 3)
+    detail = authenticated_client.get(f"/recipes/{recipe.id}").json()
+    assert (detail["save_count"], detail["comment_count"]) == (1, 3)
+
+    authenticated_client.delete(f"/recipes/{recipe.id}/comments/{parent['id']}")
+    authenticated_client.post("/cookbook/batch", json={"remove": [recipe.id]})
+    db.refresh(recipe)
+    assert (recipe.save_count, recipe.comment_count) == (0, 1)
+
+
+def test_sort_by_engagement(authenticated_client, test_user, make_recipe):
+    """most_saved, most_discussed and popular order by the persisted counters"""
+    saved = make_recipe(test_user, "Saved")
+    discussed = make_recipe(test_user, "Discussed")
+    make_recipe(test_user, "Newest")
+    authenticated_client.post(f"/cookbook/{saved.id}")
+    for content in ("one", "two"):
+        authenticated_client.post(f"/recipes/{discussed.id}/comments", json={"content": content})
+
+    def first(sort):
+        return authenticated_client.get(f"/recipes?sort={sort}").json()["recipes"][0]["title"]
+
+    assert first("most_saved") == "Saved"
+    assert first("most_discussed") == "Discussed"
+    assert first("popular") == "Discussed"
+
+
+def test_reconcile_engagement_counts(test_user, db, make_recipe):
+    """Bulk reconciliation repairs drifted save and comment counters"""
+    from app.db.models import CookbookSave, RecipeComment
+    from app.services.recipe_service import RecipeService
+
+    recipe = make_recipe(test_user, "Drifted")
+    db.add(CookbookSave(user_id=test_user.id, recipe_id=recipe.id))
+    db.add(RecipeComment(recipe_id=recipe.id, user_id=test_user.id, content="raw insert"))
+    recipe.comment_count = 5
+    db.commit()
+
+    assert RecipeService.reconcile_engagement_counts(db) == {"save_count": 1, "comment_count": 1}
+    db.refresh(recipe)
+    assert (recipe.save_count, recipe.comment_count) == (1, 1)
+    assert RecipeService.reconcile_engagement_counts(db) == {"save_count": 0, "comment_count": 0}
@@ -0,0 +1,163 @@
+import fnmatch
+import time
+from app.core.cache import (
+    CachedResponse,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    response_cache,
+)
+
+
+class FakeRedis:
+    """Local stand-in implementing the redis-py calls RedisCacheBackend uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            return None
+        payload, expires_at = value
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return payload
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+def test_memory_backend_lru_and_ttl():
+    """Memory backend evicts least-recently-used entries and expires by TTL"""
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    assert backend.get("a") == b"1"
+    backend.set("c", b"3")
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+
+    backend.set("short", b"x", ttl=1)
+    backend._entries["short"] = (time.monotonic() - 1, b"x")
+    assert backend.get("short") is None
+
+
+def test_redis_backend_with_local_stand_in():
+    """The Redis backend works against any redis-py compatible client"""
+    cache = ResponseCache(RedisCacheBackend(FakeRedis()), ttl=30)
+    key = cache.list_key({"limit": 20})
+    assert cache.get(key) is None
+
+    cache.set(key, CachedResponse(body=b'{"ok":true}', headers={"X-Test": "1"}))
+    hit = cache.get(key)
+    assert hit.body == b'{"ok":true}'
+    assert hit.headers == {"X-Test": "1"}
+
+    cache.invalidate_recipe(1)
+    assert cache.get(cache.list_key({"limit": 20})) is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_anonymous_recipe_detail_is_cached(client, test_user, make_recipe):
+    """Second anonymous detail request is served from cache"""
+    recipe = make_recipe(test_user)
+
+    first = client.get(f"/recipes/{recipe.id}")
+    second = client.get(f"/recipes/{recipe.id}")
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+
+    stats = response_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_recipe_list_is_cached_per_params(client, test_user, make_recipe):
+    """List pages are cached per normalized query parameters"""
+    make_recipe(test_user)
+
+    client.get("/recipes?limit=5")
+    client.get("/recipes?limit=5")
+    client.get("/recipes?limit=6")
+    stats = response_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_update_invalidates_cached_payloads(client, test_user, make_recipe, auth_headers):
+    """Writes through RecipeService drop stale list and detail entries"""
+    headers = auth_headers(test_user)
+    recipe = make_recipe(test_user, "Before")
+
+    assert client.get(f"/recipes/{recipe.id}").json()["title"] == "Before"
+    assert client.get("/recipes").json()["recipes"][0]["title"] == "Before"
+
+    client.put(f"/recipes/{recipe.id}", json={"title": "After"}, headers=headers)
+
+    assert client.get(f"/recipes/{recipe.id}").json()["title"] == "After"
+    assert client.get("/recipes").json()["recipes"][0]["title"] == "After"
+
+
+def test_fork_invalidates_origin_detail(client, test_user, make_recipe, auth_headers):
+    """Creating a fork refreshes the origin's cached fork_count"""
+    headers = auth_headers(test_user)
+    origin = make_recipe(test_user, "Origin")
+    assert client.get(f"/recipes/{origin.id}").json()["fork_count"] == 0
+    assert client.get(f"/recipes/{origin.id}").json()["fork_count"] == 0
+    assert response_cache.stats()["hits"] == 1
+
+    client.post("/recipes", headers=headers, json={
+        "title": "Fork",
+        "description": "Forked",
+        "ingredients": ["ingredient"],
+        "steps": ["step"],
+        "time_minutes": 20,
+        "difficulty": "easy",
+        "is_published": True,
+        "origin_recipe_id": origin.id
+    })
+
+    assert client.get(f"/recipes/{origin.id}").json()["fork_count"] == 1
+
+
+def test_counter_change_refreshes_counter_sorted_pages(client, test_user, make_recipe, auth_headers):
+    """A save reorders most_saved pages at once; the newest-first page stays cached"""
+    headers = auth_headers(test_user)
+    first = make_recipe(test_user, "First")
+    make_recipe(test_user, "Second")
+
+    assert client.get("/recipes?sort=most_saved").json()["recipes"][0]["title"] == "Second"
+    client.get("/recipes")
+    before = response_cache.stats()
+
+    assert client.post(f"/cookbook/{first.id}", headers=headers).status_code == 201
+
+    assert client.get("/recipes?sort=most_saved").json()["recipes"][0]["title"] == "First"
+    client.get("/recipes")
+    stats = response_cache.stats()
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 1
+
+
+def test_cached_feed_pages_serve_live_counters(client, test_user, make_recipe, auth_headers):
+    """A save or comment shows on a still-cached newest-first page at once"""
+    headers = auth_headers(test_user)
+    recipe = make_recipe(test_user, "Counted")
+
+    assert client.get("/recipes").json()["recipes"][0]["save_count"] == 0
+    assert client.post(f"/cookbook/{recipe.id}", headers=headers).status_code == 201
+    assert client.post(f"/recipes/{recipe.id}/comments", json={"content": "Nice"}, headers=headers).status_code == 201
+    before = response_cache.stats()
+
+    page = client.get("/recipes").json()["recipes"][0]
+    assert (page["save_count"], page["comment_count"]) == (1, 1)
+    assert response_cache.stats()["hits"] - before["hits"] == 1
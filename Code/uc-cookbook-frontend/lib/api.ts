@@ -9,11 +9,16 @@ import type {
   CreateRecipeRequest,
   UpdateRecipeRequest,
   CookbookRecipe,
+  CookbookBatchResult,
   ErrorResponse,
   User,
   RecipeComment,
+  CommentPage,
   AddCommentRequest,
+  ReactionChange,
+  ReactionUpdate,
   Conversation,
+  ConversationRead,
   StartConversationRequest,
   Message,
   SendMessageRequest,
@@ -183,6 +188,8 @@ export async function getRecipes(params?: {
   difficulty?: string;
   limit?: number;
   offset?: number;
+  cursor?: string;
+  include_total?: boolean;
 }): Promise<RecipesResponse> {
   const queryParams = new URLSearchParams();
   
@@ -191,6 +198,8 @@ export async function getRecipes(params?: {
   if (params?.difficulty) queryParams.append('difficulty', params.difficulty);
   if (params?.limit) queryParams.append('limit', params.limit.toString());
   if (params?.offset) queryParams.append('offset', params.offset.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
+  if (params?.include_total === false) queryParams.append('include_total', 'false');
   
   const url = `${API_BASE_URL}/recipes${queryParams.toString() ? `?${queryParams.toString()}` : ''}`;
   const response = await makeRequest(url);
@@ -234,6 +243,34 @@ export async function getRecipeComments(recipeId: number): Promise<RecipeComment
   return handleResponse(response);
 }
 
+export async function getCommentThreads(
+  recipeId: number,
+  params?: { limit?: number; replies?: number; cursor?: string }
+): Promise<CommentPage> {
+  const queryParams = new URLSearchParams();
+  if (params?.limit) queryParams.append('limit', params.limit.toString());
+  if (params?.replies !== undefined) queryParams.append('replies', params.replies.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
+
+  const query = queryParams.toString() ? `?${queryParams.toString()}` : '';
+  const response = await makeRequest(`${API_BASE_URL}/recipes/${recipeId}/comments/threads${query}`);
+  return handleResponse(response);
+}
+
+export async function getCommentReplies(
+  recipeId: number,
+  commentId: number,
+  params?: { limit?: number; cursor?: string }
+): Promise<CommentPage> {
+  const queryParams = new URLSearchParams();
+  if (params?.limit) queryParams.append('limit', params.limit.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
+
+  const query = queryParams.toString() ? `?${queryParams.toString()}` : '';
+  const response = await makeRequest(`${API_BASE_URL}/recipes/${recipeId}/comments/${commentId}/replies${query}`);
+  return handleResponse(response);
+}
+
 export async function addRecipeComment(recipeId: number, data: AddCommentRequest): Promise<RecipeComment> {
   const response = await makeRequest(`${API_BASE_URL}/recipes/${recipeId}/comments`, {
     method: 'POST',
@@ -266,6 +303,37 @@ export async function setCommentReaction(
   return handleResponse(response);
 }
 
+/** Idempotent: sets the reaction (emoji) or clears it (null) */
+export async function putCommentReaction(
+  recipeId: number,
+  commentId: number,
+  emoji: string | null
+): Promise<ReactionUpdate> {
+  const response = await makeRequest(
+    `${API_BASE_URL}/recipes/${recipeId}/comments/${commentId}/reactions`,
+    emoji === null
+      ? { method: 'DELETE' }
+      : {
+          method: 'PUT',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ emoji }),
+        }
+  );
+  return handleResponse(response);
+}
+
+export async function batchCommentReactions(
+  recipeId: number,
+  changes: ReactionChange[]
+): Promise<{ updated: ReactionUpdate[] }> {
+  const response = await makeRequest(`${API_BASE_URL}/recipes/${recipeId}/comments/reactions/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ changes }),
+  });
+  return handleResponse(response);
+}
+
 export async function startConversation(data: StartConversationRequest): Promise<Conversation> {
   const response = await makeRequest(`${API_BASE_URL}/conversations`, {
     method: 'POST',
@@ -275,8 +343,25 @@ export async function startConversation(data: StartConversationRequest): Promise
   return handleResponse(response);
 }
 
-export async function getConversations(): Promise<Conversation[]> {
-  const response = await makeRequest(`${API_BASE_URL}/conversations`);
+export async function getConversations(params?: {
+  limit?: number;
+  cursor?: string;
+}): Promise<Conversation[]> {
+  const queryParams = new URLSearchParams();
+  if (params?.limit) queryParams.append('limit', params.limit.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
+
+  const url = `${API_BASE_URL}/conversations${queryParams.toString() ? `?${queryParams.toString()}` : ''}`;
+  const response = await makeRequest(url);
+  return handleResponse(response);
+}
+
+export async function markConversationRead(conversationId: number, messageId?: number): Promise<ConversationRead> {
+  const response = await makeRequest(`${API_BASE_URL}/conversations/${conversationId}/read`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(messageId ? { message_id: messageId } : {}),
+  });
   return handleResponse(response);
 }
 
@@ -295,8 +380,21 @@ export async function sendMessage(conversationId: number, data: SendMessageReque
 }
 
 // Cookbook endpoints
-export async function getCookbook(): Promise<CookbookRecipe[]> {
-  const response = await makeRequest(`${API_BASE_URL}/cookbook`);
+/** One page of saves, newest first; pass the X-Next-Cursor header back as `cursor` */
+export async function getCookbook(params?: {
+  tag?: string[];
+  difficulty?: string;
+  limit?: number;
+  cursor?: string;
+}): Promise<CookbookRecipe[]> {
+  const queryParams = new URLSearchParams();
+  params?.tag?.forEach((tag) => queryParams.append('tag', tag));
+  if (params?.difficulty) queryParams.append('difficulty', params.difficulty);
+  if (params?.limit) queryParams.append('limit', params.limit.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
+
+  const url = `${API_BASE_URL}/cookbook${queryParams.toString() ? `?${queryParams.toString()}` : ''}`;
+  const response = await makeRequest(url);
   return handleResponse(response);
 }
 
@@ -310,5 +408,17 @@ export async function removeRecipeFromCookbook(recipeId: number): Promise<{ mess
   return handleResponse(response);
 }
 
+/** Save and remove many recipes in one request (e.g. multi-select "save all") */
+export async function updateCookbookBatch(
+  changes: { save?: number[]; remove?: number[] }
+): Promise<CookbookBatchResult> {
+  const response = await makeRequest(`${API_BASE_URL}/cookbook/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(changes),
+  });
+  return handleResponse(response);
+}
+
 export { APIError };
 export { getUserLocal as getStoredUser, setToken, clearAuthStorage, getToken as getStoredToken };
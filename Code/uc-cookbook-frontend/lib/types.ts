@@ -30,8 +30,12 @@ export interface Recipe {
     username: string;
   };
   fork_count?: number;
+  save_count?: number;
+  comment_count?: number;
   created_at: string;
   updated_at?: string;
+  /** Set on feed pages for signed-in users; null/absent otherwise */
+  is_saved?: boolean | null;
 }
 
 export interface AuthResponse {
@@ -80,9 +84,10 @@ export interface UpdateRecipeRequest {
 
 export interface RecipesResponse {
   recipes: Recipe[];
-  total: number;
+  total: number | null;
   limit: number;
   offset: number;
+  next_cursor?: string | null;
 }
 
 export interface CookbookRecipe {
@@ -93,6 +98,14 @@ export interface CookbookRecipe {
   saved_at: string;
 }
 
+/** Result of POST /cookbook/batch; ids already in the requested state are omitted */
+export interface CookbookBatchResult {
+  saved: number[];
+  removed: number[];
+  /** Recipes that don't exist or aren't visible to the user */
+  unavailable: number[];
+}
+
 export interface ErrorResponse {
   detail: string;
   message?: string;
@@ -118,11 +131,34 @@ export interface RecipeComment {
   reactions: CommentReactionSummary[];
 }
 
+export interface CommentThread extends RecipeComment {
+  reply_count: number;
+  replies: CommentThread[];
+}
+
+export interface CommentPage {
+  comments: CommentThread[];
+  next_cursor?: string | null;
+}
+
 export interface AddCommentRequest {
   content: string;
   parent_id?: number | null;
 }
 
+export interface ReactionChange {
+  comment_id: number;
+  /** null clears the reaction */
+  emoji: string | null;
+}
+
+/** The viewer's reaction on a comment and only the emoji counts that changed (count 0 = gone) */
+export interface ReactionUpdate {
+  comment_id: number;
+  emoji: string | null;
+  reactions: CommentReactionSummary[];
+}
+
 export interface Conversation {
   id: number;
   user_one_id: number;
@@ -137,6 +173,23 @@ export interface Conversation {
   };
   created_at: string;
   updated_at?: string;
+  last_message?: {
+    id: number;
+    sender_id: number;
+    sender?: {
+      id: number;
+      username: string;
+    };
+    snippet: string;
+    created_at: string;
+  } | null;
+  unread_count: number;
+}
+
+export interface ConversationRead {
+  conversation_id: number;
+  last_read_message_id: number;
+  unread_count: number;
 }
 
 export interface StartConversationRequest {